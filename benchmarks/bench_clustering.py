@@ -0,0 +1,56 @@
+"""
+Compare the fast and exhaustive cluster-count selection in NLPSegmenter.
+
+Usage:
+    python -m benchmarks.bench_clustering --sizes 500 2000 5000 --topics 8
+"""
+import argparse
+import json
+import time
+from benchmarks.synthetic import make_topic_embeddings
+from src.segmentation.nlp_segmenter import NLPSegmenter
+
+
+def time_selection(segmenter: NLPSegmenter, embeddings) -> tuple:
+    started = time.perf_counter()
+    k = segmenter._determine_optimal_clusters(embeddings)
+    return k, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cluster-count selection benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 5000])
+    parser.add_argument("--topics", type=int, nargs="+", default=[4, 8, 12])
+    parser.add_argument("--noise", type=float, default=0.6)
+    args = parser.parse_args()
+
+    fast = NLPSegmenter(cluster_selection="fast")
+    exhaustive = NLPSegmenter(cluster_selection="exhaustive")
+
+    # Import sklearn and warm BLAS before timing
+    warmup, _ = make_topic_embeddings(60, 3)
+    fast._determine_optimal_clusters(warmup)
+
+    results = []
+    for n in args.sizes:
+        for topics in args.topics:
+            embeddings, _ = make_topic_embeddings(n, topics, noise=args.noise)
+            fast_k, fast_time = time_selection(fast, embeddings)
+            exhaustive_k, exhaustive_time = time_selection(exhaustive, embeddings)
+            results.append({
+                "segments": n,
+                "planted_topics": topics,
+                "fast_k": fast_k,
+                "exhaustive_k": exhaustive_k,
+                "fast_seconds": fast_time,
+                "exhaustive_seconds": exhaustive_time,
+                "speedup": exhaustive_time / fast_time,
+            })
+            print(json.dumps(results[-1]))
+
+    agreement = sum(r["fast_k"] == r["exhaustive_k"] for r in results) / len(results)
+    print(json.dumps({"same_k_rate": agreement}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Compare sentence encoder backends: throughput and agreement with torch.
+
+Each backend runs in its own process so load time, peak memory and the
+set of imported modules are measured independently. Needs the torch
+model and the ONNX export (scripts/export_onnx_encoder.py) in data/models.
+
+Usage:
+    python -m benchmarks.bench_encoders --texts 2000 --backends torch onnx onnx-int8
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+import numpy as np
+from src.segmentation.encoders import ENCODER_BACKENDS
+
+WORDS = (
+    "welcome back to the channel today we are looking at gradient descent "
+    "loss functions sponsor message thanks for watching learning rate batch "
+    "normalization attention layers transformer encoder benchmark results"
+).split()
+
+
+def make_texts(n: int, seed: int = 0) -> list:
+    """Transcript-like sentences of 5-40 words."""
+    rng = np.random.default_rng(seed)
+    return [
+        " ".join(rng.choice(WORDS, size=rng.integers(5, 41))).capitalize() + "."
+        for _ in range(n)
+    ]
+
+
+def run_backend(backend: str, model: str, texts: list, batch_size: int) -> dict:
+    from src.segmentation.nlp_segmenter import NLPSegmenter
+
+    segmenter = NLPSegmenter(embedding_model=model, encoder_backend=backend)
+    started = time.perf_counter()
+    encoder = segmenter.encoder
+    load_seconds = time.perf_counter() - started
+
+    encoder.encode(texts[:batch_size], batch_size=batch_size)  # warm-up
+    started = time.perf_counter()
+    embeddings = encoder.encode(texts, batch_size=batch_size)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "backend": backend,
+        "load_seconds": load_seconds,
+        "texts_per_second": len(texts) / elapsed,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "torch_imported": "torch" in sys.modules,
+        "embeddings": np.asarray(embeddings, dtype=np.float32),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentence encoder backend benchmark")
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--backends", nargs="+", default=list(ENCODER_BACKENDS), choices=ENCODER_BACKENDS)
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts)
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for backend in args.backends:
+        with context.Pool(1) as pool:
+            results[backend] = pool.apply(run_backend, (backend, args.model, texts, args.batch_size))
+
+    embeddings = {backend: result.pop("embeddings") for backend, result in results.items()}
+    reference = embeddings.get("torch")
+    for backend, result in results.items():
+        if reference is not None and backend != "torch":
+            # Both sides are L2-normalized, so the row-wise dot is the cosine
+            cosine = np.sum(embeddings[backend] * reference, axis=1)
+            result["cosine_mean"] = float(cosine.mean())
+            result["cosine_min"] = float(cosine.min())
+            result["speedup_vs_torch"] = result["texts_per_second"] / results["torch"]["texts_per_second"]
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Compare the single-pass ExportEngine with the per-format exporters.
+
+For each size, a synthetic transcript (as a segment list and as a
+TranscriptStore) is exported to YouTube, JSON, EDL, SRT and VTT both ways.
+Reports the best wall time of ``--repeat`` runs and the peak memory
+allocated during one run (tracemalloc), and checks that both ways write
+byte-identical files; any difference fails the run.
+
+Usage:
+    python -m benchmarks.bench_export --sizes 10000 100000
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Tuple
+from benchmarks.synthetic import make_topic_transcript
+from src.chapter_generation.generator import Chapter
+from src.export.edl_exporter import EDLExporter
+from src.export.engine import EXPORT_FILENAMES, ExportEngine
+from src.export.json_exporter import JSONExporter
+from src.export.subtitle_generator import SubtitleGenerator
+from src.export.youtube_format import YouTubeExporter
+from src.transcription.models import TranscriptStore
+
+
+def make_chapters(segments, segments_per_chapter: int) -> List[Chapter]:
+    chapters = []
+    for number, first in enumerate(range(0, len(segments), segments_per_chapter), start=1):
+        last = min(first + segments_per_chapter, len(segments)) - 1
+        start, end = segments[first].start, segments[last].end
+        chapters.append(Chapter(number, f"Chapter {number}", start, end, end - start, "Synthetic"))
+    return chapters
+
+
+def export_per_format(chapters, segments, output_dir: Path, metadata):
+    with open(output_dir / EXPORT_FILENAMES["youtube"], "w") as f:
+        f.write(YouTubeExporter().export(chapters))
+    JSONExporter().export(chapters, metadata, str(output_dir / EXPORT_FILENAMES["json"]))
+    EDLExporter().export(chapters, str(output_dir / EXPORT_FILENAMES["edl"]))
+    SubtitleGenerator().generate_srt(segments, str(output_dir / EXPORT_FILENAMES["srt"]))
+    SubtitleGenerator().generate_vtt(segments, str(output_dir / EXPORT_FILENAMES["vtt"]))
+
+
+def measure(fn: Callable, repeat: int) -> Tuple[float, int]:
+    """Best wall time over ``repeat`` runs, and the peak bytes of one more."""
+    best = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export engine benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--segments-per-chapter", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = ExportEngine()
+    formats = list(EXPORT_FILENAMES)
+    mismatches = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            segments, _ = make_topic_transcript(n, 10)
+            store = TranscriptStore.from_segments(segments)
+            chapters = make_chapters(segments, args.segments_per_chapter)
+            metadata = {"filename": "synthetic.mp4", "duration": segments[-1].end}
+            dirs = {name: Path(tmp) / f"{name}_{n}" for name in ("reference", "list", "store")}
+            for path in dirs.values():
+                path.mkdir()
+
+            reference = measure(
+                lambda: export_per_format(chapters, segments, dirs["reference"], metadata), args.repeat
+            )
+            listed = measure(
+                lambda: engine.export(chapters, segments, dirs["list"], formats, metadata), args.repeat
+            )
+            columnar = measure(
+                lambda: engine.export(chapters, store, dirs["store"], formats, metadata), args.repeat
+            )
+
+            for name in ("list", "store"):
+                for filename in EXPORT_FILENAMES.values():
+                    expected = (dirs["reference"] / filename).read_bytes()
+                    if (dirs[name] / filename).read_bytes() != expected:
+                        mismatches.append(f"{filename} from {name} input @ {n}")
+
+            print(json.dumps({
+                "segments": n,
+                "chapters": len(chapters),
+                "per_format_seconds": reference[0],
+                "engine_list_seconds": listed[0],
+                "engine_store_seconds": columnar[0],
+                "speedup_list": reference[0] / listed[0],
+                "speedup_store": reference[0] / columnar[0],
+                "per_format_peak_bytes": reference[1],
+                "engine_list_peak_bytes": listed[1],
+                "engine_store_peak_bytes": columnar[1],
+            }))
+
+    for mismatch in mismatches:
+        print(f"FAIL: {mismatch} differs from the per-format exporters")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Measure re-chaptering latency as a UI slider would drive it.
+
+For each transcript size, a finished job (transcript and embeddings from
+the stub encoder) is written to a temporary output directory, then
+``ChapterPipeline.rechapter`` is called for a sweep of minimum chapter
+durations per segmentation method. Reports the first call (loading the
+job's session and clustering) and the median and worst of the rest;
+a worst case over ``--budget`` seconds fails the run.
+
+Usage:
+    python -m benchmarks.bench_rechapter --sizes 720 2000 5000
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from benchmarks.bench_stages import StubEncoderSegmenter
+from benchmarks.synthetic import make_topic_transcript
+from config import settings
+from src.chapter_generation.generator import ChapterGenerator
+from src.export.engine import ExportEngine
+from src.pipeline.artifacts import StageArtifacts
+from src.pipeline.runner import ARTIFACT_DIRNAME, ChapterPipeline
+from src.transcription.models import TranscriptStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-chaptering latency benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[720, 2000, 5000])
+    parser.add_argument("--methods", nargs="+", default=["kmeans", "changepoint"])
+    parser.add_argument("--durations", type=int, nargs="+", default=list(range(30, 330, 30)))
+    parser.add_argument("--budget", type=float, default=1.0,
+                        help="Slowest allowed slider move, in seconds")
+    args = parser.parse_args()
+
+    settings.EMBEDDING_BATCH_WINDOW_MS = 0
+    segmenter = StubEncoderSegmenter()
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = ChapterPipeline(
+            None, None, segmenter, ChapterGenerator(), None, None, None,
+            output_root=tmp, export_engine=ExportEngine()
+        )
+        # Import sklearn and warm BLAS before timing
+        segmenter.cluster_segments(segmenter.generate_embeddings(
+            TranscriptStore.from_segments(make_topic_transcript(100, 3)[0])
+        ))
+
+        for n in args.sizes:
+            segments = TranscriptStore.from_segments(make_topic_transcript(n, 10)[0])
+            artifacts = StageArtifacts(f"{tmp}/job-{n}/{ARTIFACT_DIRNAME}")
+            artifacts.save_transcript(segments, {}, float(segments.end[-1]))
+            artifacts.save_embeddings(segmenter.generate_embeddings(segments))
+
+            for method in args.methods:
+                seconds = []
+                for duration in args.durations:
+                    started = time.perf_counter()
+                    pipeline.rechapter(
+                        f"job-{n}", "synthetic.mp4", duration, segmentation_method=method
+                    )
+                    seconds.append(time.perf_counter() - started)
+                moves = seconds[1:] or seconds
+                print(json.dumps({
+                    "segments": n,
+                    "method": method,
+                    "first_seconds": seconds[0],
+                    "median_seconds": statistics.median(moves),
+                    "max_seconds": max(moves),
+                }))
+                if max(moves) > args.budget:
+                    failures.append(f"{method} @ {n}: {max(moves):.3f}s per move")
+
+    for failure in failures:
+        print(f"FAIL: {failure} (budget {args.budget}s)")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
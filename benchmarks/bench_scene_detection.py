@@ -0,0 +1,116 @@
+"""
+Compare scene detection configurations on synthetic videos made with ffmpeg.
+
+The test video concatenates clips from different lavfi sources, so hard
+cuts sit at known times. Some clips scroll, to score motion that is not a
+cut, and one cut only rotates the hue, which a grayscale score cannot see.
+Each configuration reports wall time and cut F1 within ``--tolerance``
+seconds. The first row is the default engine: PySceneDetect on every frame
+(skipped if scenedetect is not installed). ``--thresholds`` adds a sweep of
+the ffmpeg engine's threshold, for calibrating it.
+
+Usage:
+    python -m benchmarks.bench_scene_detection --clips 12 --clip-seconds 20 --size 1920x1080
+    python -m benchmarks.bench_scene_detection --size 640x360 --thresholds 10 15 20 25 30 40 50
+"""
+import argparse
+import json
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+from src.scene_detection.visual_detector import VisualSceneDetector
+
+# lavfi sources, optionally followed by filters
+SOURCES = (
+    "testsrc2", "smptebars", "smptebars,hue=h=120", "mandelbrot",
+    "testsrc2,scroll=h=0.01", "rgbtestsrc", "cellauto",
+    "testsrc,scroll=h=0.005:v=0.005", "smptehdbars", "life",
+)
+
+CONFIGS = (
+    ("scenedetect, every frame", {"engine": "scenedetect", "frame_stride": 1}),
+    ("ffmpeg, every frame", {"engine": "ffmpeg", "frame_stride": 1}),
+    ("ffmpeg, stride 5", {"engine": "ffmpeg", "frame_stride": 5}),
+    ("ffmpeg, stride 5, 96px", {"engine": "ffmpeg", "frame_stride": 5, "downscale_width": 96}),
+    ("ffmpeg, keyframes only", {"engine": "ffmpeg", "keyframes_only": True}),
+    ("ffmpeg, stride 5, 4 workers", {"engine": "ffmpeg", "frame_stride": 5, "num_workers": 4}),
+)
+
+
+def make_video(path: Path, clips: int, clip_seconds: float, size: str, fps: int) -> List[float]:
+    """Write the concatenated test video and return its planted cut times."""
+    cmd = ["ffmpeg", "-v", "error", "-y"]
+    for i in range(clips):
+        source, _, filters = SOURCES[i % len(SOURCES)].partition(",")
+        graph = f"{source}=size={size}:rate={fps}" + (f",{filters}" if filters else "")
+        # -t rather than the source's duration option, which not every source has
+        cmd += ["-f", "lavfi", "-t", str(clip_seconds), "-i", graph]
+    inputs = "".join(f"[{i}:v]" for i in range(clips))
+    cmd += [
+        "-filter_complex", f"{inputs}concat=n={clips}:v=1:a=0,format=yuv420p[v]",
+        "-map", "[v]", "-c:v", "libx264", "-preset", "veryfast", "-g", str(fps * 10),
+        str(path)
+    ]
+    subprocess.run(cmd, check=True)
+    return [i * clip_seconds for i in range(1, clips)]
+
+
+def cut_f1(found: List[float], expected: List[float], tolerance: float) -> float:
+    unmatched = list(expected)
+    hits = 0
+    for cut in found:
+        match = next((e for e in unmatched if abs(e - cut) <= tolerance), None)
+        if match is not None:
+            unmatched.remove(match)
+            hits += 1
+    if hits == 0:
+        return 0.0
+    precision = hits / len(found)
+    recall = hits / len(expected)
+    return 2 * precision * recall / (precision + recall)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scene detection benchmark")
+    parser.add_argument("--clips", type=int, default=12)
+    parser.add_argument("--clip-seconds", type=float, default=20.0)
+    parser.add_argument("--size", default="1920x1080")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--thresholds", type=float, nargs="*", default=[],
+                        help="ffmpeg engine thresholds to sweep, every frame")
+    args = parser.parse_args()
+    configs = list(CONFIGS) + [
+        (f"ffmpeg, threshold {t:g}", {"engine": "ffmpeg", "threshold": t})
+        for t in args.thresholds
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = Path(tmp) / "synthetic.mp4"
+        expected = make_video(video, args.clips, args.clip_seconds, args.size, args.fps)
+
+        baseline = None
+        for name, options in configs:
+            detector = VisualSceneDetector(**options)
+            started = time.perf_counter()
+            try:
+                scenes = detector.detect_scenes(str(video))
+            except ImportError:
+                print(json.dumps({"config": name, "skipped": "scenedetect not installed"}))
+                continue
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+            cuts = [start for start, _ in scenes[1:]]
+            print(json.dumps({
+                "config": name,
+                "seconds": elapsed,
+                "speedup": baseline / elapsed,
+                "cuts": len(cuts),
+                "cut_f1": cut_f1(cuts, expected, args.tolerance),
+            }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Compare topic segmentation methods on transcripts with planted boundaries.
+
+Each method runs through ``cluster_segments`` and
+``identify_chapter_boundaries``, exactly as the pipeline uses them.
+Boundary quality is the F1 score against the planted boundaries, counting
+a predicted boundary as correct within ``--tolerance`` segments.
+
+Usage:
+    python -m benchmarks.bench_segmentation --sizes 500 2000 5000 --topics 8
+"""
+import argparse
+import json
+import time
+from typing import List
+from benchmarks.synthetic import make_segments, make_topic_embeddings
+from src.segmentation.nlp_segmenter import NLPSegmenter
+
+METHODS = ("kmeans", "dbscan", "changepoint")
+
+
+def boundary_f1(predicted: List[int], expected: List[int], tolerance: int) -> float:
+    """F1 of interior boundaries, matching each expected one at most once."""
+    predicted = predicted[1:]
+    expected = expected[1:]
+    if not predicted and not expected:
+        return 1.0
+    unmatched = list(expected)
+    hits = 0
+    for boundary in predicted:
+        match = next((e for e in unmatched if abs(e - boundary) <= tolerance), None)
+        if match is not None:
+            unmatched.remove(match)
+            hits += 1
+    if hits == 0:
+        return 0.0
+    precision = hits / len(predicted)
+    recall = hits / len(expected)
+    return 2 * precision * recall / (precision + recall)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Topic segmentation benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 5000])
+    parser.add_argument("--topics", type=int, nargs="+", default=[4, 8, 12])
+    parser.add_argument("--noise", type=float, default=0.6)
+    parser.add_argument("--seconds-per-segment", type=float, default=5.0)
+    parser.add_argument("--tolerance", type=int, default=2)
+    parser.add_argument("--methods", nargs="+", default=list(METHODS), choices=METHODS)
+    args = parser.parse_args()
+
+    segmenter = NLPSegmenter(min_chapter_duration=60)
+
+    # Import sklearn and warm BLAS before timing
+    warmup, _ = make_topic_embeddings(60, 3)
+    segmenter.cluster_segments(warmup)
+
+    for n in args.sizes:
+        segments = make_segments(n, args.seconds_per_segment)
+        for topics in args.topics:
+            embeddings, planted = make_topic_embeddings(n, topics, noise=args.noise)
+            for method in args.methods:
+                started = time.perf_counter()
+                labels = segmenter.cluster_segments(embeddings, method=method, segments=segments)
+                boundaries = segmenter.identify_chapter_boundaries(segments, labels)
+                elapsed = time.perf_counter() - started
+                print(json.dumps({
+                    "segments": n,
+                    "planted_topics": topics,
+                    "method": method,
+                    "seconds": elapsed,
+                    "chapters": len(boundaries),
+                    "boundary_f1": boundary_f1(boundaries, planted, args.tolerance),
+                }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Time every pipeline stage on synthetic transcripts and videos.
+
+Transcripts of each ``--sizes`` segment count, with planted topic shifts,
+go through NLPSegmenter (embeddings from a stub encoder, clustering,
+boundaries, NMF topics), ChapterGenerator and every exporter. Short
+test videos made with ffmpeg go through AudioExtractor (skipped if ffmpeg
+is not installed). Each stage reports its best time over ``--repeat``
+runs; stages slower than a second run once.
+
+Results are written as JSON. With ``--baseline``, any stage slower than
+its baseline time by more than ``--max-regression`` fails the run;
+``--save-baseline`` stores the current results as the new baseline.
+Timings depend on the host, so no baseline is committed: record one on
+the machine that runs the comparison first.
+
+Usage:
+    python -m benchmarks.bench_stages --sizes 100 1000 10000 100000 --output results.json
+    python -m benchmarks.bench_stages --baseline baseline.json --save-baseline
+    python -m benchmarks.bench_stages --baseline baseline.json
+"""
+import argparse
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+from benchmarks.synthetic import StubEncoder, make_topic_transcript, make_video
+from config import settings
+from src.audio_extraction.extractor import AudioExtractor
+from src.chapter_generation.generator import ChapterGenerator
+from src.export.edl_exporter import EDLExporter
+from src.export.json_exporter import JSONExporter
+from src.export.subtitle_generator import SubtitleGenerator
+from src.export.youtube_format import YouTubeExporter
+from src.segmentation.nlp_segmenter import NLPSegmenter
+
+# Baseline entries faster than this are too noisy to compare
+NOISE_FLOOR_SECONDS = 0.05
+# Stages slower than this are not repeated
+REPEAT_LIMIT_SECONDS = 1.0
+
+
+class StubEncoderSegmenter(NLPSegmenter):
+    """NLPSegmenter with the model-free ``StubEncoder``."""
+
+    def __init__(self, **kwargs):
+        super().__init__(use_embedding_cache=False, **kwargs)
+        self._stub = StubEncoder()
+
+    @property
+    def encoder(self):
+        return self._stub
+
+
+def time_call(fn: Callable, repeat: int) -> Tuple[float, object]:
+    """Best wall time of up to ``repeat`` calls, and the last result."""
+    best = None
+    result = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+        if elapsed > REPEAT_LIMIT_SECONDS:
+            break
+    return best, result
+
+
+def bench_transcript(
+    n_segments: int,
+    n_topics: int,
+    method: str,
+    seconds_per_segment: float,
+    repeat: int,
+    output_dir: Path
+) -> List[Dict]:
+    """Time segmentation, chapter generation and exports for one transcript size."""
+    segments, _ = make_topic_transcript(n_segments, n_topics, seconds_per_segment)
+    segmenter = StubEncoderSegmenter(min_chapter_duration=60)
+    generator = ChapterGenerator()
+    results = []
+
+    def record(stage: str, fn: Callable, items: int):
+        seconds, value = time_call(fn, repeat)
+        results.append({
+            "stage": stage,
+            "size": n_segments,
+            "seconds": seconds,
+            "items_per_second": items / seconds if seconds > 0 else None,
+        })
+        return value
+
+    embeddings = record("embedding", lambda: segmenter.generate_embeddings(segments), n_segments)
+    labels = record(
+        "clustering",
+        lambda: segmenter.cluster_segments(embeddings, method=method, segments=segments),
+        n_segments
+    )
+    boundaries = record(
+        "boundaries", lambda: segmenter.identify_chapter_boundaries(segments, labels), n_segments
+    )
+    topics = record(
+        "topics", lambda: segmenter.extract_topics_nmf(segments, n_topics=len(boundaries)), n_segments
+    )
+    chapters = record(
+        "chapters", lambda: generator.generate_chapters(segments, boundaries, topics), n_segments
+    )
+    # optimize_chapter_durations renumbers in place, so give each run a fresh copy
+    record(
+        "optimize_chapters",
+        lambda: generator.optimize_chapter_durations([
+            type(ch)(**vars(ch)) for ch in chapters
+        ]),
+        len(chapters)
+    )
+
+    metadata = {"filename": "synthetic.mp4", "duration": segments[-1].end}
+    record("export_youtube", lambda: YouTubeExporter().export(chapters), len(chapters))
+    record(
+        "export_json",
+        lambda: JSONExporter().export(chapters, metadata, str(output_dir / "chapters.json")),
+        len(chapters)
+    )
+    record(
+        "export_edl",
+        lambda: EDLExporter().export(chapters, str(output_dir / "chapters.edl")),
+        len(chapters)
+    )
+    record(
+        "export_srt",
+        lambda: SubtitleGenerator().generate_srt(segments, str(output_dir / "subtitles.srt")),
+        n_segments
+    )
+    record(
+        "export_vtt",
+        lambda: SubtitleGenerator().generate_vtt(segments, str(output_dir / "subtitles.vtt")),
+        n_segments
+    )
+    return results
+
+
+def bench_audio(video_seconds: float, repeat: int, output_dir: Path) -> List[Dict]:
+    """Time audio extraction from a synthetic video of ``video_seconds``."""
+    video = make_video(output_dir / f"synthetic_{video_seconds:g}s.mp4", video_seconds)
+    extractor = AudioExtractor(temp_dir=str(output_dir / "temp"))
+    results = []
+    for stage, fn in (
+        ("audio_pcm", lambda: extractor.extract_audio_pcm(str(video))),
+        ("audio_ffmpeg", lambda: extractor.extract_audio_ffmpeg(str(video))),
+    ):
+        seconds, _ = time_call(fn, repeat)
+        results.append({
+            "stage": stage,
+            "size": video_seconds,
+            "seconds": seconds,
+            "realtime_factor": video_seconds / seconds if seconds > 0 else None,
+        })
+    return results
+
+
+def compare_to_baseline(
+    results: List[Dict],
+    baseline: List[Dict],
+    max_regression: float
+) -> List[str]:
+    """Describe every stage that got slower than its baseline allows."""
+    reference = {(row["stage"], row["size"]): row["seconds"] for row in baseline}
+    failures = []
+    for row in results:
+        before = reference.get((row["stage"], row["size"]))
+        if before is None or max(before, row["seconds"]) < NOISE_FLOOR_SECONDS:
+            continue
+        if row["seconds"] > before * (1 + max_regression):
+            failures.append(
+                f"{row['stage']} @ {row['size']}: {row['seconds']:.4f}s vs baseline "
+                f"{before:.4f}s (+{row['seconds'] / before - 1:.0%})"
+            )
+    return failures
+
+
+def run(
+    sizes: List[int],
+    topics: int,
+    method: str,
+    seconds_per_segment: float,
+    video_seconds: List[float],
+    repeat: int
+) -> List[Dict]:
+    # Time the encoder itself, not the cross-job batching window
+    settings.EMBEDDING_BATCH_WINDOW_MS = 0
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        # Import sklearn and warm BLAS before timing
+        bench_transcript(100, topics, method, seconds_per_segment, 1, output_dir)
+        for n in sizes:
+            results += bench_transcript(n, topics, method, seconds_per_segment, repeat, output_dir)
+        if shutil.which("ffmpeg") is None:
+            print("ffmpeg not installed: skipping audio extraction", file=sys.stderr)
+        else:
+            for seconds in video_seconds:
+                results += bench_audio(seconds, repeat, output_dir)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage pipeline benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--topics", type=int, default=10)
+    parser.add_argument("--method", default=settings.SEGMENTATION_METHOD)
+    parser.add_argument("--seconds-per-segment", type=float, default=5.0)
+    parser.add_argument("--video-seconds", type=float, nargs="+", default=[30, 300])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write results JSON here instead of stdout")
+    parser.add_argument("--baseline", help="Fail on stages slower than this results file")
+    parser.add_argument("--max-regression", type=float, default=0.3)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Write the results to --baseline instead of comparing")
+    args = parser.parse_args()
+
+    results = run(
+        args.sizes, args.topics, args.method, args.seconds_per_segment,
+        args.video_seconds, args.repeat
+    )
+    report = {
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "method": args.method,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+
+    if not args.baseline:
+        return
+    if args.save_baseline:
+        Path(args.baseline).write_text(text)
+        return
+    if not Path(args.baseline).exists():
+        sys.exit(f"No baseline at {args.baseline}; record one first with --save-baseline")
+    baseline = json.loads(Path(args.baseline).read_text())
+    failures = compare_to_baseline(results, baseline["results"], args.max_regression)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
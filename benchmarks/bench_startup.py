@@ -0,0 +1,91 @@
+"""
+Measure API import cost per module and fail if it exceeds a budget.
+
+Runs ``python -X importtime -c "import src.api.main"`` in a fresh
+interpreter, so results do not depend on what this process imported.
+
+Usage:
+    python -m benchmarks.bench_startup --budget-ms 1000 --top 15
+"""
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List
+
+TARGET_MODULE = "src.api.main"
+
+# Imported only by the stage that needs them, never at API startup
+DEFERRED_MODULES = [
+    "torch",
+    "ctranslate2",
+    "faster_whisper",
+    "sentence_transformers",
+    "transformers",
+    "sklearn",
+    "scenedetect",
+    "cv2",
+    "moviepy",
+    "librosa",
+]
+
+
+def measure_imports(module: str = TARGET_MODULE) -> List[Dict]:
+    """Per-module self and cumulative import time in microseconds."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        })
+    return rows
+
+
+def summarize(rows: List[Dict], top: int) -> Dict:
+    by_package = defaultdict(int)
+    for row in rows:
+        by_package[row["module"].split(".")[0]] += row["self_us"]
+
+    target = next((r for r in rows if r["module"] == TARGET_MODULE), None)
+    loaded = {row["module"] for row in rows}
+    return {
+        "total_ms": (target["cumulative_us"] if target else sum(r["self_us"] for r in rows)) / 1000,
+        "packages_ms": {
+            name: us / 1000
+            for name, us in sorted(by_package.items(), key=lambda item: -item[1])[:top]
+        },
+        "deferred_modules_loaded": [m for m in DEFERRED_MODULES if m in loaded],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API import-time benchmark")
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    summary = summarize(measure_imports(), args.top)
+    summary["budget_ms"] = args.budget_ms
+    print(json.dumps(summary, indent=2))
+
+    if summary["deferred_modules_loaded"]:
+        print(f"FAIL: heavy modules imported at startup: {summary['deferred_modules_loaded']}")
+        sys.exit(1)
+    if summary["total_ms"] > args.budget_ms:
+        print(f"FAIL: import took {summary['total_ms']:.0f} ms, budget {args.budget_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Compare TranscriptStore with a list of TranscriptSegment dataclasses.
+
+For each size, reports the memory held by each form (tracemalloc, while
+building it), and the time to take many index-range and time-range
+slices and to collect every text, as the segmenter and chapter
+generator do.
+
+Usage:
+    python -m benchmarks.bench_transcript_store --sizes 10000 50000 200000
+"""
+import argparse
+import bisect
+import gc
+import json
+import time
+import tracemalloc
+from typing import Callable, Tuple
+import numpy as np
+from benchmarks.synthetic import make_topic_transcript
+from src.transcription.models import TranscriptSegment, TranscriptStore, segment_texts
+
+
+def measure_build(build: Callable) -> Tuple[object, int]:
+    """Build a value and return it with the bytes it holds."""
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, current
+
+
+def time_it(fn: Callable, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcript store benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 200000])
+    parser.add_argument("--slices", type=int, default=1000)
+    parser.add_argument("--slice-length", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for n in args.sizes:
+        segments, _ = make_topic_transcript(n, 10)
+        starts = [seg.start for seg in segments]
+        rows = [(seg.id, seg.start, seg.end, seg.text, seg.confidence) for seg in segments]
+        del segments
+
+        # Copy each text so the traced list owns its strings, as Whisper's output does
+        listed, list_bytes = measure_build(
+            lambda: [TranscriptSegment(*row[:3], row[3].encode().decode(), row[4]) for row in rows]
+        )
+        store, store_bytes = measure_build(lambda: TranscriptStore.from_segments(listed))
+
+        first = rng.integers(0, max(1, n - args.slice_length), size=args.slices)
+        duration = listed[-1].end
+
+        def list_index_slices():
+            for a in first:
+                listed[a:a + args.slice_length]
+
+        def store_index_slices():
+            for a in first:
+                store[a:a + args.slice_length]
+
+        windows = rng.uniform(0, duration, size=args.slices)
+
+        def list_time_slices():
+            for t in windows:
+                listed[bisect.bisect_left(starts, t):bisect.bisect_left(starts, t + 600)]
+
+        def store_time_slices():
+            for t in windows:
+                store.time_slice(t, t + 600)
+
+        print(json.dumps({
+            "segments": n,
+            "list_bytes": list_bytes,
+            "store_bytes": store_bytes,
+            "memory_ratio": list_bytes / store_bytes,
+            "index_slices_list_ms": time_it(list_index_slices, 3) * 1000,
+            "index_slices_store_ms": time_it(store_index_slices, 3) * 1000,
+            "time_slices_list_ms": time_it(list_time_slices, 3) * 1000,
+            "time_slices_store_ms": time_it(store_time_slices, 3) * 1000,
+            "texts_list_ms": time_it(lambda: segment_texts(listed), 3) * 1000,
+            "texts_store_ms": time_it(lambda: segment_texts(store), 3) * 1000,
+        }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compare single-stream and chunked parallel Whisper transcription.
+
+Usage:
+    python -m benchmarks.bench_transcription --audio lecture.wav --workers 4
+"""
+import argparse
+import json
+import time
+import numpy as np
+from faster_whisper import decode_audio
+from src.transcription.whisper_asr import WhisperTranscriber, SAMPLE_RATE, _transcribe_chunk
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--audio", required=True, help="Audio or video file to transcribe")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-seconds", type=float, default=600.0)
+    args = parser.parse_args()
+
+    audio = decode_audio(args.audio, sampling_rate=SAMPLE_RATE)
+    duration = len(audio) / SAMPLE_RATE
+
+    single = WhisperTranscriber(model_size=args.model)
+    started = time.perf_counter()
+    single_segments, _ = single.transcribe(audio, language=args.language)
+    single_time = time.perf_counter() - started
+
+    parallel = WhisperTranscriber(
+        model_size=args.model,
+        num_workers=args.workers,
+        max_chunk_seconds=args.chunk_seconds
+    )
+    try:
+        # Start every worker so model loading is not counted against decoding
+        silence = np.zeros(SAMPLE_RATE, dtype=np.float32)
+        with parallel._pool_lock:
+            pool = parallel._get_pool(args.model)
+        warmups = [
+            pool.submit(_transcribe_chunk, silence, 0.0, args.language, 1, False)
+            for _ in range(args.workers)
+        ]
+        for future in warmups:
+            future.result()
+
+        parallel_segments, metadata = parallel.transcribe_parallel(audio, language=args.language)
+    finally:
+        parallel.close()
+
+    print(json.dumps({
+        "audio_seconds": duration,
+        "single_stream": {
+            "wall_time": single_time,
+            "realtime_factor": duration / single_time,
+            "segments": len(single_segments),
+        },
+        "parallel": {
+            "wall_time": metadata["wall_time"],
+            "realtime_factor": metadata["realtime_factor"],
+            "segments": len(parallel_segments),
+            "chunks": metadata["chunks"],
+            "workers": metadata["workers"],
+        },
+        "speedup": single_time / metadata["wall_time"],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Synthetic inputs with planted topic structure for benchmarks and tests."""
+from pathlib import Path
+from typing import List, Tuple
+import subprocess
+import zlib
+import numpy as np
+from src.transcription.whisper_asr import TranscriptSegment
+
+SYLLABLES = ("ka", "lo", "mi", "ren", "tas", "vo", "zu", "pel", "dri", "nox", "sa", "quin")
+# Words shared by every topic, so segments are not trivially separable
+COMMON_WORDS = (
+    "video", "today", "look", "example", "point", "part", "idea", "thing",
+    "people", "really", "going", "right", "question", "answer", "way", "kind",
+)
+
+
+def make_topic_embeddings(
+    n_segments: int,
+    n_topics: int,
+    dim: int = 384,
+    noise: float = 0.6,
+    seed: int = 0
+) -> Tuple[np.ndarray, List[int]]:
+    """
+    Unit-norm embeddings whose topic changes at planted positions.
+
+    Topics occupy contiguous runs of roughly equal length; each embedding is
+    its topic centre plus Gaussian noise.
+
+    Returns:
+        Tuple of (embeddings, boundary indices starting with 0)
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_topics, dim))
+    boundaries = [int(i * n_segments / n_topics) for i in range(n_topics)]
+    topic_of = np.searchsorted(boundaries, np.arange(n_segments), side="right") - 1
+
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    points = centers[topic_of] + rng.normal(scale=noise / np.sqrt(dim), size=(n_segments, dim))
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+    return points.astype(np.float32), boundaries
+
+
+def make_segments(n_segments: int, seconds_per_segment: float = 10.0) -> List[TranscriptSegment]:
+    """Back-to-back transcript segments of equal length."""
+    return [
+        TranscriptSegment(i, i * seconds_per_segment, (i + 1) * seconds_per_segment, f"Segment {i}.")
+        for i in range(n_segments)
+    ]
+
+
+def make_topic_transcript(
+    n_segments: int,
+    n_topics: int,
+    seconds_per_segment: float = 5.0,
+    words_per_segment: int = 12,
+    vocabulary_size: int = 15,
+    topic_share: float = 0.7,
+    seed: int = 0
+) -> Tuple[List[TranscriptSegment], List[int]]:
+    """
+    Transcript whose vocabulary shifts at planted topic boundaries.
+
+    Every topic has its own pseudo-word vocabulary; ``topic_share`` of each
+    segment's words come from it and the rest from ``COMMON_WORDS``, so
+    TF-IDF, NMF and bag-of-words encoders all see the planted structure.
+
+    Returns:
+        Tuple of (segments, boundary indices starting with 0)
+    """
+    rng = np.random.default_rng(seed)
+    vocabularies = [
+        ["".join(rng.choice(SYLLABLES, size=3)) + str(topic) for _ in range(vocabulary_size)]
+        for topic in range(n_topics)
+    ]
+    boundaries = [int(i * n_segments / n_topics) for i in range(n_topics)]
+    topic_of = np.searchsorted(boundaries, np.arange(n_segments), side="right") - 1
+
+    from_topic = rng.random((n_segments, words_per_segment)) < topic_share
+    topic_picks = rng.integers(0, vocabulary_size, size=(n_segments, words_per_segment))
+    common_picks = rng.integers(0, len(COMMON_WORDS), size=(n_segments, words_per_segment))
+
+    segments = []
+    for i in range(n_segments):
+        vocabulary = vocabularies[topic_of[i]]
+        words = [
+            vocabulary[t] if own else COMMON_WORDS[c]
+            for own, t, c in zip(from_topic[i], topic_picks[i], common_picks[i])
+        ]
+        segments.append(TranscriptSegment(
+            i, i * seconds_per_segment, (i + 1) * seconds_per_segment,
+            " ".join(words).capitalize() + "."
+        ))
+    return segments, boundaries
+
+
+class StubEncoder:
+    """
+    Deterministic bag-of-words sentence encoder with no model to load.
+
+    Words are hashed into ``dim`` buckets and counts are L2-normalised, so
+    benchmarks time everything around the encoder without torch.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def encode(self, texts: List[str], batch_size: int = 32, show_progress_bar: bool = False) -> np.ndarray:
+        rows = []
+        cols = []
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                rows.append(row)
+                cols.append(zlib.crc32(word.strip(".,").encode("utf-8")) % self.dim)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(vectors, (rows, cols), 1.0)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+def make_video(
+    path: Path,
+    seconds: float,
+    size: str = "320x240",
+    fps: int = 25,
+    tone_hz: int = 440
+) -> Path:
+    """Write a short test video (test pattern plus a sine tone) with ffmpeg."""
+    cmd = [
+        "ffmpeg", "-v", "error", "-y",
+        "-f", "lavfi", "-i", f"testsrc2=size={size}:rate={fps}:duration={seconds}",
+        "-f", "lavfi", "-i", f"sine=frequency={tone_hz}:sample_rate=44100:duration={seconds}",
+        "-c:v", "libx264", "-preset", "ultrafast", "-c:a", "aac", "-shortest",
+        str(path)
+    ]
+    subprocess.run(cmd, check=True)
+    return Path(path)
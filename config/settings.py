@@ -0,0 +1,74 @@
+import os
+from pathlib import Path
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Models
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+# Sentence encoder runtime: torch, onnx or onnx-int8 (see scripts/export_onnx_encoder.py)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+# Load models in the background at startup instead of on the first job
+PRELOAD_MODELS = _env_bool("PRELOAD_MODELS", False)
+
+# Limits
+MAX_VIDEO_SIZE_MB = int(os.getenv("MAX_VIDEO_SIZE_MB", "500"))
+ENABLE_SCENE_DETECTION = _env_bool("ENABLE_SCENE_DETECTION", False)
+# Scene detection engine: scenedetect (PySceneDetect) or ffmpeg (downscaled frame scores, faster)
+SCENE_DETECTION_ENGINE = os.getenv("SCENE_DETECTION_ENGINE", "scenedetect")
+# ffmpeg engine only: processes scanning time ranges of one video, and keyframe-only decoding
+SCENE_DETECTION_WORKERS = int(os.getenv("SCENE_DETECTION_WORKERS", "1"))
+SCENE_DETECTION_KEYFRAMES_ONLY = _env_bool("SCENE_DETECTION_KEYFRAMES_ONLY", False)
+
+# Audio extraction: pcm (ffmpeg pipe into memory, no temp files) or file (MoviePy WAV)
+AUDIO_EXTRACTION_MODE = os.getenv("AUDIO_EXTRACTION_MODE", "pcm")
+
+# Job execution
+MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", "2"))
+# Embed Whisper segments in micro-batches while decoding continues
+STREAMING_TRANSCRIPTION = _env_bool("STREAMING_TRANSCRIPTION", True)
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+# Transcribe silence-aligned chunks in this many processes (1 = single stream)
+TRANSCRIPTION_WORKERS = int(os.getenv("TRANSCRIPTION_WORKERS", "1"))
+TRANSCRIPTION_CHUNK_SECONDS = float(os.getenv("TRANSCRIPTION_CHUNK_SECONDS", "600"))
+# Topic segmentation: kmeans, dbscan or changepoint (contiguous, near-linear)
+SEGMENTATION_METHOD = os.getenv("SEGMENTATION_METHOD", "kmeans")
+# Where jobs run: local (the API's thread pool) or redis (scripts/run_worker.py processes)
+QUEUE_BACKEND = os.getenv("QUEUE_BACKEND", "local")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# A worker that stops renewing its lease for this long loses the job to another worker
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+# Runs of a job (including ones whose lease expired) before it is marked failed
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "256"))
+# Reuse sentence embeddings of previously seen segment texts
+EMBEDDING_CACHE_ENABLED = _env_bool("EMBEDDING_CACHE_ENABLED", True)
+EMBEDDING_CACHE_MEMORY_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MEMORY_ENTRIES", "20000"))
+EMBEDDING_CACHE_DISK_ENTRIES = int(os.getenv("EMBEDDING_CACHE_DISK_ENTRIES", "200000"))
+# Merge concurrent jobs' encoder calls collected within this window (0 = off)
+EMBEDDING_BATCH_WINDOW_MS = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "5"))
+EMBEDDING_MAX_BATCH_SIZE = int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", "256"))
+
+# Storage
+INPUT_DIR = Path(os.getenv("INPUT_DIR", "data/input"))
+OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", "data/output"))
+TEMP_DIR = Path(os.getenv("TEMP_DIR", "data/temp"))
+MODELS_DIR = Path(os.getenv("MODELS_DIR", "data/models"))
+EMBEDDING_CACHE_DIR = Path(os.getenv("EMBEDDING_CACHE_DIR", "data/cache/embeddings"))
+# Measured seconds of processing per second of video, per profile and stage
+THROUGHPUT_FILE = Path(os.getenv("THROUGHPUT_FILE", "data/cache/throughput.json"))
+
+# Directories that POST /generate-chapters/from-path may read videos from
+VIDEO_INPUT_ROOTS = [
+    Path(root) for root in
+    os.getenv("VIDEO_INPUT_ROOTS", str(INPUT_DIR)).split(os.pathsep)
+    if root
+]
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -72,30 +72,23 @@ document.addEventListener('DOMContentLoaded', () => {
         // Default values for now
         formData.append('min_chapter_duration', 60);
 
-        // Simulate progress (since fetch doesn't give upload progress easily without XHR)
-        let progress = 0;
-        const progressInterval = setInterval(() => {
-            if (progress < 90) {
-                progress += 5;
-                updateProgress(progress);
-            }
-        }, 500);
-
         try {
             const response = await fetch(`${API_URL}/generate-chapters`, {
                 method: 'POST',
                 body: formData
             });
 
-            clearInterval(progressInterval);
-            updateProgress(100);
-
             if (!response.ok) {
                 throw new Error('Generation failed');
             }
 
-            const data = await response.json();
-            displayResults(data);
+            const job = await response.json();
+            updateProgress(5);
+
+            // Cached results come back finished
+            const result = job.status === 'done' ? job.result : await followJob(job.job_id);
+            updateProgress(100);
+            displayResults(result);
 
         } catch (error) {
             console.error('Error:', error);
@@ -107,6 +100,81 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 
+    // Stages reported by the job, mapped to progress
+    const stageProgress = {
+        extraction: 10,
+        transcription: 30,
+        segmentation: 60,
+        topics: 75,
+        chapters: 85,
+        export: 95
+    };
+
+    function followJob(jobId) {
+        // Server-Sent Events from GET /jobs/{job_id}/events
+        return new Promise((resolve, reject) => {
+            const source = new EventSource(`${API_URL}/jobs/${jobId}/events`);
+
+            source.addEventListener('stage', (e) => {
+                const { stage } = JSON.parse(e.data);
+                if (stage in stageProgress) {
+                    updateProgress(stageProgress[stage]);
+                }
+            });
+
+            source.addEventListener('progress', (e) => {
+                const { processed_seconds, duration } = JSON.parse(e.data);
+                if (duration > 0) {
+                    const span = stageProgress.segmentation - stageProgress.transcription;
+                    const fraction = Math.min(processed_seconds / duration, 1);
+                    updateProgress(Math.round(stageProgress.transcription + span * fraction));
+                }
+            });
+
+            source.addEventListener('chapters', (e) => {
+                const { chapters } = JSON.parse(e.data);
+                resultsSection.classList.remove('hidden');
+                renderChapters(chapters);
+            });
+
+            source.addEventListener('done', (e) => {
+                source.close();
+                resolve(JSON.parse(e.data).result);
+            });
+
+            source.addEventListener('failed', (e) => {
+                source.close();
+                reject(new Error(JSON.parse(e.data).error || 'Generation failed'));
+            });
+
+            source.onerror = () => {
+                // Connection lost: fall back to polling the status endpoint
+                source.close();
+                pollJob(jobId).then((status) => resolve(status.result), reject);
+            };
+        });
+    }
+
+    async function pollJob(jobId, intervalMs = 1000) {
+        while (true) {
+            const response = await fetch(`${API_URL}/jobs/${jobId}`);
+            if (!response.ok) {
+                throw new Error('Could not fetch job status');
+            }
+            const status = await response.json();
+            if (status.stage in stageProgress) {
+                updateProgress(stageProgress[status.stage]);
+            }
+            if (status.status === 'done') {
+                return status;
+            }
+            if (status.status === 'failed') {
+                throw new Error(status.error || 'Generation failed');
+            }
+            await new Promise(resolve => setTimeout(resolve, intervalMs));
+        }
+    }
+
     function updateProgress(percent) {
         progressText.textContent = `${percent}%`;
         progressFill.style.width = `${percent}%`;
@@ -114,10 +182,26 @@ document.addEventListener('DOMContentLoaded', () => {
 
     function displayResults(data) {
         resultsSection.classList.remove('hidden');
+        renderChapters(data.chapters);
+
+        // Setup Export Buttons
+        document.querySelectorAll('.export-actions button').forEach(btn => {
+            btn.onclick = () => {
+                const format = btn.dataset.format;
+                if (data.job_id) {
+                    window.open(`${API_URL}/download/${data.job_id}/${format}`, '_blank');
+                }
+            };
+        });
+
+        resultsSection.scrollIntoView({ behavior: 'smooth' });
+    }
+
+    function renderChapters(chapters) {
         chaptersList.innerHTML = ''; // Clear previous
 
-        if (data.chapters && data.chapters.length > 0) {
-            data.chapters.forEach(chapter => {
+        if (chapters && chapters.length > 0) {
+            chapters.forEach(chapter => {
                 const div = document.createElement('div');
                 div.className = 'chapter-item';
                 div.innerHTML = `
@@ -129,18 +213,6 @@ document.addEventListener('DOMContentLoaded', () => {
         } else {
             chaptersList.innerHTML = '<p>No chapters generated.</p>';
         }
-
-        // Setup Export Buttons
-        document.querySelectorAll('.export-actions button').forEach(btn => {
-            btn.onclick = () => {
-                const format = btn.dataset.format;
-                if (data.job_id) {
-                    window.open(`${API_URL}/download/${data.job_id}/${format}`, '_blank');
-                }
-            };
-        });
-
-        resultsSection.scrollIntoView({ behavior: 'smooth' });
     }
 
     function formatTime(seconds) {
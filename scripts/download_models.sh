@@ -0,0 +1,30 @@
+#!/usr/bin/env bash
+# Download models into data/models so the API and workers load them from disk.
+# Usage: scripts/download_models.sh [whisper_size] [embedding_model]
+set -euo pipefail
+
+WHISPER_MODEL="${1:-${WHISPER_MODEL:-base}}"
+EMBEDDING_MODEL="${2:-${EMBEDDING_MODEL:-sentence-transformers/all-MiniLM-L6-v2}}"
+MODELS_DIR="${MODELS_DIR:-data/models}"
+
+mkdir -p "$MODELS_DIR"
+
+echo "Downloading Whisper $WHISPER_MODEL..."
+python -c "
+from faster_whisper import download_model
+download_model('$WHISPER_MODEL', output_dir='$MODELS_DIR/faster-whisper-$WHISPER_MODEL')
+"
+
+echo "Downloading $EMBEDDING_MODEL..."
+python -c "
+from sentence_transformers import SentenceTransformer
+# safetensors weights are memory-mapped when the registry loads them
+SentenceTransformer('$EMBEDDING_MODEL').save('$MODELS_DIR/$EMBEDDING_MODEL', safe_serialization=True)
+"
+
+if [ "${EMBEDDING_BACKEND:-torch}" != "torch" ]; then
+    echo "Exporting $EMBEDDING_MODEL to ONNX..."
+    MODELS_DIR="$MODELS_DIR" python scripts/export_onnx_encoder.py --model "$EMBEDDING_MODEL" --models-dir "$MODELS_DIR"
+fi
+
+echo "Models saved to $MODELS_DIR"
@@ -0,0 +1,74 @@
+"""
+Export the segmentation encoder to ONNX, plus a dynamically quantized int8 copy.
+
+Writes model.onnx, model_int8.onnx and tokenizer.json to
+data/models/<model>-onnx, where the onnx / onnx-int8 EMBEDDING_BACKEND
+loads them from. Exporting needs torch and transformers; running the
+exported model needs only onnxruntime and tokenizers.
+
+Usage:
+    python scripts/export_onnx_encoder.py [--model sentence-transformers/all-MiniLM-L6-v2]
+"""
+from pathlib import Path
+import argparse
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import settings  # noqa: E402
+from src.segmentation.encoders import (  # noqa: E402
+    ONNX_MODEL_FILENAMES, TOKENIZER_FILENAME, onnx_model_dirname
+)
+
+
+def export(model_name: str, models_dir: Path, opset: int = 14) -> Path:
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModel, AutoTokenizer
+
+    local = models_dir / model_name
+    source = str(local) if local.is_dir() else model_name
+    output_dir = models_dir / onnx_model_dirname(model_name)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(source)
+    model = AutoModel.from_pretrained(source).eval()
+    sample = tokenizer(["An example sentence."], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "tokens"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "tokens"}
+
+    fp32_path = output_dir / ONNX_MODEL_FILENAMES["onnx"]
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset
+        )
+    print(f"Exported {fp32_path}")
+
+    int8_path = output_dir / ONNX_MODEL_FILENAMES["onnx-int8"]
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+    print(f"Quantized {int8_path}")
+
+    # tokenizer.json is all the tokenizers library needs at runtime
+    tokenizer.backend_tokenizer.save(str(output_dir / TOKENIZER_FILENAME))
+    return output_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the sentence encoder to ONNX")
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL)
+    parser.add_argument("--models-dir", type=Path, default=settings.MODELS_DIR)
+    parser.add_argument("--opset", type=int, default=14)
+    args = parser.parse_args()
+    output_dir = export(args.model, args.models_dir, args.opset)
+    print(f"ONNX encoder saved to {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Chapter a directory, glob or list of videos with a pool of worker processes.
+
+Each worker builds the pipeline (AudioExtractor, WhisperTranscriber,
+NLPSegmenter, ChapterGenerator and the export engine) once and keeps its
+models loaded for every video it processes. Finished videos are appended
+to a JSONL journal; rerunning the same command skips videos it records as
+done and retries failed ones. Outputs go to <output-dir>/<job id>/, where
+the job id is derived from the video path, so an interrupted video also
+resumes from its checkpoints.
+
+Usage:
+    python scripts/process_video.py data/input --workers 4
+    python scripts/process_video.py "talks/**/*.mp4" videos.txt --journal backfill.jsonl
+"""
+from functools import partial
+from pathlib import Path
+import argparse
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import settings  # noqa: E402
+from src.export.engine import EXPORT_FILENAMES  # noqa: E402
+from src.pipeline.batch import BatchJournal, build_pipeline, discover_videos, run_batch  # noqa: E402
+from src.pipeline.profiles import PROFILES  # noqa: E402
+from src.pipeline.runner import PIPELINE_MODES  # noqa: E402
+
+# Also runs in every spawned worker, which re-imports this module
+logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(processName)s %(message)s")
+logger = logging.getLogger("process_video")
+
+THREAD_VARIABLES = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch video chapter generation")
+    parser.add_argument("sources", nargs="+",
+                        help="Video files, directories, glob patterns or .txt/.jsonl lists")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 1) // 4),
+                        help="Worker processes (0 = run in this process)")
+    parser.add_argument("--output-dir", default=str(settings.OUTPUT_DIR))
+    parser.add_argument("--journal", help="JSONL record of finished videos "
+                                          "(default: <output-dir>/batch_journal.jsonl)")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--mode", choices=PIPELINE_MODES, default="full")
+    parser.add_argument("--profile", choices=list(PROFILES))
+    parser.add_argument("--min-chapter-duration", type=int, default=60)
+    parser.add_argument("--formats", nargs="+", choices=list(EXPORT_FILENAMES),
+                        default=["youtube", "json", "srt"])
+    parser.add_argument("--scene-detection", action=argparse.BooleanOptionalAction,
+                        default=settings.ENABLE_SCENE_DETECTION,
+                        help="Fuse visual scene cuts into chapter boundaries")
+    args = parser.parse_args()
+
+    try:
+        videos = discover_videos(args.sources)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    if not videos:
+        parser.error("No videos found")
+
+    # Split the cores between workers instead of every BLAS/OpenMP pool claiming all of them
+    threads = max(1, (os.cpu_count() or 1) // max(1, args.workers))
+    for name in THREAD_VARIABLES:
+        os.environ.setdefault(name, str(threads))
+
+    journal = BatchJournal(args.journal or Path(args.output_dir) / "batch_journal.jsonl")
+    run_options = {
+        "language": args.language,
+        "enable_scene_detection": args.scene_detection,
+        "min_chapter_duration": args.min_chapter_duration,
+        "export_formats": args.formats,
+        "mode": args.mode,
+        "profile": args.profile,
+    }
+
+    def log_record(record):
+        if record["status"] == "done":
+            logger.info(f"Done {record['video']}: {record['chapters']} chapters "
+                        f"in {record['processing_seconds']:.1f}s")
+        else:
+            logger.error(f"Failed {record['video']}: {record['error']}")
+
+    report = run_batch(
+        videos,
+        journal,
+        workers=args.workers,
+        run_options=run_options,
+        pipeline_factory=partial(
+            build_pipeline, output_root=args.output_dir, scene_detection=args.scene_detection
+        ),
+        on_record=log_record
+    )
+    print(json.dumps(report.to_dict(), indent=2))
+    if report.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
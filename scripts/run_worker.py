@@ -0,0 +1,58 @@
+"""
+Run chapter generation jobs from the Redis queue.
+
+Start any number of these, on any node that sees the same data
+directories (INPUT_DIR, OUTPUT_DIR) as the API, with the API set to
+QUEUE_BACKEND=redis. Each process loads the models once and runs up to
+--concurrency jobs at a time; jobs of a worker that dies are picked up by
+another once their lease (JOB_LEASE_SECONDS) expires. SIGTERM/SIGINT let
+running jobs finish before exiting.
+
+Usage:
+    python scripts/run_worker.py [--concurrency 2] [--redis-url redis://redis:6379/0]
+"""
+from pathlib import Path
+import argparse
+import logging
+import signal
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import settings  # noqa: E402
+from src.api.redis_queue import QueueWorker, RedisJobQueue, redis_from_url  # noqa: E402
+from src.pipeline.batch import build_pipeline  # noqa: E402
+
+logging.basicConfig(level=settings.LOG_LEVEL)
+logger = logging.getLogger("run_worker")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chapter generation queue worker")
+    parser.add_argument("--concurrency", type=int, default=settings.MAX_CONCURRENT_JOBS)
+    parser.add_argument("--redis-url", default=settings.REDIS_URL)
+    args = parser.parse_args()
+
+    pipeline = build_pipeline()
+
+    def run(job_id, cache_key=None, **params):
+        # The API's result cache key is of no use here
+        return pipeline.run(job_id, **params)
+
+    worker = QueueWorker(
+        RedisJobQueue(redis_from_url(args.redis_url)),
+        run,
+        concurrency=args.concurrency
+    )
+
+    def shutdown(signum, frame):
+        logger.info("Stopping after the running jobs finish")
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    worker.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+import hashlib
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed LRU cache of finished job results.
+
+    Keys combine the video hash with every parameter that changes the
+    output, so a hit can be answered with the earlier job's files.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    @staticmethod
+    def make_key(
+        video_hash: str,
+        language: str,
+        min_chapter_duration: int,
+        enable_scene_detection: bool,
+        export_formats: Iterable[str],
+        model_ids: Dict[str, str],
+        options: Optional[Dict] = None
+    ) -> str:
+        """Build a cache key from the video hash and pipeline parameters."""
+        params = {
+            "video": video_hash,
+            "language": language,
+            "min_chapter_duration": min_chapter_duration,
+            "enable_scene_detection": enable_scene_detection,
+            "export_formats": sorted(export_formats),
+            "models": model_ids,
+            "options": options or {},
+        }
+        payload = json.dumps(params, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached result, or None if missing or its files are gone."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._outputs_exist(entry["result"]):
+                logger.info(f"Dropping cache entry with missing outputs: {entry['result']['job_id']}")
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_seconds += entry["processing_seconds"]
+            return entry["result"]
+
+    def put(self, key: str, result: Dict, processing_seconds: float = 0.0):
+        """Store a finished result, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = {
+                "result": result,
+                "processing_seconds": processing_seconds,
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_job(self, job_id: str) -> int:
+        """Drop entries answered by ``job_id``, whose files were replaced."""
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items()
+                if entry["result"].get("job_id") == job_id
+            ]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "saved_processing_seconds": round(self.saved_seconds, 3),
+            }
+
+    @staticmethod
+    def _outputs_exist(result: Dict) -> bool:
+        return all(Path(path).exists() for path in result.get("outputs", {}).values())
@@ -0,0 +1,32 @@
+from pathlib import Path
+from typing import List, Optional
+from config import settings
+
+
+def resolve_input_path(
+    video_path: str,
+    allowed_roots: Optional[List[Path]] = None
+) -> Path:
+    """
+    Resolve a server-side video path and check it lies under an allowed root.
+
+    Relative paths are taken relative to the first allowed root.
+
+    Raises:
+        PermissionError: Path escapes every allowed root
+        FileNotFoundError: Path does not point to a file
+    """
+    roots = [Path(root).resolve() for root in (allowed_roots or settings.VIDEO_INPUT_ROOTS)]
+    if not roots:
+        raise PermissionError("No video input roots configured")
+
+    path = Path(video_path)
+    if not path.is_absolute():
+        path = roots[0] / path
+    path = path.resolve()
+
+    if not any(path.is_relative_to(root) for root in roots):
+        raise PermissionError(f"Path is outside the allowed input roots: {video_path}")
+    if not path.is_file():
+        raise FileNotFoundError(f"Video not found: {video_path}")
+    return path
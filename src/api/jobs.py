@@ -0,0 +1,195 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import json
+import logging
+import threading
+import time
+import uuid
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+STATUS_FILENAME = "status.json"
+
+
+@dataclass
+class Job:
+    """State of a chapter generation job."""
+    job_id: str
+    status: str = "queued"  # queued, running, done, failed
+    stage: Optional[str] = None
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    params: Dict = field(default_factory=dict)
+    attempts: int = 0
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class JobManager:
+    """
+    Run pipeline jobs on a bounded thread pool off the event loop.
+
+    Job state is kept in memory and mirrored to ``status.json`` in the job's
+    output directory, so any API worker on the host can answer status queries.
+    Progress events published while a job runs are kept in memory only.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[..., Dict],
+        max_workers: int = 2,
+        max_retained_jobs: int = 1000
+    ):
+        self.runner = runner
+        self.max_workers = max_workers
+        self.max_retained_jobs = max_retained_jobs
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="chapter-job"
+        )
+        self._jobs: Dict[str, Job] = {}
+        self._events: Dict[str, List[Dict]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, job_id: str, **params) -> Job:
+        """Queue a job; ``params`` are passed to the runner."""
+        return self._enqueue(Job(job_id=job_id, params=params))
+
+    def retry(self, job_id: str) -> Optional[Job]:
+        """Queue a finished job again with its original parameters."""
+        previous = self.get(job_id)
+        if previous is None:
+            return None
+        return self._enqueue(Job(
+            job_id=job_id,
+            params=previous.params,
+            attempts=previous.attempts
+        ))
+
+    def _enqueue(self, job: Job) -> Job:
+        job_id = job.job_id
+        with self._lock:
+            self._jobs[job_id] = job
+            self._events[job_id] = []
+            self._prune()
+        self._persist(job)
+        self._executor.submit(self._run, job)
+        logger.info(f"Job queued: {job_id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return job state from memory, falling back to the status file."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            job = self._load(job_id)
+        return job
+
+    def update_result(self, job_id: str, result: Dict) -> Optional[Job]:
+        """Replace a finished job's result, e.g. after re-chaptering."""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.result = result
+        self._persist(job)
+        return job
+
+    def publish(self, job_id: str, event: Dict):
+        """Append a progress event to the job's event log."""
+        with self._lock:
+            if job_id in self._events:
+                self._events[job_id].append(event)
+
+    def events_since(self, job_id: str, index: int) -> Optional[List[Dict]]:
+        """
+        Events published after position ``index``.
+
+        Returns None if this process holds no event log for the job, e.g.
+        because it was queued by another API worker.
+        """
+        with self._lock:
+            events = self._events.get(job_id)
+            return None if events is None else events[index:]
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: Job):
+        job.status = "running"
+        job.attempts += 1
+        job.started_at = time.time()
+        self._persist(job)
+
+        def on_stage(stage: str):
+            job.stage = stage
+            self._persist(job)
+            self.publish(job.job_id, {"type": "stage", "stage": stage})
+
+        def on_event(event: Dict):
+            self.publish(job.job_id, event)
+
+        try:
+            job.result = self.runner(
+                job.job_id, on_stage=on_stage, on_event=on_event, **job.params
+            )
+            job.status = "done"
+            logger.info(f"Job finished: {job.job_id}")
+        except Exception as e:
+            logger.error(f"Job {job.job_id} failed: {e}")
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            self._persist(job)
+            if job.status == "done":
+                self.publish(job.job_id, {"type": "done", "result": job.result})
+            else:
+                self.publish(job.job_id, {"type": "failed", "error": job.error})
+
+    def _prune(self):
+        """Drop the oldest finished jobs from memory; their status file remains."""
+        excess = len(self._jobs) - self.max_retained_jobs
+        if excess <= 0:
+            return
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in ("done", "failed")
+        ]
+        for job_id in finished[:excess]:
+            del self._jobs[job_id]
+            self._events.pop(job_id, None)
+
+    @staticmethod
+    def _status_path(job_id: str) -> Optional[Path]:
+        try:
+            uuid.UUID(job_id)
+        except ValueError:
+            return None
+        return settings.OUTPUT_DIR / job_id / STATUS_FILENAME
+
+    def _persist(self, job: Job):
+        path = self._status_path(job.job_id)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(job.to_dict(), f)
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Could not persist status for job {job.job_id}: {e}")
+
+    def _load(self, job_id: str) -> Optional[Job]:
+        path = self._status_path(job_id)
+        if path is None or not path.exists():
+            return None
+        with open(path, encoding='utf-8') as f:
+            return Job(**json.load(f))
@@ -1,12 +1,31 @@
 from fastapi import FastAPI, UploadFile, File, BackgroundTasks, Form
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, Optional
+import asyncio
+import json
 import logging
+import threading
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
+import hashlib
+import time
 import uuid
+from config import settings
+from src.api.cache import ResultCache, hash_file
+from src.api.dependencies import resolve_input_path
+from src.api.jobs import JobManager
+from src.api.redis_queue import RedisJobQueue, redis_from_url
+from src.model_registry import model_registry
+from src.segmentation.embeddings import embedding_batcher_stats, embedding_cache_stats
+from src.export.engine import EXPORT_FILENAMES, ExportEngine
+from src.pipeline.metrics import pipeline_metrics
+from src.pipeline.profiles import PROFILES
+from src.pipeline.runner import PIPELINE_MODES, ChapterPipeline
+from src.segmentation.nlp_segmenter import SEGMENTATION_METHODS
 # from src.audio_extraction.extractor import AudioExtractor
 # from src.transcription.whisper_asr import WhisperTranscriber
 # from src.segmentation.nlp_segmenter import NLPSegmenter
@@ -20,10 +39,25 @@ import uuid
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.PRELOAD_MODELS:
+        # Warm the shared registry off the event loop so /health is up at once
+        threading.Thread(
+            target=model_registry.preload,
+            args=(settings.WHISPER_MODEL, settings.EMBEDDING_MODEL, settings.EMBEDDING_BACKEND),
+            name="model-preload",
+            daemon=True
+        ).start()
+    yield
+    # Let running jobs finish before the worker exits
+    job_manager.shutdown(wait=True)
+
 app = FastAPI(
     title="Video Chapter Generator API",
     description="Automatic video chapter generation with ASR and NLP",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Enable CORS
@@ -47,13 +81,24 @@ logger.info("Mocking heavy components for preview...")
 class MockAudioExtractor:
     def extract_audio_moviepy(self, path): 
         # Create a dummy audio file
-        audio_path = Path("data/temp/mock_audio.wav")
+        audio_path = settings.TEMP_DIR / f"{Path(path).stem}.wav"
         audio_path.parent.mkdir(parents=True, exist_ok=True)
         audio_path.touch()
         return str(audio_path), 120.0
 
+    def extract_audio_pcm(self, path):
+        import numpy as np
+        return np.zeros(16000, dtype=np.float32), 120.0
+
+    def probe_duration(self, path):
+        return 120.0
+
 class MockTranscriber:
-    def transcribe(self, path, language="en"):
+    def transcribe(self, path, language="en", **options):
+        segments, metadata = self.transcribe_stream(path, language)
+        return list(segments), metadata
+
+    def transcribe_stream(self, path, language="en", **options):
         # Return dummy segments
         from dataclasses import dataclass
         @dataclass
@@ -62,20 +107,22 @@ class MockTranscriber:
             end: float
             text: str
         
-        return [
+        return iter([
             Segment(0.0, 10.0, "Welcome to this video."),
             Segment(10.0, 60.0, "This is the first chapter content."),
             Segment(60.0, 120.0, "And this is the conclusion.")
-        ], {}
+        ]), {}
 
 class MockSegmenter:
-    def generate_embeddings(self, segments): return []
-    def cluster_segments(self, embeddings): return []
-    def identify_chapter_boundaries(self, segments, labels): return [0, 2] # Start at 0 and 2
-    def extract_topics_nmf(self, segments, n_topics=1): return ["Introduction", "Conclusion"]
+    def generate_embeddings(self, segments): return [[0.0] for _ in segments]
+    def cluster_segments(self, embeddings, method="kmeans", n_clusters=None, segments=None, n_init=10, min_duration=None): return []
+    def identify_chapter_boundaries(self, segments, labels, min_duration=None): return [0, 2] # Start at 0 and 2
+    def provisional_boundaries(self, segments, embeddings): return [0]
+    def topic_features(self, segments): return None, []
+    def extract_topics_nmf(self, segments, n_topics=1, features=None): return ["Introduction", "Conclusion"]
 
 class MockSceneDetector:
-    pass
+    def detect_scenes(self, path): return [(0.0, 60.0), (60.0, 120.0)]
 
 class MockChapterGenerator:
     def generate_chapters(self, segments, boundaries, topics):
@@ -94,6 +141,9 @@ class MockChapterGenerator:
             Chapter(2, "Conclusion", 60.0, 120.0, 60.0, "Conclusion description")
         ]
     
+    def generate_chapters_from_cuts(self, cut_times, duration):
+        return self.generate_chapters([], [], None)
+
     def optimize_chapter_durations(self, chapters, min_duration=60):
         return chapters
 
@@ -124,12 +174,151 @@ class SubtitleGenerator(MockSubtitleGenerator): pass
 
 logger.info("All components initialized (MOCKED).")
 
+pipeline = ChapterPipeline(
+    audio_extractor=audio_extractor,
+    transcriber=transcriber,
+    segmenter=segmenter,
+    chapter_generator=chapter_gen,
+    youtube_exporter=YouTubeExporter(),
+    json_exporter=JSONExporter(),
+    subtitle_generator=SubtitleGenerator(),
+    scene_detector=scene_detector,
+    export_engine=ExportEngine(),
+    # Chunked parallel transcription returns all segments at once
+    streaming=settings.STREAMING_TRANSCRIPTION and settings.TRANSCRIPTION_WORKERS <= 1,
+    embedding_batch_size=settings.EMBEDDING_BATCH_SIZE,
+    segmentation_method=settings.SEGMENTATION_METHOD,
+    audio_mode=settings.AUDIO_EXTRACTION_MODE
+)
+result_cache = ResultCache(max_entries=settings.RESULT_CACHE_MAX_ENTRIES)
+
+def run_job(job_id: str, cache_key: Optional[str] = None, **params) -> dict:
+    """Run the pipeline for a job and remember its result for cache hits."""
+    started = time.perf_counter()
+    result = pipeline.run(job_id, **params)
+    if cache_key is not None:
+        result_cache.put(cache_key, result, processing_seconds=time.perf_counter() - started)
+    return result
+
+if settings.QUEUE_BACKEND == "redis":
+    # Jobs run in scripts/run_worker.py processes, which share the data directories
+    job_manager = RedisJobQueue(redis_from_url(settings.REDIS_URL))
+elif settings.QUEUE_BACKEND == "local":
+    job_manager = JobManager(run_job, max_workers=settings.MAX_CONCURRENT_JOBS)
+else:
+    raise ValueError(f"Unknown QUEUE_BACKEND: {settings.QUEUE_BACKEND}")
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+SSE_POLL_INTERVAL = 0.25
+
 class ChapterRequest(BaseModel):
     video_path: str
     language: str = "en"
     enable_scene_detection: bool = False
     min_chapter_duration: int = 60
     export_formats: list[str] = ["youtube", "json", "srt"]
+    mode: str = "full"
+    profile: Optional[str] = None
+    deadline_seconds: Optional[float] = None
+
+class RechapterRequest(BaseModel):
+    min_chapter_duration: int = 60
+    n_chapters: Optional[int] = None
+    segmentation_method: Optional[str] = None
+    # Default: the formats the job was created with
+    export_formats: Optional[list[str]] = None
+
+# job id -> [lock, requests holding or waiting for it]
+_rechapter_locks: Dict[str, list] = {}
+_rechapter_locks_guard = threading.Lock()
+
+@contextmanager
+def rechapter_lock(job_id: str):
+    """
+    Re-chapter one request per job at a time.
+
+    Two requests for the same job would write the same files; requests for
+    different jobs run in parallel.
+    """
+    with _rechapter_locks_guard:
+        entry = _rechapter_locks.setdefault(job_id, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _rechapter_locks_guard:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _rechapter_locks[job_id]
+
+def queue_job(
+    job_id: str,
+    video_path: Path,
+    video_hash: str,
+    **params
+) -> JSONResponse:
+    """Answer from the result cache, or queue the pipeline for the video."""
+    if params["mode"] not in PIPELINE_MODES:
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"Unknown mode: {params['mode']}"}
+        )
+    if params["profile"] is not None and params["profile"] not in PROFILES:
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"Unknown profile: {params['profile']}"}
+        )
+    if params["deadline_seconds"] is not None and params["deadline_seconds"] <= 0:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "deadline_seconds must be positive"}
+        )
+    cache_key = ResultCache.make_key(
+        video_hash,
+        params["language"],
+        params["min_chapter_duration"],
+        params["enable_scene_detection"],
+        params["export_formats"],
+        {
+            "whisper": settings.WHISPER_MODEL,
+            "embedding": settings.EMBEDDING_MODEL,
+            # The torch and ONNX encoders produce slightly different embeddings
+            "embedding_backend": settings.EMBEDDING_BACKEND,
+            "segmentation": settings.SEGMENTATION_METHOD
+        },
+        {
+            "mode": params["mode"],
+            "profile": params["profile"],
+            "deadline_seconds": params["deadline_seconds"]
+        }
+    )
+    # Redis jobs run in worker processes, whose results never reach this
+    # process's cache, so caching is off with that backend
+    use_cache = not isinstance(job_manager, RedisJobQueue)
+    cached = result_cache.get(cache_key) if use_cache else None
+    if cached is not None:
+        logger.info(f"Result cache hit: reusing job {cached['job_id']}")
+        return JSONResponse(
+            status_code=200,
+            content={
+                "job_id": cached["job_id"],
+                "status": "done",
+                "cached": True,
+                "result": cached
+            }
+        )
+
+    job = job_manager.submit(
+        job_id,
+        video_path=str(video_path),
+        cache_key=cache_key if use_cache else None,
+        **params
+    )
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job.job_id, "status": job.status}
+    )
 
 @app.get("/health")
 async def health_check():
@@ -142,96 +331,53 @@ async def generate_chapters(
     language: str = Form("en"),
     enable_scene_detection: bool = Form(False),
     min_chapter_duration: int = Form(60),
-    export_formats: list[str] = Form(["youtube", "json", "srt"])
+    export_formats: list[str] = Form(["youtube", "json", "srt"]),
+    mode: str = Form("full"),
+    profile: Optional[str] = Form(None),
+    deadline_seconds: Optional[float] = Form(None)
 ):
     """
-    Generate chapters from uploaded video.
-
-    Process:
-    1. Extract audio
-    2. Transcribe with Whisper
-    3. Segment with NLP
-    4. Generate chapters
-    5. Export multiple formats
+    Queue chapter generation for an uploaded video.
+
+    The pipeline runs on the job pool; poll ``GET /jobs/{job_id}`` for
+    progress and the result. ``mode="fast"`` skips ASR and returns an
+    outline cut at long pauses (and scene changes, if enabled).
+
+    ``profile`` is one of ``fast``, ``balanced`` or ``accurate``. With
+    ``deadline_seconds``, the most accurate profile (no more accurate than
+    ``profile``) expected to finish in time on this host is chosen.
     """
     try:
         # Save uploaded video
         job_id = str(uuid.uuid4())
-        video_path = Path("data/input") / f"{job_id}_{video.filename}"
+        settings.INPUT_DIR.mkdir(parents=True, exist_ok=True)
+        video_path = settings.INPUT_DIR / f"{job_id}_{Path(video.filename).name}"
 
+        # Stream to disk in chunks instead of buffering the whole upload,
+        # hashing as we go for the result cache
+        digest = hashlib.sha256()
         with open(video_path, "wb") as f:
-            content = await video.read()
-            f.write(content)
-
-        logger.info(f"Processing video: {video_path}")
-
-        # Step 1: Extract audio
-        audio_path, duration = audio_extractor.extract_audio_moviepy(str(video_path))
-
-        # Step 2: Transcribe
-        segments, metadata = transcriber.transcribe(audio_path, language=language)
-
-        # Step 3: Generate embeddings and cluster
-        embeddings = segmenter.generate_embeddings(segments)
-        labels = segmenter.cluster_segments(embeddings)
-        boundaries = segmenter.identify_chapter_boundaries(segments, labels)
-
-        # Step 4: Extract topics
-        topics = segmenter.extract_topics_nmf(segments, n_topics=len(boundaries))
-
-        # Step 5: Generate chapters
-        chapters = chapter_gen.generate_chapters(segments, boundaries, topics)
-        chapters = chapter_gen.optimize_chapter_durations(chapters, min_duration=min_chapter_duration)
-
-        # Step 6: Export formats
-        output_dir = Path("data/output") / job_id
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        # YouTube format
-        youtube_path = output_dir / "chapters_youtube.txt"
-        if "youtube" in export_formats:
-            youtube_content = YouTubeExporter().export(chapters)
-            with open(youtube_path, 'w') as f:
-                f.write(youtube_content)
-
-        # JSON format
-        json_path = output_dir / "chapters.json"
-        if "json" in export_formats:
-            JSONExporter().export(
-                chapters,
-                {"filename": video.filename, "duration": duration},
-                str(json_path)
-            )
-
-        # SRT format
-        srt_path = output_dir / "subtitles.srt"
-        if "srt" in export_formats:
-            SubtitleGenerator().generate_srt(segments, str(srt_path))
-
-        outputs = {}
-        if "youtube" in export_formats:
-            outputs["youtube"] = str(youtube_path)
-        if "json" in export_formats:
-            outputs["json"] = str(json_path)
-        if "srt" in export_formats:
-            outputs["srt"] = str(srt_path)
-
-        return {
-            "job_id": job_id,
-            "status": "success",
-            "chapters_count": len(chapters),
-            "duration": duration,
-            "outputs": outputs,
-            "chapters": [
-                {
-                    "number": ch.number,
-                    "title": ch.title,
-                    "start": ch.start_time,
-                    "end": ch.end_time
-                }
-                for ch in chapters
-            ]
-        }
+            while chunk := await video.read(UPLOAD_CHUNK_SIZE):
+                digest.update(chunk)
+                f.write(chunk)
+
+        response = queue_job(
+            job_id,
+            video_path,
+            digest.hexdigest(),
+            filename=video.filename,
+            language=language,
+            enable_scene_detection=enable_scene_detection,
+            min_chapter_duration=min_chapter_duration,
+            export_formats=export_formats,
+            mode=mode,
+            profile=profile,
+            deadline_seconds=deadline_seconds
+        )
+        if response.status_code != 202:
+            # Cache hit or rejected request: the upload is not needed
+            video_path.unlink(missing_ok=True)
+        return response
     except Exception as e:
         logger.error(f"Chapter generation failed: {e}")
         return JSONResponse(
@@ -239,24 +385,207 @@ async def generate_chapters(
             content={"error": str(e)}
         )
 
+@app.post("/generate-chapters/from-path")
+async def generate_chapters_from_path(request: ChapterRequest):
+    """
+    Queue chapter generation for a video already on the server.
+
+    The file is processed in place; ``video_path`` must lie under one of the
+    directories listed in ``VIDEO_INPUT_ROOTS``.
+    """
+    try:
+        video_path = resolve_input_path(request.video_path)
+    except PermissionError as e:
+        return JSONResponse(status_code=403, content={"error": str(e)})
+    except FileNotFoundError as e:
+        return JSONResponse(status_code=404, content={"error": str(e)})
+
+    video_hash = await run_in_threadpool(hash_file, str(video_path))
+    return queue_job(
+        str(uuid.uuid4()),
+        video_path,
+        video_hash,
+        filename=video_path.name,
+        language=request.language,
+        enable_scene_detection=request.enable_scene_detection,
+        min_chapter_duration=request.min_chapter_duration,
+        export_formats=request.export_formats,
+        mode=request.mode,
+        profile=request.profile,
+        deadline_seconds=request.deadline_seconds
+    )
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Result and embedding cache hit/miss counters, embedding batch sizes."""
+    return {
+        **result_cache.stats(),
+        "embeddings": embedding_cache_stats(),
+        "embedding_batching": embedding_batcher_stats()
+    }
+
+@app.get("/metrics")
+async def metrics():
+    """Per-stage wall/CPU time, peak RSS delta, items and real-time factor (Prometheus)."""
+    return PlainTextResponse(
+        pipeline_metrics.render(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get job status: queued, running (with current stage), done or failed."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Job not found"}
+        )
+    return job.to_dict()
+
+def terminal_events(job) -> list:
+    """The final ``done`` or ``failed`` event of a finished job, from its record."""
+    if job.status == "done":
+        return [{"type": "done", "result": job.result}]
+    if job.status == "failed":
+        return [{"type": "failed", "error": job.error}]
+    return []
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """
+    Stream job progress as Server-Sent Events.
+
+    Event types: ``stage``, ``progress``, ``chapters`` (provisional), and a
+    final ``done`` or ``failed``.
+    """
+    if job_manager.get(job_id) is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Job not found"}
+        )
+
+    async def event_stream():
+        index = 0
+        last_stage = None
+        while True:
+            events = job_manager.events_since(job_id, index)
+            if events is None:
+                # Queued by another worker: follow its status file instead
+                job = job_manager.get(job_id)
+                events = []
+                if job.stage != last_stage:
+                    last_stage = job.stage
+                    events.append({"type": "stage", "stage": job.stage})
+                events.extend(terminal_events(job))
+            elif not events:
+                # The event log of a finished job may have expired
+                events = terminal_events(job_manager.get(job_id))
+            else:
+                index += len(events)
+
+            for event in events:
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+                if event["type"] in ("done", "failed"):
+                    return
+            await asyncio.sleep(SSE_POLL_INTERVAL)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+@app.post("/jobs/{job_id}/retry")
+async def retry_job(job_id: str):
+    """Re-run a failed job, resuming from its last completed stage checkpoint."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Job not found"}
+        )
+    if job.status != "failed":
+        return JSONResponse(
+            status_code=409,
+            content={"error": f"Only failed jobs can be retried (status: {job.status})"}
+        )
+
+    job = job_manager.retry(job_id)
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job.job_id, "status": job.status}
+    )
+
+@app.post("/jobs/{job_id}/rechapter")
+async def rechapter_job(job_id: str, request: RechapterRequest):
+    """
+    Re-chapter a finished job with new parameters.
+
+    Reuses the job's stored transcript and embeddings, so only clustering,
+    topics, chapter generation and export run. The new outputs replace the
+    job's files and result.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Job not found"}
+        )
+    if job.status != "done":
+        return JSONResponse(
+            status_code=409,
+            content={"error": f"Only finished jobs can be re-chaptered (status: {job.status})"}
+        )
+    method = request.segmentation_method
+    if method is not None and method not in SEGMENTATION_METHODS:
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"Unknown segmentation method: {method}"}
+        )
+    if request.n_chapters is not None and request.n_chapters < 1:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "n_chapters must be at least 1"}
+        )
+    export_formats = request.export_formats or job.params.get(
+        "export_formats", ["youtube", "json", "srt"]
+    )
+    unknown = [f for f in export_formats if f not in EXPORT_FILENAMES]
+    if unknown:
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"Unknown export formats: {unknown}"}
+        )
+
+    def rechapter():
+        # The stored result must describe the files this request wrote
+        with rechapter_lock(job_id):
+            result = pipeline.rechapter(
+                job_id,
+                filename=job.params.get("filename", ""),
+                min_chapter_duration=request.min_chapter_duration,
+                n_chapters=request.n_chapters,
+                segmentation_method=method,
+                export_formats=export_formats
+            )
+            job_manager.update_result(job_id, result)
+            result_cache.invalidate_job(job_id)
+            return result
+
+    try:
+        return await run_in_threadpool(rechapter)
+    except FileNotFoundError as e:
+        # e.g. fast-mode jobs, which never transcribe
+        return JSONResponse(status_code=409, content={"error": str(e)})
+
 @app.get("/download/{job_id}/{format}")
 async def download_output(job_id: str, format: str):
     """Download generated chapter files."""
-    output_dir = Path("data/output") / job_id
-    format_map = {
-        "youtube": "chapters_youtube.txt",
-        "json": "chapters.json",
-        "srt": "subtitles.srt",
-        "vtt": "subtitles.vtt"
-    }
-
-    if format not in format_map:
+    output_dir = settings.OUTPUT_DIR / job_id
+    if format not in EXPORT_FILENAMES:
         return JSONResponse(
             status_code=400,
             content={"error": f"Invalid format: {format}"}
         )
 
-    file_path = output_dir / format_map[format]
+    file_path = output_dir / EXPORT_FILENAMES[format]
     if not file_path.exists():
         return JSONResponse(
             status_code=404,
@@ -0,0 +1,320 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+import json
+import logging
+import socket
+import threading
+import time
+import uuid
+from config import settings
+from src.api.jobs import Job
+
+try:
+    from redis.exceptions import WatchError
+except ImportError:  # Only the redis queue backend needs the client library
+    class WatchError(Exception):
+        """Stand-in for ``redis.exceptions.WatchError``."""
+
+logger = logging.getLogger(__name__)
+
+# Progress events are only needed while clients follow a job
+EVENTS_TTL_SECONDS = 3600
+
+
+def redis_from_url(url: str):
+    """Redis client returning ``str`` values, as the queue expects."""
+    import redis
+    return redis.Redis.from_url(url, decode_responses=True)
+
+
+class RedisJobQueue:
+    """
+    Job queue shared through Redis by API replicas and worker processes.
+
+    Has the ``JobManager`` interface the API uses, but only records and
+    enqueues jobs; ``QueueWorker`` processes run them. Any API replica can
+    answer status and event queries because all state lives in Redis.
+
+    Keys (under ``prefix``):
+        queue               sorted set of job ids, scored by the time the
+                            job next becomes claimable
+        job:<id>            JSON job record (``Job.to_dict``)
+        lease:<id>          token of the worker holding the job
+        events:<id>         list of JSON progress events
+
+    A claimed job stays in ``queue`` with its score pushed to the lease
+    expiry. Heartbeats keep pushing it forward; if the worker dies, the
+    score falls behind the clock and another worker claims the job again,
+    up to ``max_attempts`` runs.
+    """
+
+    def __init__(
+        self,
+        client,
+        prefix: str = "chapters",
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.lease_seconds = lease_seconds or settings.JOB_LEASE_SECONDS
+        self.max_attempts = max_attempts or settings.JOB_MAX_ATTEMPTS
+
+    @property
+    def queue_key(self) -> str:
+        return f"{self.prefix}:queue"
+
+    def job_key(self, job_id: str) -> str:
+        return f"{self.prefix}:job:{job_id}"
+
+    def lease_key(self, job_id: str) -> str:
+        return f"{self.prefix}:lease:{job_id}"
+
+    def events_key(self, job_id: str) -> str:
+        return f"{self.prefix}:events:{job_id}"
+
+    # JobManager interface
+
+    def submit(self, job_id: str, **params) -> Job:
+        """Record a job and make it claimable by workers."""
+        return self._enqueue(Job(job_id=job_id, params=params))
+
+    def retry(self, job_id: str) -> Optional[Job]:
+        """Queue a finished job again with its original parameters."""
+        previous = self.get(job_id)
+        if previous is None:
+            return None
+        return self._enqueue(Job(job_id=job_id, params=previous.params))
+
+    def get(self, job_id: str) -> Optional[Job]:
+        data = self.client.get(self.job_key(job_id))
+        return None if data is None else Job(**json.loads(data))
+
+    def update_result(self, job_id: str, result: Dict) -> Optional[Job]:
+        """Replace a finished job's result, e.g. after re-chaptering."""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.result = result
+        self.save(job)
+        return job
+
+    def publish(self, job_id: str, event: Dict):
+        self.client.rpush(self.events_key(job_id), json.dumps(event))
+
+    def events_since(self, job_id: str, index: int) -> Optional[List[Dict]]:
+        """Events published after position ``index``; None for unknown jobs."""
+        if self.client.get(self.job_key(job_id)) is None:
+            return None
+        return [json.loads(e) for e in self.client.lrange(self.events_key(job_id), index, -1)]
+
+    def shutdown(self, wait: bool = True):
+        """Nothing runs in the API process; queued jobs stay in Redis."""
+
+    # Shared by API and workers
+
+    def save(self, job: Job):
+        self.client.set(self.job_key(job.job_id), json.dumps(job.to_dict()))
+
+    def _enqueue(self, job: Job) -> Job:
+        self.client.delete(self.events_key(job.job_id))
+        self.save(job)
+        self.client.zadd(self.queue_key, {job.job_id: time.time()})
+        logger.info(f"Job queued in Redis: {job.job_id}")
+        return job
+
+    # Leases
+
+    def claim(self, token: str) -> Optional[str]:
+        """
+        Lease the oldest claimable job to ``token``.
+
+        The queue is watched, so of two workers picking the same job only
+        one transaction succeeds; the other retries with the next job.
+        """
+        while True:
+            with self.client.pipeline() as pipe:
+                try:
+                    pipe.watch(self.queue_key)
+                    now = time.time()
+                    ready = pipe.zrangebyscore(self.queue_key, "-inf", now, start=0, num=1)
+                    if not ready:
+                        return None
+                    job_id = ready[0]
+                    pipe.multi()
+                    pipe.zadd(self.queue_key, {job_id: now + self.lease_seconds})
+                    pipe.set(self.lease_key(job_id), token, ex=self._lease_ttl())
+                    pipe.execute()
+                    return job_id
+                except WatchError:
+                    continue
+
+    def renew(self, job_id: str, token: str) -> bool:
+        """Extend the lease if ``token`` still holds it."""
+        return self._if_leased(job_id, token, lambda pipe: (
+            pipe.zadd(self.queue_key, {job_id: time.time() + self.lease_seconds}, xx=True),
+            pipe.set(self.lease_key(job_id), token, ex=self._lease_ttl())
+        ))
+
+    def finish(self, job: Job, token: str) -> bool:
+        """Store the final job record and remove it from the queue, if still leased."""
+        job_id = job.job_id
+        return self._if_leased(job_id, token, lambda pipe: (
+            pipe.set(self.job_key(job_id), json.dumps(job.to_dict())),
+            pipe.zrem(self.queue_key, job_id),
+            pipe.delete(self.lease_key(job_id)),
+            pipe.expire(self.events_key(job_id), EVENTS_TTL_SECONDS)
+        ))
+
+    def _if_leased(self, job_id: str, token: str, commands: Callable) -> bool:
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(self.lease_key(job_id))
+                if pipe.get(self.lease_key(job_id)) != token:
+                    return False
+                pipe.multi()
+                commands(pipe)
+                pipe.execute()
+                return True
+            except WatchError:
+                return False
+
+    def _lease_ttl(self) -> int:
+        # Outlives the queue score, so an expired job is reclaimed before its token vanishes
+        return int(self.lease_seconds * 2) + 1
+
+
+class QueueWorker:
+    """
+    Claim and run jobs from a ``RedisJobQueue``.
+
+    Runs ``concurrency`` jobs at a time, each on its own thread with the
+    shared ``runner`` (typically ``ChapterPipeline.run``, whose models stay
+    loaded across jobs). While a job runs, its lease is renewed every
+    ``heartbeat_seconds``; stage changes, progress events and the result
+    are written back to Redis. A worker that loses a lease (it stalled
+    past the expiry and another worker took the job over) passes that on
+    as the runner's ``cancelled`` event, so the pipeline stops before its
+    next stage, and discards the result.
+    """
+
+    def __init__(
+        self,
+        queue: RedisJobQueue,
+        runner: Callable[..., Dict],
+        concurrency: int = 1,
+        heartbeat_seconds: Optional[float] = None,
+        poll_interval: float = 1.0
+    ):
+        self.queue = queue
+        self.runner = runner
+        self.concurrency = concurrency
+        self.heartbeat_seconds = heartbeat_seconds or queue.lease_seconds / 3
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self._stop = threading.Event()
+
+    def run_forever(self):
+        """Process jobs until ``stop`` is called; running jobs are finished first."""
+        logger.info(f"Worker {self.worker_id} started with {self.concurrency} slots")
+        with ThreadPoolExecutor(self.concurrency, thread_name_prefix="queue-worker") as pool:
+            for _ in range(self.concurrency):
+                pool.submit(self._slot)
+
+    def stop(self):
+        self._stop.set()
+
+    def _slot(self):
+        while not self._stop.is_set():
+            try:
+                processed = self.run_once()
+            except Exception as e:
+                logger.error(f"Worker {self.worker_id} could not reach the queue: {e}")
+                processed = False
+            if not processed:
+                self._stop.wait(self.poll_interval)
+
+    def run_once(self) -> bool:
+        """Claim and run one job; False if none was claimable."""
+        claimed = self._claim()
+        if claimed is None:
+            return False
+        job, token = claimed
+        self._process(job, token)
+        return True
+
+    def _claim(self) -> Optional[Tuple[Job, str]]:
+        while True:
+            token = f"{self.worker_id}-{uuid.uuid4().hex[:8]}"
+            job_id = self.queue.claim(token)
+            if job_id is None:
+                return None
+            job = self.queue.get(job_id)
+            if job is None:
+                logger.warning(f"Dropping queued job without a record: {job_id}")
+                self.queue.client.zrem(self.queue.queue_key, job_id)
+                continue
+            if job.attempts >= self.queue.max_attempts:
+                # Every earlier lease expired without the job finishing
+                job.status = "failed"
+                job.error = f"Lease expired {job.attempts} times; giving up"
+                job.finished_at = time.time()
+                if self.queue.finish(job, token):
+                    self.queue.publish(job_id, {"type": "failed", "error": job.error})
+                logger.error(f"Job {job_id} failed: {job.error}")
+                continue
+            return job, token
+
+    def _process(self, job: Job, token: str):
+        queue = self.queue
+        lease_lost = threading.Event()
+        finished = threading.Event()
+
+        def heartbeat():
+            while not finished.wait(self.heartbeat_seconds):
+                if not queue.renew(job.job_id, token):
+                    logger.warning(f"Lost the lease on job {job.job_id}")
+                    lease_lost.set()
+                    return
+
+        job.status = "running"
+        job.stage = None
+        job.attempts += 1
+        job.started_at = time.time()
+        queue.save(job)
+        threading.Thread(target=heartbeat, name=f"heartbeat-{job.job_id}", daemon=True).start()
+        logger.info(f"Worker {self.worker_id} running job {job.job_id} (attempt {job.attempts})")
+
+        def on_stage(stage: str):
+            if lease_lost.is_set():
+                return
+            job.stage = stage
+            queue.save(job)
+            queue.publish(job.job_id, {"type": "stage", "stage": stage})
+
+        def on_event(event: Dict):
+            if not lease_lost.is_set():
+                queue.publish(job.job_id, event)
+
+        try:
+            job.result = self.runner(
+                job.job_id, on_stage=on_stage, on_event=on_event, cancelled=lease_lost,
+                **job.params
+            )
+            job.status = "done"
+        except Exception as e:
+            logger.error(f"Job {job.job_id} failed: {e}")
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            finished.set()
+
+        job.finished_at = time.time()
+        if not queue.finish(job, token):
+            logger.warning(f"Discarding result of job {job.job_id}: its lease expired")
+            return
+        if job.status == "done":
+            queue.publish(job.job_id, {"type": "done", "result": job.result})
+        else:
+            queue.publish(job.job_id, {"type": "failed", "error": job.error})
+        logger.info(f"Job {job.job_id} {job.status}")
@@ -1,14 +1,16 @@
+import json
 import os
 import subprocess
+import threading
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 import logging
-from moviepy import VideoFileClip
-import librosa
-import soundfile as sf
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+PIPE_READ_SIZE = 1024 * 1024
+
 class AudioExtractor:
     """Extract audio from video files using FFmpeg and MoviePy."""
 
@@ -58,6 +60,8 @@ class AudioExtractor:
         video_path: str
     ) -> Tuple[str, float]:
         """Extract audio using MoviePy with duration."""
+        from moviepy import VideoFileClip
+
         video = VideoFileClip(str(video_path))
         duration = video.duration
         audio_path = self.temp_dir / f"{Path(video_path).stem}.wav"
@@ -66,3 +70,112 @@ class AudioExtractor:
         video.close()
 
         return str(audio_path), duration
+
+    def probe_audio_stream(self, video_path: str) -> Dict:
+        """
+        Read the first audio stream's format with ffprobe, without decoding.
+
+        Returns:
+            Dict with codec_name, sample_rate, channels and duration
+        """
+        cmd = [
+            "ffprobe", "-v", "error",
+            "-select_streams", "a:0",
+            "-show_entries", "stream=codec_name,sample_rate,channels:format=duration",
+            "-of", "json",
+            str(video_path)
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, check=True)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"FFprobe failed: {e.stderr}")
+            raise
+
+        info = json.loads(result.stdout)
+        if not info.get("streams"):
+            raise ValueError(f"No audio stream in {video_path}")
+        stream = info["streams"][0]
+        return {
+            "codec_name": stream.get("codec_name"),
+            "sample_rate": int(stream.get("sample_rate", 0)),
+            "channels": int(stream.get("channels", 0)),
+            "duration": float(info.get("format", {}).get("duration", 0.0)),
+        }
+
+    def probe_duration(self, video_path: str) -> float:
+        """Container duration in seconds, read with ffprobe."""
+        return self.probe_audio_stream(video_path)["duration"]
+
+    def extract_audio_pcm(
+        self,
+        video_path: str,
+        sample_rate: int = 16000
+    ) -> Tuple[np.ndarray, float]:
+        """
+        Decode audio straight into memory as mono float32 samples.
+
+        FFmpeg writes raw PCM to a pipe that is read into a preallocated
+        buffer sized from the probed duration, so nothing touches the temp
+        directory. Tracks that are already 16-bit PCM at ``sample_rate`` mono
+        are stream-copied instead of decoded and resampled.
+
+        Returns:
+            Tuple of (samples, duration in seconds)
+        """
+        stream = self.probe_audio_stream(video_path)
+        copy = (
+            stream["codec_name"] == "pcm_s16le"
+            and stream["sample_rate"] == sample_rate
+            and stream["channels"] == 1
+        )
+        cmd = ["ffmpeg", "-nostdin", "-v", "error", "-i", str(video_path), "-vn", "-map", "0:a:0"]
+        if copy:
+            cmd += ["-c:a", "copy", "-f", "s16le", "-"]
+            dtype = np.int16
+        else:
+            cmd += ["-ac", "1", "-ar", str(sample_rate), "-f", "f32le", "-"]
+            dtype = np.float32
+
+        expected = int(stream["duration"] * sample_rate) + sample_rate
+        samples = self._read_pipe(cmd, dtype, expected)
+        if copy:
+            samples = samples.astype(np.float32) / 32768.0
+
+        duration = len(samples) / sample_rate
+        logger.info(
+            f"Audio decoded to memory ({'stream copy' if copy else 'resampled'}): "
+            f"{duration:.1f}s"
+        )
+        return samples, duration
+
+    @staticmethod
+    def _read_pipe(cmd: List[str], dtype, expected_samples: int) -> np.ndarray:
+        """Read a subprocess's stdout into a growing NumPy buffer."""
+        itemsize = np.dtype(dtype).itemsize
+        buffer = np.empty(max(expected_samples, 1) * itemsize, dtype=np.uint8)
+        filled = 0
+
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stderr_chunks: List[bytes] = []
+        # Drain stderr alongside stdout: a corrupt input can log more than a
+        # pipe buffer of errors, and ffmpeg would block writing them
+        reader = threading.Thread(target=lambda: stderr_chunks.extend(process.stderr))
+        with process:
+            reader.start()
+            while True:
+                if filled == len(buffer):
+                    buffer = np.resize(buffer, len(buffer) * 2)
+                view = memoryview(buffer)[filled:filled + PIPE_READ_SIZE]
+                count = process.stdout.readinto(view)
+                if not count:
+                    break
+                filled += count
+            reader.join()
+        stderr = b"".join(stderr_chunks)
+
+        if process.returncode != 0:
+            logger.error(f"FFmpeg failed: {stderr}")
+            raise subprocess.CalledProcessError(process.returncode, cmd, stderr=stderr)
+
+        filled -= filled % itemsize
+        return buffer[:filled].view(dtype)
@@ -0,0 +1,141 @@
+from bisect import bisect_left
+from typing import List, Tuple
+import numpy as np
+
+# Frames per einsum call in frame_rms
+RMS_BLOCK_FRAMES = 65536
+
+
+def frame_rms(
+    audio: np.ndarray,
+    frame_length: int,
+    hop_length: int
+) -> np.ndarray:
+    """
+    Root-mean-square energy of each frame, computed without copying frames.
+
+    Sums of squares are taken in float32 over blocks of frames, so memory
+    stays flat however long the recording is.
+
+    Args:
+        audio: Mono samples
+        frame_length: Samples per frame
+        hop_length: Samples between frame starts
+
+    Returns:
+        RMS value per frame
+    """
+    audio = np.asarray(audio, dtype=np.float32)
+    if len(audio) < frame_length:
+        return np.sqrt(np.dot(audio, audio) / max(len(audio), 1), dtype=np.float32)[None]
+    frames = np.lib.stride_tricks.sliding_window_view(audio, frame_length)[::hop_length]
+    energy = np.empty(len(frames), dtype=np.float32)
+    for start in range(0, len(frames), RMS_BLOCK_FRAMES):
+        block = frames[start:start + RMS_BLOCK_FRAMES]
+        np.einsum("ij,ij->i", block, block, out=energy[start:start + RMS_BLOCK_FRAMES])
+    energy /= frame_length
+    return np.sqrt(energy, out=energy)
+
+
+def find_split_points(
+    audio: np.ndarray,
+    sample_rate: int,
+    max_chunk_seconds: float,
+    search_seconds: float = 30.0,
+    frame_ms: float = 30.0
+) -> List[int]:
+    """
+    Choose sample offsets that cut audio into chunks at quiet moments.
+
+    Each cut is placed at the lowest-energy frame in the last
+    ``search_seconds`` before the chunk would exceed ``max_chunk_seconds``,
+    so no chunk is longer than the limit and cuts avoid mid-word splits.
+
+    Returns:
+        Sorted sample offsets of the cuts (excluding 0 and len(audio))
+    """
+    max_chunk = int(max_chunk_seconds * sample_rate)
+    search = min(int(search_seconds * sample_rate), max_chunk // 2)
+    frame = max(1, int(frame_ms * sample_rate / 1000))
+
+    splits = []
+    start = 0
+    while len(audio) - start > max_chunk:
+        window_start = start + max_chunk - search
+        window = audio[window_start:start + max_chunk]
+        energy = frame_rms(window, frame, frame)
+        cut = window_start + int(np.argmin(energy)) * frame + frame // 2
+        splits.append(cut)
+        start = cut
+    return splits
+
+
+def find_pauses(
+    audio: np.ndarray,
+    sample_rate: int,
+    min_pause_seconds: float = 1.0,
+    frame_ms: float = 30.0,
+    threshold_db: float = -35.0
+) -> List[Tuple[float, float]]:
+    """
+    Locate long pauses from frame RMS energy in one vectorized pass.
+
+    A frame is quiet when its energy is more than ``threshold_db`` below
+    the 95th-percentile frame, so the threshold follows recording level.
+
+    Returns:
+        (start, end) times in seconds of quiet runs at least
+        ``min_pause_seconds`` long
+    """
+    frame = max(1, int(frame_ms * sample_rate / 1000))
+    if len(audio) == 0:
+        return []
+    energy = frame_rms(audio, frame, frame)
+    reference = np.percentile(energy, 95)
+    if reference <= 0:
+        return [(0.0, len(audio) / sample_rate)]
+    quiet = energy < reference * 10 ** (threshold_db / 20)
+
+    # Run starts/ends are where the padded quiet mask flips
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], quiet.astype(np.int8), [0]])))
+    starts, ends = edges[::2], edges[1::2]
+    long_enough = (ends - starts) * frame >= min_pause_seconds * sample_rate
+    seconds_per_frame = frame / sample_rate
+    return [
+        (float(start * seconds_per_frame), float(min(end * frame, len(audio)) / sample_rate))
+        for start, end in zip(starts[long_enough], ends[long_enough])
+    ]
+
+
+def select_cut_points(
+    candidates: List[Tuple[float, float]],
+    duration: float,
+    min_gap: float,
+    max_cuts: int
+) -> List[float]:
+    """
+    Pick the strongest cut times that keep every chapter ``min_gap`` long.
+
+    Args:
+        candidates: (time, weight) pairs, e.g. pause midpoints weighted by
+            pause length
+        duration: Length of the recording in seconds
+        min_gap: Minimum chapter length in seconds
+        max_cuts: Maximum number of cuts
+
+    Returns:
+        Sorted cut times
+    """
+    chosen: List[float] = []
+    for time, _ in sorted(candidates, key=lambda c: -c[1]):
+        if len(chosen) >= max_cuts:
+            break
+        if time < min_gap or duration - time < min_gap:
+            continue
+        index = bisect_left(chosen, time)
+        if index > 0 and time - chosen[index - 1] < min_gap:
+            continue
+        if index < len(chosen) and chosen[index] - time < min_gap:
+            continue
+        chosen.insert(index, time)
+    return chosen
@@ -1,7 +1,7 @@
 from typing import List, Dict
 from dataclasses import dataclass
 import logging
-from src.transcription.whisper_asr import TranscriptSegment
+from src.transcription.models import TranscriptSegment, segment_texts
 
 logger = logging.getLogger(__name__)
 
@@ -53,9 +53,7 @@ class ChapterGenerator:
             end_seg = segments[end_idx]
 
             # Extract chapter text
-            chapter_text = ". ".join([
-                seg.text for seg in segments[boundary_idx:end_idx + 1]
-            ])
+            chapter_text = ". ".join(segment_texts(segments[boundary_idx:end_idx + 1]))
 
             # Generate title
             if topics and i < len(topics):
@@ -77,6 +75,31 @@ class ChapterGenerator:
         logger.info(f"Generated {len(chapters)} chapters")
         return chapters
 
+    def generate_chapters_from_cuts(
+        self,
+        cut_times: List[float],
+        duration: float
+    ) -> List[Chapter]:
+        """
+        Create untitled outline chapters from cut times in seconds.
+
+        Used before (or without) a transcript, so chapters are numbered
+        parts with no description.
+        """
+        bounds = [0.0] + list(cut_times) + [duration]
+        chapters = [
+            Chapter(
+                number=i + 1,
+                title=f"Part {i + 1}",
+                start_time=start,
+                end_time=end,
+                duration=end - start
+            )
+            for i, (start, end) in enumerate(zip(bounds[:-1], bounds[1:]))
+        ]
+        logger.info(f"Generated {len(chapters)} outline chapters")
+        return chapters
+
     def _create_title_from_topic(self, topic: str) -> str:
         """Create human-friendly title from topic keywords."""
         words = topic.split()
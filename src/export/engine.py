@@ -0,0 +1,276 @@
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+import json
+import logging
+import os
+import time
+import numpy as np
+from ..chapter_generation.generator import Chapter
+from ..pipeline.metrics import StageSample, pipeline_metrics, record_stage
+from ..transcription.models import TranscriptStore, segment_texts, segment_times
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FILENAMES = {
+    "youtube": "chapters_youtube.txt",
+    "json": "chapters.json",
+    "edl": "chapters.edl",
+    "srt": "subtitles.srt",
+    "vtt": "subtitles.vtt",
+}
+# Formats written from the transcript rather than the chapters
+TRANSCRIPT_FORMATS = ("srt", "vtt")
+# pysrt writes the platform line separator
+SRT_EOL = os.linesep
+
+
+def _timedelta_seconds(seconds: np.ndarray) -> np.ndarray:
+    """
+    ``timedelta(seconds=s).total_seconds()``.
+
+    timedelta rounds only the fractional second to microseconds (half to
+    even), so whole seconds and the fraction are converted separately.
+    """
+    fraction, whole = np.modf(seconds)
+    return (whole * 1e6 + np.rint(fraction * 1e6)) / 1e6
+
+
+def _millis(seconds: np.ndarray) -> np.ndarray:
+    """``int((s - int(s)) * 1000)``, as TimestampFormatter computes milliseconds."""
+    return np.trunc((seconds - np.trunc(seconds)) * 1000).astype(np.int64)
+
+
+def format_youtube_times(seconds: np.ndarray) -> List[str]:
+    """Batch ``TimestampFormatter.seconds_to_youtube``."""
+    total = np.trunc(_timedelta_seconds(np.asarray(seconds, dtype=np.float64))).astype(np.int64)
+    hours = (total // 3600).tolist()
+    minutes = (total % 3600 // 60).tolist()
+    secs = (total % 60).tolist()
+    return [
+        f"{h}:{m:02d}:{s:02d}" if h > 0 else f"{m}:{s:02d}"
+        for h, m, s in zip(hours, minutes, secs)
+    ]
+
+
+def format_vtt_times(seconds: np.ndarray) -> List[str]:
+    """Batch ``TimestampFormatter.seconds_to_vtt``."""
+    seconds = np.asarray(seconds, dtype=np.float64)
+    total = _timedelta_seconds(seconds)
+    hours = (total // 3600).astype(np.int64).tolist()
+    minutes = (total % 3600 // 60).astype(np.int64).tolist()
+    secs = (total % 60).astype(np.int64).tolist()
+    millis = _millis(seconds).tolist()
+    return [
+        f"{h:02d}:{m:02d}:{s:02d}.{ms:03d}"
+        for h, m, s, ms in zip(hours, minutes, secs, millis)
+    ]
+
+
+def format_srt_times(seconds: np.ndarray) -> List[str]:
+    """Batch ``str(pysrt.SubRipTime(seconds=s))``: truncated float milliseconds."""
+    ordinal = np.maximum(np.asarray(seconds, dtype=np.float64) * 1000, 0)
+    hours = (ordinal // 3600000).astype(np.int64).tolist()
+    minutes = (ordinal % 3600000 // 60000).astype(np.int64).tolist()
+    secs = (ordinal % 60000 // 1000).astype(np.int64).tolist()
+    millis = (ordinal % 1000 // 1).astype(np.int64).tolist()
+    return [
+        f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+        for h, m, s, ms in zip(hours, minutes, secs, millis)
+    ]
+
+
+def format_timecodes(seconds: np.ndarray, fps: int = 30) -> List[str]:
+    """Batch ``TimestampFormatter.seconds_to_timecode``."""
+    seconds = np.asarray(seconds, dtype=np.float64)
+    hours = (seconds // 3600).astype(np.int64).tolist()
+    minutes = (seconds % 3600 // 60).astype(np.int64).tolist()
+    secs = (seconds % 60).astype(np.int64).tolist()
+    frames = np.trunc((seconds - np.trunc(seconds)) * fps).astype(np.int64).tolist()
+    return [
+        f"{h:02d}:{m:02d}:{s:02d}:{f:02d}"
+        for h, m, s, f in zip(hours, minutes, secs, frames)
+    ]
+
+
+class ExportEngine:
+    """
+    Write every requested export format in one pass over the data.
+
+    Chapters are walked once for YouTube, JSON and EDL, and segments once,
+    in batches, for SRT and VTT. Timestamps are formatted per batch with
+    array arithmetic, and every file is written through its own buffered
+    writer as the walk goes, so no format is built in memory first. Output
+    is byte-identical to ``YouTubeExporter``, ``JSONExporter``,
+    ``EDLExporter`` and ``SubtitleGenerator``.
+    """
+
+    def __init__(self, batch_size: int = 4096, buffer_size: int = 1024 * 1024, fps: int = 30):
+        self.batch_size = batch_size
+        self.buffer_size = buffer_size
+        self.fps = fps
+
+    def export(
+        self,
+        chapters: List[Chapter],
+        segments: Sequence,
+        output_dir: Path,
+        export_formats: Sequence[str],
+        video_metadata: Dict,
+        timings: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, str]:
+        """
+        Write the requested formats into ``output_dir``.
+
+        Records an ``export_<format>`` stage sample per format, into
+        ``timings`` and the pipeline metrics. Formats written in the same
+        pass share its time equally.
+
+        Returns:
+            Format name to output file path
+        """
+        unknown = [f for f in export_formats if f not in EXPORT_FILENAMES]
+        if unknown:
+            raise ValueError(f"Unknown export formats: {unknown}")
+
+        outputs = {
+            name: str(Path(output_dir) / filename)
+            for name, filename in EXPORT_FILENAMES.items() if name in export_formats
+        }
+        with ExitStack() as stack:
+            writers = {
+                name: stack.enter_context(open(
+                    path, "w", encoding="utf-8", buffering=self.buffer_size,
+                    # pysrt writes SRT_EOL itself, untranslated
+                    newline="" if name == "srt" else None
+                ))
+                for name, path in outputs.items()
+            }
+            duration = video_metadata.get("duration")
+            chapter_formats = [name for name in writers if name not in TRANSCRIPT_FORMATS]
+            with self._measure(chapter_formats, writers, len(chapters), duration, timings):
+                self._write_chapters(chapters, video_metadata, writers)
+            transcript_formats = [name for name in writers if name in TRANSCRIPT_FORMATS]
+            if transcript_formats:
+                with self._measure(transcript_formats, writers, len(segments), duration, timings):
+                    self._write_segments(segments, writers.get("srt"), writers.get("vtt"))
+
+        logger.info(f"Exported {', '.join(outputs)} in one pass")
+        return outputs
+
+    @staticmethod
+    @contextmanager
+    def _measure(
+        names: List[str],
+        writers: Dict,
+        items: int,
+        audio_seconds: Optional[float],
+        timings: Optional[Dict[str, Dict]]
+    ) -> Iterator[None]:
+        """Time one pass, including flushing its files, as a sample per format."""
+        if not names:
+            yield
+            return
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        try:
+            yield
+            for name in names:
+                writers[name].flush()
+        except BaseException:
+            for name in names:
+                pipeline_metrics.observe_failure(f"export_{name}")
+            raise
+        wall_seconds = (time.perf_counter() - wall_started) / len(names)
+        cpu_seconds = (time.process_time() - cpu_started) / len(names)
+        for name in names:
+            record_stage(f"export_{name}", StageSample(
+                wall_seconds=wall_seconds,
+                cpu_seconds=cpu_seconds,
+                items=items,
+                audio_seconds=audio_seconds
+            ), timings)
+
+    def _write_chapters(self, chapters: List[Chapter], video_metadata: Dict, writers: Dict):
+        youtube = writers.get("youtube")
+        json_file = writers.get("json")
+        edl = writers.get("edl")
+
+        starts = np.array([ch.start_time for ch in chapters], dtype=np.float64)
+        ends = np.array([ch.end_time for ch in chapters], dtype=np.float64)
+        if youtube is not None or json_file is not None:
+            youtube_starts = format_youtube_times(starts)
+            youtube_ends = format_youtube_times(ends) if json_file is not None else None
+        if edl is not None:
+            start_codes = format_timecodes(starts, self.fps)
+            end_codes = format_timecodes(ends, self.fps)
+            edl.write("TITLE: Video Chapters\nFCM: NON-DROP FRAME\n")
+        if json_file is not None:
+            json_file.write('{\n  "video": ')
+            json_file.write(_indent(json.dumps(video_metadata, indent=2, ensure_ascii=False), 2))
+            json_file.write(',\n  "chapters": [')
+
+        for i, chapter in enumerate(chapters):
+            if youtube is not None:
+                if i:
+                    youtube.write("\n")
+                youtube.write(f"{youtube_starts[i]} {chapter.title}")
+            if json_file is not None:
+                entry = {
+                    "chapter_number": chapter.number,
+                    "title": chapter.title,
+                    "start_seconds": chapter.start_time,
+                    "end_seconds": chapter.end_time,
+                    "duration_seconds": chapter.duration,
+                    "start_timestamp": youtube_starts[i],
+                    "end_timestamp": youtube_ends[i],
+                    "description": chapter.description
+                }
+                json_file.write(",\n    " if i else "\n    ")
+                json_file.write(_indent(json.dumps(entry, indent=2, ensure_ascii=False), 4))
+            if edl is not None:
+                edl.write(
+                    f"\n{i + 1:03d}  BL       V     C        {start_codes[i]} {end_codes[i]} "
+                    f"{start_codes[i]} {end_codes[i]}\n"
+                    f"* FROM CLIP NAME: {chapter.title}\n"
+                )
+
+        if json_file is not None:
+            json_file.write("\n  ]" if chapters else "]")
+            json_file.write(f',\n  "total_chapters": {len(chapters)}')
+            total_duration = json.dumps(chapters[-1].end_time if chapters else 0)
+            json_file.write(f',\n  "total_duration": {total_duration}\n}}')
+
+    def _write_segments(self, segments: Sequence, srt: Optional, vtt: Optional):
+        if vtt is not None:
+            vtt.write("WEBVTT\n")
+        starts, ends = segment_times(segments)
+        for first in range(0, len(segments), self.batch_size):
+            last = min(first + self.batch_size, len(segments))
+            batch = segments[first:last]
+            texts = segment_texts(batch)
+            if srt is not None:
+                if isinstance(batch, TranscriptStore):
+                    ids = batch.ids.tolist()
+                else:
+                    ids = [seg.id for seg in batch]
+                srt_starts = format_srt_times(starts[first:last])
+                srt_ends = format_srt_times(ends[first:last])
+                for index, begin, end, text in zip(ids, srt_starts, srt_ends, texts):
+                    item = f"{index + 1}\n{begin} --> {end}\n{text}\n"
+                    if SRT_EOL != "\n":
+                        item = item.replace("\n", SRT_EOL)
+                    # pysrt adds the blank line unless the item already ends with one
+                    if not item.endswith(2 * SRT_EOL):
+                        item += SRT_EOL
+                    srt.write(item)
+            if vtt is not None:
+                vtt_starts = format_vtt_times(starts[first:last])
+                vtt_ends = format_vtt_times(ends[first:last])
+                for begin, end, text in zip(vtt_starts, vtt_ends, texts):
+                    vtt.write(f"\n{begin} --> {end}\n{text}\n")
+
+
+def _indent(text: str, spaces: int) -> str:
+    """Indent every line after the first, as ``json.dump`` does for nested values."""
+    return text.replace("\n", "\n" + " " * spaces)
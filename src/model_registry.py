@@ -0,0 +1,155 @@
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+import threading
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+ModelKey = Tuple[str, str, str, str]
+
+# Written by ``SentenceTransformer.save(..., safe_serialization=True)``
+SAFETENSORS_FILENAME = "model.safetensors"
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models.
+
+    Each model is loaded on first use and shared by every caller asking for
+    the same (kind, name, device, compute_type), so pipeline threads never
+    hold duplicate copies of Whisper or the sentence encoder. Models found
+    under ``MODELS_DIR`` are loaded from disk without touching the network;
+    sentence encoders saved there as safetensors are memory-mapped rather
+    than unpickled into a private copy.
+    """
+
+    def __init__(self, models_dir: Optional[str] = None):
+        self._models_dir = Path(models_dir) if models_dir else None
+        self._models: Dict[ModelKey, Any] = {}
+        self._key_locks: Dict[ModelKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def models_dir(self) -> Path:
+        return self._models_dir or settings.MODELS_DIR
+
+    def get_whisper(
+        self,
+        model_size: str,
+        device: str = "cpu",
+        compute_type: str = "int8",
+        cpu_threads: int = 0
+    ):
+        """Return a shared faster-whisper ``WhisperModel``."""
+        def load():
+            from faster_whisper import WhisperModel
+            source = self.local_path(f"faster-whisper-{model_size}") or model_size
+            logger.info(f"Loading Whisper {model_size} model from {source}...")
+            return WhisperModel(
+                source,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads
+            )
+
+        return self._get(("whisper", model_size, device, f"{compute_type}/{cpu_threads}"), load)
+
+    def get_sentence_encoder(self, model_name: str, device: str = "cpu"):
+        """Return a shared ``SentenceTransformer``."""
+        def load():
+            from sentence_transformers import SentenceTransformer
+            source = self.local_path(model_name)
+            options = self._sentence_encoder_options(source)
+            source = source or model_name
+            logger.info(f"Loading embedding model from {source}...")
+            return SentenceTransformer(source, device=device, **options)
+
+        return self._get(("sentence-transformer", model_name, device, "float32"), load)
+
+    def get_onnx_encoder(self, model_name: str, quantized: bool = True):
+        """Return a shared ``OnnxSentenceEncoder`` exported under ``MODELS_DIR``."""
+        def load():
+            from src.segmentation.encoders import OnnxSentenceEncoder, onnx_model_dirname
+            source = self.local_path(onnx_model_dirname(model_name))
+            if source is None:
+                raise FileNotFoundError(
+                    f"No ONNX export of {model_name} in {self.models_dir}; "
+                    f"run scripts/export_onnx_encoder.py first"
+                )
+            logger.info(f"Loading ONNX embedding model from {source}...")
+            return OnnxSentenceEncoder(source, quantized=quantized)
+
+        compute_type = "int8" if quantized else "float32"
+        return self._get(("onnx-encoder", model_name, "cpu", compute_type), load)
+
+    def get_encoder(self, model_name: str, backend: str, device: str = "cpu"):
+        """
+        Return the shared sentence encoder for an ``EMBEDDING_BACKEND``.
+
+        ``torch`` runs the sentence-transformers model; ``onnx`` and
+        ``onnx-int8`` run its ONNX export through ONNX Runtime on CPU.
+        """
+        if backend == "torch":
+            return self.get_sentence_encoder(model_name, device)
+        if backend in ("onnx", "onnx-int8"):
+            return self.get_onnx_encoder(model_name, quantized=backend == "onnx-int8")
+        raise ValueError(f"Unknown encoder backend: {backend}")
+
+    def local_path(self, name: str) -> Optional[str]:
+        """Path of a model stored under ``MODELS_DIR``, if present."""
+        path = self.models_dir / name
+        return str(path) if path.is_dir() else None
+
+    @staticmethod
+    def _sentence_encoder_options(source: Optional[str]) -> Dict[str, Any]:
+        """Load local safetensors weights through their memory-mapped reader."""
+        if source is not None and (Path(source) / SAFETENSORS_FILENAME).is_file():
+            return {"model_kwargs": {"use_safetensors": True}}
+        return {}
+
+    def preload(
+        self,
+        whisper_model: Optional[str] = None,
+        embedding_model: Optional[str] = None,
+        embedding_backend: Optional[str] = None
+    ):
+        """
+        Load models ahead of the first request.
+
+        The encoder is loaded through ``embedding_backend`` (default:
+        ``settings.EMBEDDING_BACKEND``), so ONNX deployments never import torch.
+        """
+        if whisper_model:
+            self.get_whisper(whisper_model)
+        if embedding_model:
+            self.get_encoder(embedding_model, embedding_backend or settings.EMBEDDING_BACKEND)
+
+    def loaded(self) -> List[ModelKey]:
+        with self._lock:
+            return list(self._models)
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+            self._key_locks.clear()
+
+    def _get(self, key: ModelKey, loader: Callable[[], Any]) -> Any:
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        # One lock per key: concurrent first requests load the model once,
+        # while loads of different models do not wait on each other
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            model = self._models.get(key)
+            if model is None:
+                model = loader()
+                with self._lock:
+                    self._models[key] = model
+            return model
+
+
+model_registry = ModelRegistry()
@@ -0,0 +1,193 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import json
+import logging
+import os
+import shutil
+import numpy as np
+from src.transcription.models import TranscriptStore
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.json"
+# Each stage is built on the previous one; recording one drops those after it
+STAGES = ("audio", "transcript", "embeddings")
+
+# (start, end) times in seconds
+Spans = List[Tuple[float, float]]
+
+
+class StageArtifacts:
+    """
+    Checkpoint stage outputs under a job directory so reruns can resume.
+
+    Files are written to a temporary name and renamed into place, and each
+    one is recorded in ``manifest.json`` only after it is complete, so a
+    crash mid-write never leaves an artifact that looks valid.
+
+    Layout:
+        audio.<ext>         extracted audio file, or
+        audio.npy           in-memory samples stored as int16
+        transcript.npz      TranscriptStore columns
+        embeddings.npy      segment embedding matrix
+        cues.json           scene cuts and pauses the boundaries were fused
+                            with, rewritten by every run
+        manifest.json       file sizes and stage metadata
+    """
+
+    def __init__(self, artifact_dir: str):
+        self.artifact_dir = Path(artifact_dir)
+
+    # Audio
+
+    def save_audio(self, audio_path: str, duration: float) -> str:
+        """Move extracted audio into the job directory and record it."""
+        target = self.artifact_dir / f"audio{Path(audio_path).suffix}"
+        self.artifact_dir.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(audio_path), str(target))
+        self._record("audio", target, {"duration": duration})
+        return str(target)
+
+    def save_audio_samples(self, samples: np.ndarray, duration: float):
+        """Store decoded float samples as int16, half the size of float32."""
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+        path = self._write("audio.npy", lambda f: np.save(f, pcm))
+        self._record("audio", path, {"duration": duration})
+
+    def load_audio(self) -> Optional[Tuple[Union[str, np.ndarray], float]]:
+        """Audio file path, or float32 samples if audio was kept in memory."""
+        entry = self._valid_entry("audio")
+        if entry is None:
+            return None
+        path = self.artifact_dir / entry["file"]
+        if path.suffix == ".npy":
+            return np.load(path).astype(np.float32) / 32768.0, entry["duration"]
+        return str(path), entry["duration"]
+
+    # Transcript
+
+    def save_transcript(self, segments: Sequence, metadata: Dict, duration: float):
+        """Store segments (a list or ``TranscriptStore``) in the store's columnar layout."""
+        store = TranscriptStore.from_segments(segments)
+        offsets = store.text_offsets
+        columns = {
+            "id": store.ids,
+            "start": store.start,
+            "end": store.end,
+            "confidence": store.confidence,
+            # A sliced store points into its parent's buffer
+            "text_offsets": offsets - offsets[0],
+            "text_data": store.text_data[offsets[0]:offsets[-1]],
+        }
+        path = self._write(
+            "transcript.npz",
+            lambda f: np.savez(f, **columns)
+        )
+        self._record("transcript", path, {
+            "metadata": metadata,
+            "duration": duration,
+            "count": len(segments)
+        })
+
+    def load_transcript(self) -> Optional[Tuple[TranscriptStore, Dict, float]]:
+        entry = self._valid_entry("transcript")
+        if entry is None:
+            return None
+
+        with np.load(self.artifact_dir / entry["file"]) as data:
+            store = TranscriptStore(
+                ids=data["id"],
+                start=data["start"],
+                end=data["end"],
+                confidence=data["confidence"],
+                text_offsets=data["text_offsets"],
+                text_data=data["text_data"],
+            )
+        return store, entry["metadata"], entry["duration"]
+
+    # Embeddings
+
+    def save_embeddings(self, embeddings: np.ndarray):
+        path = self._write(
+            "embeddings.npy",
+            lambda f: np.save(f, np.asarray(embeddings))
+        )
+        self._record("embeddings", path, {"rows": len(embeddings)})
+
+    def load_embeddings(self, expected_rows: int) -> Optional[np.ndarray]:
+        entry = self._valid_entry("embeddings")
+        if entry is None or entry["rows"] != expected_rows or expected_rows == 0:
+            return None
+        return np.load(self.artifact_dir / entry["file"])
+
+    # Boundary cues
+
+    def save_cues(self, scenes: Optional[Spans], pauses: Optional[Spans]):
+        """Store the scene cuts and pauses (None if unused) for re-chaptering."""
+        cues = {
+            "scenes": None if scenes is None else [[float(a), float(b)] for a, b in scenes],
+            "pauses": None if pauses is None else [[float(a), float(b)] for a, b in pauses],
+        }
+        path = self._write("cues.json", lambda f: f.write(json.dumps(cues).encode("utf-8")))
+        self._record("cues", path, {})
+
+    def load_cues(self) -> Tuple[Optional[Spans], Optional[Spans]]:
+        """(scenes, pauses) stored by the last run; (None, None) if there are none."""
+        entry = self._valid_entry("cues")
+        if entry is None:
+            return None, None
+        with open(self.artifact_dir / entry["file"], encoding="utf-8") as f:
+            cues = json.load(f)
+        return tuple(
+            None if cues[name] is None else [tuple(pair) for pair in cues[name]]
+            for name in ("scenes", "pauses")
+        )
+
+    # Manifest helpers
+
+    def entry(self, stage: str) -> Optional[Dict]:
+        """Manifest entry of the stage's artifact, if it is valid."""
+        return self._valid_entry(stage)
+
+    def _write(self, filename: str, writer) -> Path:
+        self.artifact_dir.mkdir(parents=True, exist_ok=True)
+        target = self.artifact_dir / filename
+        tmp_path = self.artifact_dir / f".{filename}.tmp"
+        with open(tmp_path, "wb") as f:
+            writer(f)
+        os.replace(tmp_path, target)
+        return target
+
+    def _read_manifest(self) -> Dict:
+        path = self.artifact_dir / MANIFEST_FILENAME
+        if not path.exists():
+            return {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable artifact manifest {path}: {e}")
+            return {}
+
+    def _record(self, stage: str, path: Path, fields: Dict):
+        """Record a finished artifact; later stages built on older inputs are dropped."""
+        manifest = self._read_manifest()
+        if stage in STAGES:
+            for later in STAGES[STAGES.index(stage) + 1:]:
+                manifest.pop(later, None)
+        manifest[stage] = {"file": path.name, "size": path.stat().st_size, **fields}
+        self._write(
+            MANIFEST_FILENAME,
+            lambda f: f.write(json.dumps(manifest).encode("utf-8"))
+        )
+
+    def _valid_entry(self, stage: str) -> Optional[Dict]:
+        """Return the manifest entry if its file exists with the recorded size."""
+        entry = self._read_manifest().get(stage)
+        if entry is None:
+            return None
+        path = self.artifact_dir / entry["file"]
+        if not path.exists() or path.stat().st_size != entry["size"]:
+            logger.warning(f"Discarding invalid {stage} artifact: {path}")
+            return None
+        return entry
@@ -0,0 +1,307 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Set
+import glob
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import re
+import time
+from config import settings
+from src.audio_extraction.extractor import AudioExtractor
+from src.chapter_generation.generator import ChapterGenerator
+from src.export.engine import ExportEngine
+from src.export.json_exporter import JSONExporter
+from src.export.subtitle_generator import SubtitleGenerator
+from src.export.youtube_format import YouTubeExporter
+from src.pipeline.runner import ChapterPipeline
+from src.scene_detection.visual_detector import VisualSceneDetector
+from src.segmentation.nlp_segmenter import NLPSegmenter
+from src.transcription.whisper_asr import WhisperTranscriber
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".mov", ".avi", ".webm", ".m4v", ".flv", ".wmv")
+# Input lists: one path per line, or JSON objects with a "path" key
+LIST_SUFFIXES = (".txt", ".jsonl")
+
+
+def build_pipeline(
+    output_root: Optional[str] = None,
+    scene_detection: Optional[bool] = None
+) -> ChapterPipeline:
+    """
+    A pipeline of the real components, configured from ``settings``.
+
+    With ``TRANSCRIPTION_WORKERS`` above 1, Whisper transcribes chunks of
+    up to ``TRANSCRIPTION_CHUNK_SECONDS`` in that many processes instead of
+    streaming. Batch runs already get their parallelism from one pipeline
+    per worker, so they are best left at 1.
+
+    Args:
+        scene_detection: Build the visual scene detector (default:
+            ``settings.ENABLE_SCENE_DETECTION``)
+    """
+    if scene_detection is None:
+        scene_detection = settings.ENABLE_SCENE_DETECTION
+    return ChapterPipeline(
+        audio_extractor=AudioExtractor(temp_dir=str(settings.TEMP_DIR)),
+        transcriber=WhisperTranscriber(
+            model_size=settings.WHISPER_MODEL,
+            num_workers=settings.TRANSCRIPTION_WORKERS,
+            max_chunk_seconds=settings.TRANSCRIPTION_CHUNK_SECONDS
+        ),
+        segmenter=NLPSegmenter(
+            embedding_model=settings.EMBEDDING_MODEL,
+            encoder_backend=settings.EMBEDDING_BACKEND
+        ),
+        chapter_generator=ChapterGenerator(),
+        youtube_exporter=YouTubeExporter(),
+        json_exporter=JSONExporter(),
+        subtitle_generator=SubtitleGenerator(),
+        scene_detector=VisualSceneDetector(
+            engine=settings.SCENE_DETECTION_ENGINE,
+            keyframes_only=settings.SCENE_DETECTION_KEYFRAMES_ONLY,
+            num_workers=settings.SCENE_DETECTION_WORKERS
+        ) if scene_detection else None,
+        output_root=output_root,
+        # Chunked parallel transcription returns all segments at once
+        streaming=settings.STREAMING_TRANSCRIPTION and settings.TRANSCRIPTION_WORKERS <= 1,
+        embedding_batch_size=settings.EMBEDDING_BATCH_SIZE,
+        segmentation_method=settings.SEGMENTATION_METHOD,
+        audio_mode=settings.AUDIO_EXTRACTION_MODE,
+        export_engine=ExportEngine()
+    )
+
+
+def discover_videos(sources: Sequence[str]) -> List[Path]:
+    """
+    Expand directories, glob patterns and input lists into video paths.
+
+    Directories are searched recursively for ``VIDEO_EXTENSIONS``; ``.txt``
+    and ``.jsonl`` files list videos (relative paths are resolved against
+    the list's directory); anything else must be a video file. Duplicates
+    are dropped, keeping the first occurrence.
+
+    Raises:
+        FileNotFoundError: If a source matches nothing
+    """
+    videos: List[Path] = []
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            found = sorted(
+                p for p in path.rglob("*")
+                if p.is_file() and p.suffix.lower() in VIDEO_EXTENSIONS
+            )
+        elif glob.has_magic(source):
+            found = sorted(Path(p) for p in glob.glob(source, recursive=True) if Path(p).is_file())
+        elif path.is_file() and path.suffix.lower() in LIST_SUFFIXES:
+            found = _read_video_list(path)
+        elif path.is_file():
+            found = [path]
+        else:
+            raise FileNotFoundError(f"No such video, directory or list: {source}")
+        if not found:
+            logger.warning(f"No videos found in {source}")
+        videos.extend(found)
+
+    unique: Dict[Path, Path] = {}
+    for video in videos:
+        unique.setdefault(video.resolve(), video.resolve())
+    return list(unique.values())
+
+
+def _read_video_list(path: Path) -> List[Path]:
+    videos = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        entry = json.loads(line)["path"] if path.suffix.lower() == ".jsonl" else line
+        video = Path(entry)
+        videos.append(video if video.is_absolute() else path.parent / video)
+    return videos
+
+
+def job_id_for(video: Path) -> str:
+    """
+    Stable job id for a video path.
+
+    Reruns reuse the same output directory, so an interrupted video also
+    resumes from its stage checkpoints.
+    """
+    digest = hashlib.sha1(str(Path(video).resolve()).encode("utf-8")).hexdigest()[:10]
+    stem = re.sub(r"[^A-Za-z0-9_.-]+", "_", Path(video).stem)[:40]
+    return f"{stem}-{digest}"
+
+
+class BatchJournal:
+    """
+    Append-only JSONL record of finished batch jobs.
+
+    Each line is flushed and fsynced as its job finishes, so a crash loses
+    at most the line being written; a truncated last line is ignored on
+    load. The latest record for a video wins, so failed videos are retried
+    and videos recorded as done are skipped on restart.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def load(self) -> Dict[str, Dict]:
+        """Latest record per video path."""
+        records: Dict[str, Dict] = {}
+        if not self.path.exists():
+            return records
+        with open(self.path, encoding="utf-8") as f:
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Ignoring unreadable line {number} of {self.path}")
+                    continue
+                records[record["video"]] = record
+        return records
+
+    def completed(self) -> Set[str]:
+        return {video for video, record in self.load().items() if record["status"] == "done"}
+
+    def append(self, record: Dict):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+@dataclass
+class BatchReport:
+    """Totals of one batch run (videos skipped as already done excluded)."""
+    videos: int = 0
+    skipped: int = 0
+    done: int = 0
+    failed: int = 0
+    audio_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    @property
+    def videos_per_hour(self) -> float:
+        return self.done * 3600 / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def audio_hours_per_hour(self) -> float:
+        """Hours of audio chaptered per wall-clock hour."""
+        return self.audio_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            **asdict(self),
+            "videos_per_hour": self.videos_per_hour,
+            "audio_hours_per_hour": self.audio_hours_per_hour,
+        }
+
+
+# Batch worker process state: one pipeline per worker, built by the initializer
+_worker_pipeline: Optional[ChapterPipeline] = None
+
+
+def _init_batch_worker(pipeline_factory: Callable[[], ChapterPipeline], preload: bool):
+    global _worker_pipeline
+    _worker_pipeline = pipeline_factory()
+    if preload:
+        # Load Whisper and the sentence encoder now rather than on the first video
+        _worker_pipeline.transcriber.get_model()
+        _worker_pipeline.segmenter.encoder
+
+
+def _process_video(video: str, job_id: str, run_options: Dict) -> Dict:
+    """Run one video on this worker's pipeline and describe the outcome."""
+    started = time.perf_counter()
+    record = {"video": video, "job_id": job_id, "worker_pid": os.getpid()}
+    try:
+        result = _worker_pipeline.run(job_id, video, Path(video).name, **run_options)
+    except Exception as e:
+        logger.exception(f"Batch job {job_id} failed")
+        record.update(status="failed", error=str(e))
+    else:
+        record.update(
+            status="done",
+            duration=result["duration"],
+            chapters=result["chapters_count"],
+            outputs=result["outputs"],
+        )
+    record["processing_seconds"] = time.perf_counter() - started
+    return record
+
+
+def run_batch(
+    videos: Sequence[Path],
+    journal: BatchJournal,
+    workers: int = 1,
+    run_options: Optional[Dict] = None,
+    pipeline_factory: Callable[[], ChapterPipeline] = build_pipeline,
+    preload: bool = True,
+    on_record: Optional[Callable[[Dict], None]] = None
+) -> BatchReport:
+    """
+    Chapter every video not yet recorded as done in ``journal``.
+
+    Each of ``workers`` spawned processes builds one pipeline with
+    ``pipeline_factory`` (which must be picklable) and keeps its models
+    loaded for every video it is given; ``workers=0`` runs in this
+    process. The largest files are scheduled first so a long video does
+    not start last and hold up the end of the batch.
+
+    Args:
+        run_options: Keyword arguments for ``ChapterPipeline.run``
+        preload: Load each worker's Whisper and encoder models when it
+            starts instead of on its first video
+        on_record: Called with each journal record as its job finishes
+
+    Returns:
+        Counts and throughput of this run
+    """
+    run_options = run_options or {}
+    completed = journal.completed()
+    videos = [Path(v).resolve() for v in videos]
+    pending = [v for v in videos if str(v) not in completed]
+    pending.sort(key=lambda p: p.stat().st_size if p.exists() else 0, reverse=True)
+    report = BatchReport(videos=len(videos), skipped=len(videos) - len(pending))
+    logger.info(f"Batch: {len(pending)} videos to process, {report.skipped} already done")
+
+    def finish(record: Dict):
+        journal.append(record)
+        if record["status"] == "done":
+            report.done += 1
+            report.audio_seconds += record["duration"] or 0.0
+        else:
+            report.failed += 1
+        if on_record is not None:
+            on_record(record)
+
+    started = time.perf_counter()
+    if workers <= 0:
+        _init_batch_worker(pipeline_factory, preload)
+        for video in pending:
+            finish(_process_video(str(video), job_id_for(video), run_options))
+    elif pending:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(pending)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_batch_worker,
+            initargs=(pipeline_factory, preload)
+        ) as pool:
+            futures = [
+                pool.submit(_process_video, str(video), job_id_for(video), run_options)
+                for video in pending
+            ]
+            for future in as_completed(futures):
+                finish(future.result())
+    report.wall_seconds = time.perf_counter() - started
+    return report
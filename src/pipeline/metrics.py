@@ -0,0 +1,195 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Optional, Sequence
+import logging
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SECONDS_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 1800)
+BYTES_BUCKETS = tuple(2 ** p * 1024 * 1024 for p in range(0, 13, 2))  # 1 MiB .. 4 GiB
+REALTIME_BUCKETS = (0.5, 1, 2, 5, 10, 20, 50, 100, 500, 1000)
+
+
+def _peak_rss_bytes() -> int:
+    """High-water mark of the process's resident memory (0 where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class StageSample:
+    """
+    Measurements of one stage run.
+
+    CPU time and peak RSS are process-wide, so they include helper threads
+    (and any concurrent jobs); the RSS delta is how far the stage raised
+    the process's memory high-water mark.
+    """
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_delta_bytes: int = 0
+    items: Optional[int] = None
+    audio_seconds: Optional[float] = None
+
+    @property
+    def realtime_factor(self) -> Optional[float]:
+        """Audio seconds processed per wall second."""
+        if not self.audio_seconds or self.wall_seconds <= 0:
+            return None
+        return self.audio_seconds / self.wall_seconds
+
+    def to_dict(self) -> Dict:
+        return {**asdict(self), "realtime_factor": self.realtime_factor}
+
+
+class Histogram:
+    """Cumulative-bucket histogram per stage, in Prometheus text format."""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        # stage -> (bucket counts, sum, count)
+        self._series: Dict[str, List] = {}
+
+    def observe(self, stage: str, value: float):
+        series = self._series.setdefault(stage, [[0] * len(self.buckets), 0.0, 0])
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[0][index] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for stage, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{stage="{stage}",le="+Inf"}} {count}')
+            lines.append(f'{self.name}_sum{{stage="{stage}"}} {total:.6g}')
+            lines.append(f'{self.name}_count{{stage="{stage}"}} {count}')
+        return lines
+
+
+class Counter:
+    """Monotonic counter per stage, in Prometheus text format."""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values: Dict[str, float] = {}
+
+    def inc(self, stage: str, value: float = 1):
+        self._values[stage] = self._values.get(stage, 0) + value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        lines += [
+            f'{self.name}{{stage="{stage}"}} {value:g}'
+            for stage, value in sorted(self._values.items())
+        ]
+        return lines
+
+
+class PipelineMetrics:
+    """Process-wide aggregate of stage samples, served on ``/metrics``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.wall = Histogram(
+            "chapter_stage_wall_seconds", "Wall time per pipeline stage.", SECONDS_BUCKETS
+        )
+        self.cpu = Histogram(
+            "chapter_stage_cpu_seconds", "Process CPU time per pipeline stage.", SECONDS_BUCKETS
+        )
+        self.rss = Histogram(
+            "chapter_stage_peak_rss_delta_bytes",
+            "Increase of the process peak RSS during a stage.",
+            BYTES_BUCKETS
+        )
+        self.realtime = Histogram(
+            "chapter_stage_realtime_factor",
+            "Audio seconds processed per wall second.",
+            REALTIME_BUCKETS
+        )
+        self.items = Counter("chapter_stage_items_total", "Items processed per stage.")
+        self.failures = Counter("chapter_stage_failures_total", "Stage runs that raised.")
+
+    def observe(self, stage: str, sample: StageSample):
+        with self._lock:
+            self.wall.observe(stage, sample.wall_seconds)
+            self.cpu.observe(stage, sample.cpu_seconds)
+            self.rss.observe(stage, sample.peak_rss_delta_bytes)
+            if sample.realtime_factor is not None:
+                self.realtime.observe(stage, sample.realtime_factor)
+            if sample.items is not None:
+                self.items.inc(stage, sample.items)
+
+    def observe_failure(self, stage: str):
+        with self._lock:
+            self.failures.inc(stage)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            lines = []
+            for metric in (self.wall, self.cpu, self.rss, self.realtime, self.items, self.failures):
+                lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+pipeline_metrics = PipelineMetrics()
+
+
+@contextmanager
+def measure_stage(
+    name: str,
+    timings: Optional[Dict[str, Dict]] = None,
+    audio_seconds: Optional[float] = None,
+    metrics: Optional[PipelineMetrics] = None
+) -> Iterator[StageSample]:
+    """
+    Measure a block as stage ``name``.
+
+    The block may set ``items`` (and ``audio_seconds``, if only known once
+    it finishes) on the yielded sample. The sample is added to ``metrics``
+    (default: ``pipeline_metrics``) and, as a dict, to ``timings``.
+    """
+    metrics = metrics or pipeline_metrics
+    sample = StageSample(audio_seconds=audio_seconds)
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    rss_started = _peak_rss_bytes()
+    try:
+        yield sample
+    except BaseException:
+        metrics.observe_failure(name)
+        raise
+    sample.wall_seconds = time.perf_counter() - wall_started
+    sample.cpu_seconds = time.process_time() - cpu_started
+    sample.peak_rss_delta_bytes = max(0, _peak_rss_bytes() - rss_started)
+    record_stage(name, sample, timings, metrics)
+    logger.debug(f"Stage {name}: {sample.wall_seconds:.2f}s wall, {sample.cpu_seconds:.2f}s CPU")
+
+
+def record_stage(
+    name: str,
+    sample: StageSample,
+    timings: Optional[Dict[str, Dict]] = None,
+    metrics: Optional[PipelineMetrics] = None
+):
+    """Add a sample measured elsewhere, as ``measure_stage`` does on exit."""
+    (metrics or pipeline_metrics).observe(name, sample)
+    if timings is not None:
+        timings[name] = sample.to_dict()
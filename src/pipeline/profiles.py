@@ -0,0 +1,198 @@
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+import json
+import logging
+import os
+import threading
+from config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: processes must not share the throughput file
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Stages whose cost grows with the length of the video
+TIMED_STAGES = ("extraction", "transcription", "segmentation", "topics", "chapters", "export")
+
+
+@dataclass(frozen=True)
+class ProcessingProfile:
+    """
+    Model and algorithm choices that trade accuracy for speed.
+
+    ``realtime_factor`` is the prior estimate of processing seconds per
+    second of video, used until this host has measured the profile.
+    """
+    name: str
+    whisper_model: str
+    beam_size: int
+    word_timestamps: bool
+    segmentation_method: str
+    kmeans_n_init: int
+    scene_detection: bool
+    realtime_factor: float
+
+    def transcribe_options(self) -> Dict:
+        return {
+            "model_size": self.whisper_model,
+            "beam_size": self.beam_size,
+            "word_timestamps": self.word_timestamps,
+        }
+
+
+# Ordered from fastest to most accurate
+PROFILES: Dict[str, ProcessingProfile] = {
+    profile.name: profile for profile in (
+        ProcessingProfile(
+            name="fast",
+            whisper_model="tiny",
+            beam_size=1,
+            word_timestamps=False,
+            segmentation_method="changepoint",
+            kmeans_n_init=1,
+            scene_detection=False,
+            realtime_factor=0.05
+        ),
+        ProcessingProfile(
+            name="balanced",
+            whisper_model="base",
+            beam_size=1,
+            word_timestamps=False,
+            segmentation_method="changepoint",
+            kmeans_n_init=3,
+            scene_detection=True,
+            realtime_factor=0.12
+        ),
+        ProcessingProfile(
+            name="accurate",
+            whisper_model="small",
+            beam_size=5,
+            word_timestamps=True,
+            segmentation_method="kmeans",
+            kmeans_n_init=10,
+            scene_detection=True,
+            realtime_factor=0.5
+        ),
+    )
+}
+
+
+def get_profile(name: str) -> ProcessingProfile:
+    if name not in PROFILES:
+        raise ValueError(f"Unknown profile: {name}")
+    return PROFILES[name]
+
+
+class ThroughputTracker:
+    """
+    Measured processing speed of each profile on this host.
+
+    Per stage, keeps an exponential moving average of seconds spent per
+    second of video, persisted as JSON so estimates survive restarts.
+    Batch and queue workers share the file: each update re-reads it under
+    a file lock, so no process drops another's measurements.
+    """
+
+    def __init__(self, path: Optional[str] = None, smoothing: float = 0.3):
+        self._path = Path(path) if path else None
+        self.smoothing = smoothing
+        self._rates: Optional[Dict[str, Dict[str, float]]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self._path or settings.THROUGHPUT_FILE
+
+    def record(self, profile: str, video_seconds: float, stage_seconds: Dict[str, float]):
+        """Fold one run's stage timings into the profile's averages."""
+        if video_seconds <= 0:
+            return
+        with self._lock, self._file_lock():
+            # Pick up what other processes recorded since the last load
+            self._rates = None
+            rates = self._load().setdefault(profile, {})
+            for stage, seconds in stage_seconds.items():
+                if stage not in TIMED_STAGES:
+                    continue
+                rate = seconds / video_seconds
+                previous = rates.get(stage)
+                rates[stage] = rate if previous is None else (
+                    previous + self.smoothing * (rate - previous)
+                )
+            self._save()
+
+    def realtime_factor(self, profile: ProcessingProfile) -> float:
+        """Measured seconds per video second, or the profile's prior if unmeasured."""
+        with self._lock:
+            rates = self._load().get(profile.name)
+        if not rates:
+            return profile.realtime_factor
+        return sum(rates.values())
+
+    def estimate_seconds(self, profile: ProcessingProfile, video_seconds: float) -> float:
+        return self.realtime_factor(profile) * video_seconds
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: dict(rates) for name, rates in self._load().items()}
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        if self._rates is None:
+            try:
+                self._rates = json.loads(self.path.read_text())
+            except FileNotFoundError:
+                self._rates = {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable throughput file {self.path}: {e}")
+                self._rates = {}
+        return self._rates
+
+    @contextmanager
+    def _file_lock(self):
+        """Hold an exclusive lock on ``<path>.lock`` against other processes."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(self.path.name + ".lock"), "a+") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _save(self):
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self._rates, indent=2))
+        os.replace(tmp, self.path)
+
+
+def choose_profile(
+    video_seconds: float,
+    deadline_seconds: float,
+    tracker: ThroughputTracker,
+    candidates: Optional[List[str]] = None
+) -> ProcessingProfile:
+    """
+    The most accurate profile expected to finish within the deadline.
+
+    Only ``candidates`` (default: all profiles, fastest first) are
+    considered; falls back to the fastest one when none is expected to fit.
+    """
+    profiles = [PROFILES[name] for name in (candidates or PROFILES)]
+    for profile in reversed(profiles):
+        estimate = tracker.estimate_seconds(profile, video_seconds)
+        if estimate <= deadline_seconds:
+            logger.info(
+                f"Profile {profile.name}: ~{estimate:.0f}s for {video_seconds:.0f}s of video "
+                f"(deadline {deadline_seconds:.0f}s)"
+            )
+            return profile
+    logger.warning(
+        f"No profile fits a {deadline_seconds:.0f}s deadline for {video_seconds:.0f}s "
+        f"of video; using {profiles[0].name}"
+    )
+    return profiles[0]
@@ -0,0 +1,781 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+import logging
+import threading
+import numpy as np
+from config import settings
+from src.audio_extraction.utils import find_pauses, select_cut_points
+from src.export.engine import TRANSCRIPT_FORMATS, ExportEngine
+from src.pipeline.artifacts import StageArtifacts
+from src.pipeline.metrics import measure_stage
+from src.pipeline.profiles import (
+    PROFILES, ProcessingProfile, ThroughputTracker, choose_profile, get_profile
+)
+from src.scene_detection.transition_analyzer import (
+    fuse_boundaries, snap_to_pauses, snap_to_segments
+)
+from src.transcription.models import TranscriptStore, segment_times
+from src.transcription.whisper_asr import SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+StageCallback = Callable[[str], None]
+EventCallback = Callable[[Dict], None]
+
+ARTIFACT_DIRNAME = "artifacts"
+PIPELINE_MODES = ("full", "fast")
+# Outline weight of a scene cut, in seconds of pause it counts as
+SCENE_CUT_WEIGHT = 2.0
+# Jobs whose re-chaptering inputs stay in memory
+RECHAPTER_SESSIONS = 8
+
+
+class JobCancelled(RuntimeError):
+    """Raised between stages once a job's ``cancelled`` event is set."""
+
+
+@dataclass
+class RechapterSession:
+    """
+    A finished job's re-chaptering inputs, kept between requests.
+
+    Everything here is independent of the chaptering parameters except
+    ``labels``, which is keyed by the parameters that change them.
+    """
+    version: Tuple
+    segments: TranscriptStore
+    duration: float
+    embeddings: np.ndarray
+    scenes: Optional[List[Tuple[float, float]]] = None
+    pauses: Optional[List[Tuple[float, float]]] = None
+    topic_features: Optional[Tuple] = None
+    labels: Dict[Tuple, np.ndarray] = field(default_factory=dict)
+
+
+class ChapterPipeline:
+    """
+    Run the chapter generation stages for a single video.
+
+    The pipeline is synchronous and holds no per-job state apart from the
+    thread-safe cache of re-chaptering sessions, so one instance can be
+    shared by every worker thread of the job pool.
+    """
+
+    def __init__(
+        self,
+        audio_extractor,
+        transcriber,
+        segmenter,
+        chapter_generator,
+        youtube_exporter,
+        json_exporter,
+        subtitle_generator,
+        scene_detector=None,
+        output_root: Optional[str] = None,
+        streaming: bool = True,
+        embedding_batch_size: int = 32,
+        provisional_every: int = 4,
+        segmentation_method: str = "kmeans",
+        audio_mode: str = "file",
+        scene_tolerance: float = 5.0,
+        pause_snap_seconds: float = 3.0,
+        outline_max_chapters: int = 20,
+        throughput: Optional[ThroughputTracker] = None,
+        export_engine: Optional[ExportEngine] = None
+    ):
+        self.audio_extractor = audio_extractor
+        self.transcriber = transcriber
+        self.segmenter = segmenter
+        self.chapter_generator = chapter_generator
+        self.youtube_exporter = youtube_exporter
+        self.json_exporter = json_exporter
+        self.subtitle_generator = subtitle_generator
+        self.scene_detector = scene_detector
+        self._output_root = Path(output_root) if output_root else None
+        self.streaming = streaming
+        self.embedding_batch_size = embedding_batch_size
+        self.provisional_every = provisional_every
+        self.segmentation_method = segmentation_method
+        self.audio_mode = audio_mode
+        self.scene_tolerance = scene_tolerance
+        self.pause_snap_seconds = pause_snap_seconds
+        self.outline_max_chapters = outline_max_chapters
+        self.throughput = throughput or ThroughputTracker()
+        # When set, replaces the per-format exporters with one streaming pass
+        self.export_engine = export_engine
+        self._scene_pool = ThreadPoolExecutor(thread_name_prefix="scenes")
+        self._rechapter_sessions: "OrderedDict[str, RechapterSession]" = OrderedDict()
+        self._rechapter_lock = threading.Lock()
+
+    @property
+    def output_root(self) -> Path:
+        return self._output_root or settings.OUTPUT_DIR
+
+    @contextmanager
+    def _stage(
+        self,
+        name: str,
+        on_stage: Optional[StageCallback],
+        timings: Optional[Dict[str, Dict]] = None,
+        audio_seconds: Optional[float] = None
+    ):
+        """Report the stage that is about to run and measure it (see ``measure_stage``)."""
+        if on_stage is not None:
+            on_stage(name)
+        logger.info(f"Stage started: {name}")
+        with measure_stage(name, timings, audio_seconds) as sample:
+            yield sample
+
+    @staticmethod
+    def _check_cancelled(on_stage: Optional[StageCallback], cancelled: threading.Event) -> StageCallback:
+        """Wrap ``on_stage`` to raise ``JobCancelled`` instead once ``cancelled`` is set."""
+        def check(name: str):
+            if cancelled.is_set():
+                raise JobCancelled(f"Cancelled before stage: {name}")
+            if on_stage is not None:
+                on_stage(name)
+        return check
+
+    def run(
+        self,
+        job_id: str,
+        video_path: str,
+        filename: str,
+        language: str = "en",
+        enable_scene_detection: bool = False,
+        min_chapter_duration: int = 60,
+        export_formats: List[str] = ("youtube", "json", "srt"),
+        mode: str = "full",
+        profile: Optional[str] = None,
+        deadline_seconds: Optional[float] = None,
+        on_stage: Optional[StageCallback] = None,
+        on_event: Optional[EventCallback] = None,
+        cancelled: Optional[threading.Event] = None
+    ) -> Dict:
+        """
+        Generate chapters and export files for one video.
+
+        Audio, transcript and embeddings are checkpointed under the job's
+        output directory; running the same ``job_id`` again resumes from the
+        first stage without a valid checkpoint.
+
+        In streaming mode, segments are embedded in micro-batches on a
+        helper thread while Whisper keeps decoding, and ``on_event`` receives
+        progress and provisional chapters as they become available.
+
+        Every stage, plus embedding, clustering and each export format
+        within a stage, is measured (wall and CPU time, peak RSS delta,
+        items, real-time factor); the breakdown is returned under
+        ``timings`` and aggregated into ``pipeline_metrics``.
+
+        With scene detection enabled, the visual detector runs on its own
+        thread from the start, alongside extraction and transcription, and
+        its cuts are fused with the topic boundaries after segmentation.
+
+        Long pauses found in the audio energy give an outline that is
+        emitted as provisional chapters before Whisper starts, and topic
+        boundaries are snapped to them. ``mode="fast"`` stops there: the
+        outline (plus scene cuts) is exported without running ASR.
+
+        ``profile`` picks Whisper, clustering and scene detection settings
+        from ``PROFILES``. With ``deadline_seconds``, the most accurate
+        profile (up to ``profile``, if given) whose measured throughput on
+        this host fits the deadline for the probed duration is used instead.
+
+        Once ``cancelled`` is set, e.g. because a queue worker lost its lease
+        on the job, ``JobCancelled`` is raised before the next stage starts.
+
+        Process:
+        1. Extract audio
+        2. Transcribe with Whisper
+        3. Segment with NLP
+        4. Generate chapters
+        5. Export multiple formats
+
+        Returns:
+            Result payload with chapters and output file paths
+        """
+        logger.info(f"Processing video: {video_path}")
+        output_dir = self.output_root / job_id
+        artifacts = StageArtifacts(output_dir / ARTIFACT_DIRNAME)
+        timings: Dict[str, Dict] = {}
+        if cancelled is not None:
+            on_stage = self._check_cancelled(on_stage, cancelled)
+
+        selected = self._select_profile(video_path, profile, deadline_seconds)
+        if selected is not None:
+            enable_scene_detection = enable_scene_detection and selected.scene_detection
+        transcribe_options = selected.transcribe_options() if selected else {}
+        cluster_options = {"n_init": selected.kmeans_n_init} if selected else {}
+        segmentation_method = selected.segmentation_method if selected else self.segmentation_method
+
+        scenes = None
+        if enable_scene_detection and self.scene_detector is not None:
+            scenes = self._scene_pool.submit(self.scene_detector.detect_scenes, str(video_path))
+
+        if mode == "fast":
+            return self._run_outline(
+                job_id, video_path, filename, min_chapter_duration, export_formats,
+                artifacts, scenes, on_stage, on_event
+            )
+        if mode not in PIPELINE_MODES:
+            raise ValueError(f"Unknown mode: {mode}")
+
+        # Steps 1-2: Extract audio and transcribe, unless a checkpoint exists
+        embeddings = None
+        pauses = None
+        transcript = artifacts.load_transcript()
+        if transcript is not None:
+            segments, metadata, duration = transcript
+            logger.info(f"Reusing transcript checkpoint: {len(segments)} segments")
+            checkpoint = artifacts.load_audio()
+            if checkpoint is not None:
+                pauses = self._find_pauses(checkpoint[0])
+        else:
+            audio, duration = self._load_or_extract_audio(
+                video_path, artifacts, on_stage, timings
+            )
+            pauses = self._find_pauses(audio)
+            if pauses is not None and on_event is not None:
+                outline = self._outline_chapters(pauses, [], duration, min_chapter_duration)
+                on_event({
+                    "type": "chapters",
+                    "provisional": True,
+                    "source": "audio",
+                    "chapters": self._chapter_summaries(outline)
+                })
+
+            with self._stage("transcription", on_stage, timings, duration) as sample:
+                if self.streaming:
+                    segments, metadata, embeddings = self._transcribe_streaming(
+                        audio, language, duration, on_event, transcribe_options
+                    )
+                else:
+                    segments, metadata = self.transcriber.transcribe(
+                        audio, language=language, **transcribe_options
+                    )
+                # Later stages read the columnar store, not segment objects
+                segments = TranscriptStore.from_segments(segments)
+                artifacts.save_transcript(segments, metadata, duration)
+                if embeddings is not None:
+                    artifacts.save_embeddings(embeddings)
+                sample.items = len(segments)
+
+        # Step 3: Generate embeddings and cluster
+        with self._stage("segmentation", on_stage, timings, duration) as sample:
+            sample.items = len(segments)
+            if embeddings is None or len(embeddings) != len(segments):
+                embeddings = artifacts.load_embeddings(expected_rows=len(segments))
+            if embeddings is None:
+                # In streaming mode embedding overlaps transcription instead
+                with measure_stage("embedding", timings, duration) as step:
+                    step.items = len(segments)
+                    embeddings = self.segmenter.generate_embeddings(segments)
+                artifacts.save_embeddings(embeddings)
+            with measure_stage("clustering", timings, duration) as step:
+                step.items = len(segments)
+                labels = self.segmenter.cluster_segments(
+                    embeddings, method=segmentation_method, segments=segments, **cluster_options
+                )
+            boundaries = self.segmenter.identify_chapter_boundaries(segments, labels)
+
+        scene_list = scenes.result() if scenes is not None else None
+        boundaries = self._apply_cues(
+            segments, boundaries, scene_list, pauses, min_chapter_duration, on_stage, timings
+        )
+        # Re-chaptering applies the same cues to its new boundaries
+        artifacts.save_cues(scene_list, pauses)
+
+        # Step 4: Extract topics
+        with self._stage("topics", on_stage, timings, duration) as sample:
+            sample.items = len(segments)
+            topics = self.segmenter.extract_topics_nmf(segments, n_topics=len(boundaries))
+
+        # Step 5: Generate chapters
+        with self._stage("chapters", on_stage, timings, duration) as sample:
+            chapters = self.chapter_generator.generate_chapters(segments, boundaries, topics)
+            chapters = self.chapter_generator.optimize_chapter_durations(
+                chapters, min_duration=min_chapter_duration
+            )
+            sample.items = len(chapters)
+
+        # Step 6: Export formats
+        with self._stage("export", on_stage, timings, duration):
+            output_dir.mkdir(parents=True, exist_ok=True)
+            outputs = self._export(
+                chapters, segments, output_dir, export_formats,
+                {"filename": filename, "duration": duration}, timings
+            )
+
+        result = {
+            "job_id": job_id,
+            "status": "success",
+            "chapters_count": len(chapters),
+            "duration": duration,
+            "outputs": outputs,
+            "chapters": self._chapter_summaries(chapters),
+            "timings": timings
+        }
+        if selected is not None:
+            result["profile"] = selected.name
+            # A reused transcript would make the profile look faster than it is
+            if "transcription" in timings:
+                self.throughput.record(selected.name, duration, {
+                    stage: sample["wall_seconds"] for stage, sample in timings.items()
+                })
+        return result
+
+    def rechapter(
+        self,
+        job_id: str,
+        filename: str = "",
+        min_chapter_duration: int = 60,
+        n_chapters: Optional[int] = None,
+        segmentation_method: Optional[str] = None,
+        export_formats: List[str] = ("youtube", "json", "srt")
+    ) -> Dict:
+        """
+        Re-derive chapters of a finished job with new parameters.
+
+        The job's checkpointed transcript and embeddings are reused, so
+        only clustering, boundaries, topics, chapter generation and export
+        run; their outputs replace the job's previous ones. Embeddings are
+        computed (and checkpointed) only if the job has none. Scene cuts
+        and pauses stored by the job's run are fused and snapped into the
+        new boundaries as ``run`` does.
+
+        The last ``RECHAPTER_SESSIONS`` jobs keep their transcript,
+        embeddings, TF-IDF features and cluster labels in memory, so
+        repeated requests (a UI slider) skip loading and any clustering
+        the changed parameters do not affect.
+
+        Args:
+            n_chapters: Number of chapters for ``changepoint``, of topic
+                clusters for ``kmeans`` (auto if None)
+            segmentation_method: Overrides the pipeline's method
+
+        Returns:
+            Result payload with chapters and output file paths
+
+        Raises:
+            FileNotFoundError: If the job has no stored transcript
+        """
+        output_dir = self.output_root / job_id
+        method = segmentation_method or self.segmentation_method
+        timings: Dict[str, Dict] = {}
+
+        with measure_stage("rechapter", timings) as sample:
+            session = self._rechapter_session(job_id, output_dir, timings)
+            segments, duration = session.segments, session.duration
+            sample.items = len(segments)
+            sample.audio_seconds = duration
+
+            # Only changepoint labels depend on the minimum duration
+            key = (method, n_chapters, min_chapter_duration if method == "changepoint" else None)
+            labels = session.labels.get(key)
+            if labels is None:
+                with measure_stage("clustering", timings, duration) as step:
+                    step.items = len(segments)
+                    labels = self.segmenter.cluster_segments(
+                        session.embeddings, method=method, n_clusters=n_chapters,
+                        segments=segments, min_duration=min_chapter_duration
+                    )
+                session.labels[key] = labels
+            boundaries = self.segmenter.identify_chapter_boundaries(
+                segments, labels, min_duration=min_chapter_duration
+            )
+            boundaries = self._apply_cues(
+                segments, boundaries, session.scenes, session.pauses,
+                min_chapter_duration, None, timings
+            )
+
+            with measure_stage("topics", timings, duration) as step:
+                step.items = len(segments)
+                if session.topic_features is None:
+                    session.topic_features = self.segmenter.topic_features(segments)
+                topics = self.segmenter.extract_topics_nmf(
+                    segments, n_topics=len(boundaries), features=session.topic_features
+                )
+            with measure_stage("chapters", timings, duration) as step:
+                chapters = self.chapter_generator.generate_chapters(segments, boundaries, topics)
+                chapters = self.chapter_generator.optimize_chapter_durations(
+                    chapters, min_duration=min_chapter_duration
+                )
+                step.items = len(chapters)
+            outputs = self._export(
+                chapters, segments, output_dir, export_formats,
+                {"filename": filename, "duration": duration}, timings
+            )
+
+        logger.info(f"Re-chaptered job {job_id}: {len(chapters)} chapters "
+                    f"in {timings['rechapter']['wall_seconds']:.2f}s")
+        return {
+            "job_id": job_id,
+            "status": "success",
+            "chapters_count": len(chapters),
+            "duration": duration,
+            "outputs": outputs,
+            "chapters": self._chapter_summaries(chapters),
+            "timings": timings
+        }
+
+    def _rechapter_session(
+        self,
+        job_id: str,
+        output_dir: Path,
+        timings: Dict[str, Dict]
+    ) -> RechapterSession:
+        """The job's cached session, reloaded if its checkpoints changed."""
+        artifacts = StageArtifacts(output_dir / ARTIFACT_DIRNAME)
+        entry = artifacts.entry("transcript")
+        if entry is None:
+            raise FileNotFoundError(f"No stored transcript for job {job_id}")
+        cues = artifacts.entry("cues")
+        version = (entry["file"], entry["size"], entry["count"], cues and cues["size"])
+
+        with self._rechapter_lock:
+            session = self._rechapter_sessions.get(job_id)
+            if session is not None and session.version == version:
+                self._rechapter_sessions.move_to_end(job_id)
+                return session
+
+        segments, _, duration = artifacts.load_transcript()
+        embeddings = artifacts.load_embeddings(expected_rows=len(segments))
+        if embeddings is None:
+            logger.info(f"Job {job_id} has no stored embeddings; computing them")
+            with measure_stage("embedding", timings, duration) as step:
+                step.items = len(segments)
+                embeddings = self.segmenter.generate_embeddings(segments)
+            artifacts.save_embeddings(embeddings)
+
+        scenes, pauses = artifacts.load_cues()
+        session = RechapterSession(
+            version, segments, duration, np.asarray(embeddings), scenes=scenes, pauses=pauses
+        )
+        with self._rechapter_lock:
+            self._rechapter_sessions[job_id] = session
+            self._rechapter_sessions.move_to_end(job_id)
+            while len(self._rechapter_sessions) > RECHAPTER_SESSIONS:
+                self._rechapter_sessions.popitem(last=False)
+        return session
+
+    def _select_profile(
+        self,
+        video_path: str,
+        profile: Optional[str],
+        deadline_seconds: Optional[float]
+    ) -> Optional[ProcessingProfile]:
+        """Resolve the requested profile, or pick one that fits the deadline."""
+        if deadline_seconds is None:
+            return get_profile(profile) if profile else None
+
+        names = list(PROFILES)
+        if profile:
+            get_profile(profile)
+            names = names[:names.index(profile) + 1]
+        try:
+            duration = self.audio_extractor.probe_duration(str(video_path))
+        except Exception as e:
+            logger.warning(f"Could not probe duration, ignoring deadline: {e}")
+            return get_profile(profile) if profile else None
+        return choose_profile(duration, deadline_seconds, self.throughput, names)
+
+    def _run_outline(
+        self,
+        job_id: str,
+        video_path: str,
+        filename: str,
+        min_chapter_duration: int,
+        export_formats: List[str],
+        artifacts: StageArtifacts,
+        scenes: Optional[Future],
+        on_stage: Optional[StageCallback],
+        on_event: Optional[EventCallback]
+    ) -> Dict:
+        """Chapters from pauses and scene cuts only; Whisper never runs."""
+        timings: Dict[str, Dict] = {}
+        audio, duration = self._load_or_extract_audio(video_path, artifacts, on_stage, timings)
+
+        with self._stage("outline", on_stage, timings, duration):
+            pauses = self._find_pauses(audio) or []
+            scene_cuts = [start for start, _ in scenes.result()[1:]] if scenes is not None else []
+            chapters = self._outline_chapters(pauses, scene_cuts, duration, min_chapter_duration)
+            if on_event is not None:
+                on_event({
+                    "type": "chapters",
+                    "provisional": True,
+                    "source": "audio",
+                    "chapters": self._chapter_summaries(chapters)
+                })
+
+        with self._stage("export", on_stage, timings, duration):
+            output_dir = self.output_root / job_id
+            output_dir.mkdir(parents=True, exist_ok=True)
+            # Subtitles need a transcript
+            formats = [f for f in export_formats if f not in TRANSCRIPT_FORMATS]
+            outputs = self._export(
+                chapters, [], output_dir, formats,
+                {"filename": filename, "duration": duration}, timings
+            )
+
+        return {
+            "job_id": job_id,
+            "status": "success",
+            "mode": "fast",
+            "chapters_count": len(chapters),
+            "duration": duration,
+            "outputs": outputs,
+            "chapters": self._chapter_summaries(chapters),
+            "timings": timings
+        }
+
+    def _load_or_extract_audio(
+        self,
+        video_path: str,
+        artifacts: StageArtifacts,
+        on_stage: Optional[StageCallback],
+        timings: Optional[Dict[str, Dict]] = None
+    ) -> Tuple[Union[str, np.ndarray], float]:
+        checkpoint = artifacts.load_audio()
+        if checkpoint is not None:
+            logger.info("Reusing audio checkpoint")
+            return checkpoint
+        with self._stage("extraction", on_stage, timings) as sample:
+            audio, duration = self._extract_audio(str(video_path), artifacts)
+            sample.audio_seconds = duration
+            return audio, duration
+
+    @staticmethod
+    def _find_pauses(audio: Union[str, np.ndarray]) -> Optional[List[Tuple[float, float]]]:
+        """Long pauses in the audio, or None if the audio cannot be read."""
+        if isinstance(audio, np.ndarray):
+            samples = audio
+        else:
+            try:
+                from faster_whisper import decode_audio
+                samples = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+            except Exception as e:
+                logger.warning(f"Pause detection skipped: {e}")
+                return None
+        pauses = find_pauses(samples, SAMPLE_RATE)
+        logger.info(f"Found {len(pauses)} pauses")
+        return pauses
+
+    def _outline_chapters(
+        self,
+        pauses: List[Tuple[float, float]],
+        scene_cuts: List[float],
+        duration: float,
+        min_chapter_duration: float
+    ) -> List:
+        """Outline chapters cut where speech resumes after the longest pauses."""
+        candidates = [(end, end - start) for start, end in pauses]
+        candidates += [(cut, SCENE_CUT_WEIGHT) for cut in scene_cuts]
+        cuts = select_cut_points(
+            candidates, duration, min_chapter_duration, self.outline_max_chapters - 1
+        )
+        return self.chapter_generator.generate_chapters_from_cuts(cuts, duration)
+
+    def _apply_cues(
+        self,
+        segments,
+        boundaries: List[int],
+        scenes: Optional[List[Tuple[float, float]]],
+        pauses: Optional[List[Tuple[float, float]]],
+        min_chapter_duration: float,
+        on_stage: Optional[StageCallback],
+        timings: Dict[str, Dict]
+    ) -> List[int]:
+        """Fuse scene cuts into topic boundaries, then snap them to pauses."""
+        if scenes is not None:
+            with self._stage("fusion", on_stage, timings) as sample:
+                sample.items = len(boundaries)
+                boundaries = self._fuse_scene_boundaries(
+                    segments, boundaries, scenes, min_chapter_duration
+                )
+        if pauses:
+            starts = segment_times(segments)[0].tolist()
+            boundaries = snap_to_pauses(boundaries, starts, pauses, self.pause_snap_seconds)
+        return boundaries
+
+    def _fuse_scene_boundaries(
+        self,
+        segments: List,
+        boundaries: List[int],
+        scenes: List[Tuple[float, float]],
+        min_chapter_duration: float
+    ) -> List[int]:
+        """Merge visual cuts into topic boundaries, working in seconds."""
+        starts = segment_times(segments)[0].tolist()
+        candidates = fuse_boundaries(
+            [starts[i] for i in boundaries],
+            [start for start, _ in scenes[1:]],
+            tolerance=self.scene_tolerance
+        )
+        fused = snap_to_segments(candidates, starts, min_gap=min_chapter_duration)
+        logger.info(
+            f"Fused {len(boundaries)} topic boundaries with {max(len(scenes) - 1, 0)} "
+            f"scene cuts into {len(fused)}"
+        )
+        return fused
+
+    def _extract_audio(
+        self,
+        video_path: str,
+        artifacts: StageArtifacts
+    ) -> Tuple[Union[str, np.ndarray], float]:
+        """
+        Extract audio and checkpoint it.
+
+        ``pcm`` mode decodes 16 kHz mono samples from an ffmpeg pipe and
+        hands them to the transcriber in memory; ``file`` mode writes a WAV
+        with MoviePy.
+        """
+        if self.audio_mode == "pcm":
+            samples, duration = self.audio_extractor.extract_audio_pcm(video_path)
+            artifacts.save_audio_samples(samples, duration)
+            return samples, duration
+        if self.audio_mode == "file":
+            audio_path, duration = self.audio_extractor.extract_audio_moviepy(video_path)
+            return artifacts.save_audio(audio_path, duration), duration
+        raise ValueError(f"Unknown audio mode: {self.audio_mode}")
+
+    def _transcribe_streaming(
+        self,
+        audio: Union[str, np.ndarray],
+        language: str,
+        duration: float,
+        on_event: Optional[EventCallback],
+        transcribe_options: Optional[Dict] = None
+    ) -> Tuple[List, Dict, np.ndarray]:
+        """
+        Consume Whisper's segment stream, embedding micro-batches as they fill.
+
+        Returns:
+            Tuple of (segments, metadata, embeddings)
+        """
+        emit = on_event or (lambda event: None)
+        segment_stream, metadata = self.transcriber.transcribe_stream(
+            audio, language=language, **(transcribe_options or {})
+        )
+
+        segments = []
+        batch = []
+        futures = []
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed") as embedder:
+            for segment in segment_stream:
+                segments.append(segment)
+                batch.append(segment)
+                if len(batch) < self.embedding_batch_size:
+                    continue
+
+                futures.append(embedder.submit(self.segmenter.generate_embeddings, batch))
+                batch = []
+                emit({
+                    "type": "progress",
+                    "stage": "transcription",
+                    "processed_seconds": segment.end,
+                    "duration": duration,
+                    "segments": len(segments)
+                })
+                if len(futures) % self.provisional_every == 0:
+                    self._emit_provisional_chapters(segments, futures, emit)
+
+            if batch:
+                futures.append(embedder.submit(self.segmenter.generate_embeddings, batch))
+            batches = [np.asarray(future.result()) for future in futures]
+
+        metadata["total_segments"] = len(segments)
+        logger.info(f"Transcribed: {len(segments)} segments (streaming)")
+        embeddings = np.concatenate(batches) if batches else np.empty((0, 0))
+        return segments, metadata, embeddings
+
+    def _emit_provisional_chapters(
+        self,
+        segments: List,
+        futures: List,
+        emit: EventCallback
+    ):
+        """
+        Emit preview chapters over the segments embedded so far.
+
+        Every batch but the one just submitted is included; waiting on them
+        also keeps the embedder from falling far behind the decoder.
+        """
+        done = [np.asarray(future.result()) for future in futures[:-1]]
+        if not done:
+            return
+
+        embeddings = np.concatenate(done)
+        prefix = segments[:len(embeddings)]
+        if len(prefix) == 0 or len(embeddings) != len(prefix):
+            return
+        boundaries = self.segmenter.provisional_boundaries(prefix, embeddings)
+        chapters = self.chapter_generator.generate_chapters(prefix, boundaries, None)
+        emit({
+            "type": "chapters",
+            "provisional": True,
+            "chapters": self._chapter_summaries(chapters)
+        })
+
+    @staticmethod
+    def _chapter_summaries(chapters) -> List[Dict]:
+        return [
+            {
+                "number": ch.number,
+                "title": ch.title,
+                "start": ch.start_time,
+                "end": ch.end_time
+            }
+            for ch in chapters
+        ]
+
+    def _export(
+        self,
+        chapters,
+        segments,
+        output_dir: Path,
+        export_formats: List[str],
+        video_metadata: Dict,
+        timings: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, str]:
+        """Write every requested export format and return their paths."""
+        if self.export_engine is not None:
+            return self.export_engine.export(
+                chapters, segments, output_dir, export_formats, video_metadata, timings
+            )
+
+        outputs = {}
+        duration = video_metadata.get("duration")
+
+        # YouTube format
+        if "youtube" in export_formats:
+            with measure_stage("export_youtube", timings, duration) as step:
+                step.items = len(chapters)
+                youtube_path = output_dir / "chapters_youtube.txt"
+                youtube_content = self.youtube_exporter.export(chapters)
+                with open(youtube_path, 'w') as f:
+                    f.write(youtube_content)
+            outputs["youtube"] = str(youtube_path)
+
+        # JSON format
+        if "json" in export_formats:
+            with measure_stage("export_json", timings, duration) as step:
+                step.items = len(chapters)
+                json_path = output_dir / "chapters.json"
+                self.json_exporter.export(chapters, video_metadata, str(json_path))
+            outputs["json"] = str(json_path)
+
+        # SRT format
+        if "srt" in export_formats:
+            with measure_stage("export_srt", timings, duration) as step:
+                step.items = len(segments)
+                srt_path = output_dir / "subtitles.srt"
+                self.subtitle_generator.generate_srt(segments, str(srt_path))
+            outputs["srt"] = str(srt_path)
+
+        return outputs
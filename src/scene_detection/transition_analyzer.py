@@ -0,0 +1,154 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_SOURCE_WEIGHTS = {"nlp": 1.0, "visual": 0.5}
+
+
+@dataclass
+class BoundaryCandidate:
+    """A chapter boundary in seconds with the evidence for it."""
+    time: float
+    score: float
+    sources: Dict[str, float] = field(default_factory=dict)
+
+
+def fuse_boundaries(
+    nlp_times: Sequence[float],
+    visual_times: Sequence[float],
+    tolerance: float = 5.0,
+    weights: Optional[Dict[str, float]] = None
+) -> List[BoundaryCandidate]:
+    """
+    Merge topic and visual boundaries, both in seconds, in one linear pass.
+
+    Every NLP boundary is kept. A visual cut closer than ``tolerance`` to
+    an NLP boundary adds its weight to that boundary's score; any other
+    visual cut becomes a candidate of its own. Both inputs must be sorted,
+    which is what makes the merge O(V + N).
+
+    Returns:
+        Candidates sorted by time
+    """
+    weights = {**DEFAULT_SOURCE_WEIGHTS, **(weights or {})}
+    fused = [
+        BoundaryCandidate(t, weights["nlp"], {"nlp": weights["nlp"]})
+        for t in nlp_times
+    ]
+    visual_only = []
+
+    j = 0
+    for t in visual_times:
+        # Skip NLP boundaries that every remaining visual cut is past
+        while j < len(nlp_times) and nlp_times[j] <= t - tolerance:
+            j += 1
+        # Move on to the nearest NLP boundary; later cuts never match an earlier one
+        while j + 1 < len(nlp_times) and abs(nlp_times[j + 1] - t) < abs(nlp_times[j] - t):
+            j += 1
+        if j == len(nlp_times) or abs(nlp_times[j] - t) >= tolerance:
+            visual_only.append(BoundaryCandidate(t, weights["visual"], {"visual": weights["visual"]}))
+        elif "visual" not in fused[j].sources:
+            fused[j].sources["visual"] = weights["visual"]
+            fused[j].score += weights["visual"]
+
+    return _merge_sorted(fused, visual_only)
+
+
+def snap_to_segments(
+    candidates: List[BoundaryCandidate],
+    segment_starts: Sequence[float],
+    min_gap: float = 0.0
+) -> List[int]:
+    """
+    Map candidate times to the nearest segment start and thin them out.
+
+    When two candidates land less than ``min_gap`` seconds apart the one
+    with the higher score is kept. Segment 0 always starts a chapter.
+
+    Returns:
+        Sorted boundary segment indices, starting with 0
+    """
+    kept: List[BoundaryCandidate] = []
+    indices: List[int] = []
+    for candidate in candidates:
+        index = bisect_left(segment_starts, candidate.time)
+        if index == len(segment_starts) or (
+            index > 0
+            and candidate.time - segment_starts[index - 1] < segment_starts[index] - candidate.time
+        ):
+            index -= 1
+        if index <= 0 or (indices and index == indices[-1]):
+            continue
+        start = segment_starts[index]
+        previous_start = segment_starts[indices[-1]] if indices else segment_starts[0]
+        if start - previous_start < min_gap:
+            # Swap in the stronger candidate if it still clears the one before
+            before = segment_starts[indices[-2]] if len(indices) > 1 else segment_starts[0]
+            if indices and candidate.score > kept[-1].score and start - before >= min_gap:
+                kept[-1] = candidate
+                indices[-1] = index
+            continue
+        kept.append(candidate)
+        indices.append(index)
+    return [0] + indices
+
+
+def snap_to_pauses(
+    boundaries: List[int],
+    segment_starts: Sequence[float],
+    pauses: Sequence[Tuple[float, float]],
+    tolerance: float = 3.0
+) -> List[int]:
+    """
+    Move each boundary to where speech resumes after the longest nearby pause.
+
+    Pauses overlapping ``tolerance`` seconds around a boundary's start time
+    are considered; the boundary moves to the segment starting closest to
+    the end of the longest one. Boundaries and pauses are both sorted, so
+    this is a single O(B + P) sweep. Order is preserved and duplicates are
+    dropped.
+
+    Returns:
+        Sorted boundary segment indices, starting with 0
+    """
+    snapped = [0]
+    j = 0
+    for boundary in boundaries[1:]:
+        time = segment_starts[boundary]
+        while j < len(pauses) and pauses[j][1] < time - tolerance:
+            j += 1
+        longest = None
+        k = j
+        while k < len(pauses) and pauses[k][0] <= time + tolerance:
+            if longest is None or pauses[k][1] - pauses[k][0] > longest[1] - longest[0]:
+                longest = pauses[k]
+            k += 1
+
+        if longest is not None:
+            index = bisect_left(segment_starts, longest[1])
+            if index == len(segment_starts) or (
+                index > 0
+                and longest[1] - segment_starts[index - 1] < segment_starts[index] - longest[1]
+            ):
+                index -= 1
+            if index > snapped[-1]:
+                boundary = index
+        if boundary > snapped[-1]:
+            snapped.append(boundary)
+    return snapped
+
+
+def _merge_sorted(
+    first: List[BoundaryCandidate],
+    second: List[BoundaryCandidate]
+) -> List[BoundaryCandidate]:
+    merged = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        if first[i].time <= second[j].time:
+            merged.append(first[i])
+            i += 1
+        else:
+            merged.append(second[j])
+            j += 1
+    return merged + first[i:] + second[j:]
@@ -1,22 +1,65 @@
-from scenedetect import VideoManager, SceneManager
-from scenedetect.detectors import ContentDetector, ThresholdDetector
-from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import json
 import logging
+import multiprocessing
+import re
+import subprocess
+import threading
+import numpy as np
+from src.scene_detection.transition_analyzer import fuse_boundaries
 
 logger = logging.getLogger(__name__)
 
+PTS_TIME = re.compile(rb"pts_time:\s*(-?[\d.]+)")
+FRAMES_PER_READ = 256
+
+# Cut thresholds per engine. Both scores run 0-255, but PySceneDetect's
+# content_val averages HSV channel differences while the ffmpeg engine scores
+# grayscale differences between sampled frames, which grow with the stride
+# on moving content. 50 sits mid-way in the range (40-70) that found every
+# luminance cut without false positives at strides 1-5 in
+# benchmarks/bench_scene_detection.py
+DEFAULT_THRESHOLDS = {
+    "scenedetect": 30.0,
+    "ffmpeg": 50.0,
+}
+
+# Per range: (frame times, scores against the previous frame, first and last
+# frame as flat int16 arrays)
+RangeScan = Tuple[np.ndarray, np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]
+
 class VisualSceneDetector:
     """
     Detect scene transitions using visual content analysis.
+
+    The default ``scenedetect`` engine runs PySceneDetect's detectors on
+    every ``frame_stride``-th frame, downscaled to ``downscale_width``. The
+    ``ffmpeg`` engine lets ffmpeg decode, skip and downscale frames to small
+    grayscale images, scores each sampled frame by its mean absolute
+    difference from the previous one, and can split the video into time
+    ranges scanned by parallel worker processes. It is faster, but misses
+    cuts that change only colour. ``threshold`` defaults to the engine's
+    entry in ``DEFAULT_THRESHOLDS``.
     """
 
     def __init__(
         self,
-        threshold: float = 30.0,
-        min_scene_len: int = 15
+        threshold: Optional[float] = None,
+        min_scene_len: int = 15,
+        engine: str = "scenedetect",
+        frame_stride: int = 1,
+        downscale_width: int = 160,
+        keyframes_only: bool = False,
+        num_workers: int = 1
     ):
-        self.threshold = threshold
+        self.threshold = threshold if threshold is not None else DEFAULT_THRESHOLDS.get(engine, 30.0)
         self.min_scene_len = min_scene_len
+        self.engine = engine
+        self.frame_stride = max(1, frame_stride)
+        self.downscale_width = downscale_width
+        self.keyframes_only = keyframes_only
+        self.num_workers = max(1, num_workers)
 
     def detect_scenes(
         self,
@@ -28,12 +71,30 @@ class VisualSceneDetector:
 
         Args:
             video_path: Path to video file
-            detection_mode: 'content' or 'threshold'
+            detection_mode: 'content' or 'threshold' (scenedetect engine)
 
         Returns:
             List of (start_time, end_time) tuples
         """
-        video_manager = VideoManager([video_path])
+        if self.engine == "ffmpeg":
+            scenes = self._detect_scenes_ffmpeg(str(video_path))
+        elif self.engine == "scenedetect":
+            scenes = self._detect_scenes_scenedetect(str(video_path), detection_mode)
+        else:
+            raise ValueError(f"Unknown scene detection engine: {self.engine}")
+
+        logger.info(f"Detected {len(scenes)} visual scenes")
+        return scenes
+
+    def _detect_scenes_scenedetect(
+        self,
+        video_path: str,
+        detection_mode: str
+    ) -> List[Tuple[float, float]]:
+        from scenedetect import SceneManager, open_video
+        from scenedetect.detectors import ContentDetector, ThresholdDetector
+
+        video = open_video(video_path)
         scene_manager = SceneManager()
 
         # Add detector based on mode
@@ -47,19 +108,42 @@ class VisualSceneDetector:
             )
 
         # Perform detection
-        video_manager.set_downscale_factor()
-        video_manager.start()
-        scene_manager.detect_scenes(frame_source=video_manager)
+        scene_manager.auto_downscale = False
+        scene_manager.downscale = max(1, video.frame_size[0] // self.downscale_width)
+        scene_manager.detect_scenes(video=video, frame_skip=self.frame_stride - 1)
         scene_list = scene_manager.get_scene_list()
-        video_manager.release()
 
         # Convert to timestamps
-        scenes = [
+        return [
             (scene[0].get_seconds(), scene[1].get_seconds())
             for scene in scene_list
         ]
-        logger.info(f"Detected {len(scenes)} visual scenes")
-        return scenes
+
+    def _detect_scenes_ffmpeg(self, video_path: str) -> List[Tuple[float, float]]:
+        info = probe_video(video_path)
+        width = self.downscale_width
+        height = max(2, int(round(width * info["height"] / info["width"] / 2)) * 2)
+        scan_args = (width, height, self.frame_stride, self.keyframes_only)
+
+        ranges = _split_ranges(info["duration"], self.num_workers)
+        if len(ranges) == 1:
+            scans = [_scan_range(video_path, *ranges[0], *scan_args)]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=len(ranges),
+                mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                futures = [
+                    pool.submit(_scan_range, video_path, start, length, *scan_args)
+                    for start, length in ranges
+                ]
+                scans = [future.result() for future in futures]
+
+        times, scores = _merge_range_scans(scans)
+        min_gap = self.min_scene_len / info["fps"]
+        cuts = _cuts_from_scores(times, scores, self.threshold, min_gap)
+        bounds = [0.0] + cuts + [info["duration"]]
+        return list(zip(bounds[:-1], bounds[1:]))
 
     def merge_with_nlp_boundaries(
         self,
@@ -70,18 +154,163 @@ class VisualSceneDetector:
         """
         Merge NLP and visual boundaries with tolerance.
 
+        Both inputs are in seconds. Visual scene starts closer than
+        ``tolerance`` to an NLP boundary are dropped; see
+        ``fuse_boundaries`` for the scored, linear-time merge.
+
         Returns:
             Combined boundary timestamps
         """
-        merged = set(nlp_boundaries)
+        fused = fuse_boundaries(
+            sorted(nlp_boundaries),
+            sorted(start for start, _ in visual_scenes),
+            tolerance
+        )
+        return list(dict.fromkeys(candidate.time for candidate in fused))
+
+
+def probe_video(video_path: str) -> Dict:
+    """Frame size, frame rate and duration of the first video stream (ffprobe)."""
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "stream=width,height,avg_frame_rate:format=duration",
+        "-of", "json",
+        str(video_path)
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, check=True)
+    except subprocess.CalledProcessError as e:
+        logger.error(f"FFprobe failed: {e.stderr}")
+        raise
+
+    info = json.loads(result.stdout)
+    if not info.get("streams"):
+        raise ValueError(f"No video stream in {video_path}")
+    stream = info["streams"][0]
+    numerator, _, denominator = stream.get("avg_frame_rate", "0/1").partition("/")
+    fps = float(numerator) / float(denominator) if float(denominator or 0) else 0.0
+    return {
+        "width": int(stream["width"]),
+        "height": int(stream["height"]),
+        "fps": fps or 25.0,
+        "duration": float(info.get("format", {}).get("duration", 0.0)),
+    }
+
+
+def _split_ranges(duration: float, parts: int) -> List[Tuple[float, Optional[float]]]:
+    """(start, length) ranges covering the video; the last one runs to the end."""
+    if parts <= 1 or duration <= 0:
+        return [(0.0, None)]
+    step = duration / parts
+    return [(i * step, step if i < parts - 1 else None) for i in range(parts)]
+
+
+def _scan_range(
+    video_path: str,
+    start: float,
+    length: Optional[float],
+    width: int,
+    height: int,
+    stride: int,
+    keyframes_only: bool
+) -> RangeScan:
+    """
+    Decode one time range to small grayscale frames and score each one.
+
+    ffmpeg does the expensive work: ``-skip_frame nokey`` skips non-key
+    frames inside the decoder, ``select`` keeps every ``stride``-th frame
+    and ``scale`` shrinks frames before they cross the pipe. ``showinfo``
+    reports each emitted frame's timestamp on stderr.
+    """
+    cmd = ["ffmpeg", "-nostdin", "-hide_banner", "-nostats"]
+    if keyframes_only:
+        cmd += ["-skip_frame", "nokey"]
+    if start > 0:
+        cmd += ["-ss", f"{start:.3f}"]
+    cmd += ["-i", str(video_path)]
+    if length is not None:
+        cmd += ["-t", f"{length:.3f}"]
+    filters = []
+    if stride > 1 and not keyframes_only:
+        filters.append(f"select=not(mod(n\\,{stride}))")
+    filters += [f"scale={width}:{height}:flags=area", "format=gray", "showinfo"]
+    cmd += ["-an", "-vf", ",".join(filters), "-vsync", "vfr", "-f", "rawvideo", "-"]
+
+    frame_size = width * height
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stderr_lines: List[bytes] = []
+    # showinfo writes a line per frame; drain stderr so ffmpeg never blocks on it
+    reader = threading.Thread(target=lambda: stderr_lines.extend(process.stderr))
+    reader.start()
+
+    # Score frames block by block so memory stays flat on long videos
+    scores = []
+    first = previous = None
+    while True:
+        block = process.stdout.read(frame_size * FRAMES_PER_READ)
+        count = len(block) // frame_size
+        if count == 0:
+            break
+        frames = np.frombuffer(block, dtype=np.uint8)[:count * frame_size].reshape(count, frame_size)
+        frames = frames.astype(np.int16)
+        if previous is None:
+            first = frames[0]
+            scores.append(np.zeros(1))
+        else:
+            scores.append(np.abs(frames[:1] - previous).mean(axis=1))
+        scores.append(np.abs(frames[1:] - frames[:-1]).mean(axis=1))
+        previous = frames[-1]
+    process.wait()
+    reader.join()
+    if process.returncode != 0:
+        stderr = b"".join(stderr_lines[-20:])
+        logger.error(f"FFmpeg failed: {stderr}")
+        raise subprocess.CalledProcessError(process.returncode, cmd, stderr=stderr)
+
+    scores = np.concatenate(scores) if scores else np.zeros(0)
+    times = [float(m.group(1)) for m in map(PTS_TIME.search, stderr_lines) if m]
+    count = min(len(scores), len(times))
+    times = np.asarray(times[:count]) + start
+    return times, scores[:count], first, previous
+
+
+def _merge_range_scans(scans: List[RangeScan]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Concatenate per-range scores in time order.
+
+    The first frame of each range has no predecessor inside its range, so
+    it is scored against the last frame of the previous range here; cuts
+    that fall exactly on a seam are not lost.
+    """
+    times = []
+    scores = []
+    previous_last = None
+    for range_times, range_scores, first, last in scans:
+        if first is None:
+            continue
+        range_scores = range_scores.copy()
+        if previous_last is not None and len(range_scores):
+            range_scores[0] = np.abs(first - previous_last).mean()
+        times.append(range_times)
+        scores.append(range_scores)
+        previous_last = last
+    if not times:
+        return np.zeros(0), np.zeros(0)
+    return np.concatenate(times), np.concatenate(scores)
 
-        for start, end in visual_scenes:
-            # Check if visual boundary aligns with NLP boundary
-            close_to_nlp = any(
-                abs(start - nlp_ts) < tolerance
-                for nlp_ts in nlp_boundaries
-            )
-            if not close_to_nlp:
-                merged.add(start)
 
-        return sorted(list(merged))
+def _cuts_from_scores(
+    times: np.ndarray,
+    scores: np.ndarray,
+    threshold: float,
+    min_gap: float
+) -> List[float]:
+    """Times whose score reaches ``threshold``, at least ``min_gap`` apart."""
+    cuts = []
+    last = times[0] if len(times) else 0.0
+    for index in np.flatnonzero(scores >= threshold):
+        if times[index] - last >= min_gap:
+            cuts.append(float(times[index]))
+            last = times[index]
+    return cuts
@@ -0,0 +1,130 @@
+from typing import List, Optional
+import numpy as np
+
+
+def window_similarity(embeddings: np.ndarray, window: int) -> np.ndarray:
+    """
+    Cosine similarity across every gap between neighbouring segments.
+
+    Entry ``p - 1`` compares the mean embedding of the ``window`` segments
+    before position ``p`` with the ``window`` segments from ``p`` on
+    (windows are truncated at the ends). Uses prefix sums, so the cost is
+    linear in the number of segments.
+
+    Returns:
+        Array of length ``len(embeddings) - 1``
+    """
+    n = len(embeddings)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    unit = embeddings / np.maximum(norms, 1e-12)
+    csum = np.vstack([np.zeros((1, unit.shape[1])), np.cumsum(unit, axis=0)])
+
+    positions = np.arange(1, n)
+    left = csum[positions] - csum[np.maximum(positions - window, 0)]
+    right = csum[np.minimum(positions + window, n)] - csum[positions]
+    return np.sum(left * right, axis=1) / np.maximum(
+        np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1), 1e-12
+    )
+
+
+def changepoint_boundaries(
+    embeddings: np.ndarray,
+    starts: np.ndarray,
+    end_time: float,
+    min_duration: float,
+    max_chapters: int,
+    n_chapters: Optional[int] = None,
+    window: int = 5,
+    threshold: float = 4.0
+) -> List[int]:
+    """
+    Choose topic boundaries with a dynamic program over similarity dips.
+
+    Candidates are local minima of ``window_similarity``; each is worth its
+    dissimilarity ``1 - similarity``. The program picks the highest-value
+    set of candidates such that every chapter lasts at least
+    ``min_duration`` seconds (the last one at least half that, matching
+    ``identify_chapter_boundaries``) and there are at most ``max_chapters``
+    chapters. Without ``n_chapters`` only candidates more than ``threshold``
+    robust standard deviations (scaled MAD) above the median dissimilarity
+    pay off; with it, exactly that many chapters are produced when the
+    constraints allow.
+
+    Args:
+        embeddings: Segment embeddings in time order
+        starts: Segment start times in seconds
+        end_time: End of the last segment
+        min_duration: Minimum chapter length in seconds
+        max_chapters: Upper bound on the number of chapters
+        n_chapters: Exact number of chapters wanted (auto if None)
+        window: Segments on each side compared at every gap
+        threshold: Outlier cut-off for automatic chapter counts
+
+    Returns:
+        Boundary segment indices, starting with 0
+    """
+    n = len(embeddings)
+    if n < 2 or max_chapters < 2:
+        return [0]
+
+    dissimilarity = 1.0 - window_similarity(np.asarray(embeddings, dtype=np.float64), window)
+    padded = np.concatenate([[-np.inf], dissimilarity, [-np.inf]])
+    is_peak = (dissimilarity >= padded[:-2]) & (dissimilarity >= padded[2:])
+
+    if n_chapters is None:
+        # Scaled MAD: a spread estimate the few true boundaries cannot inflate
+        median = np.median(dissimilarity)
+        spread = 1.4826 * np.median(np.abs(dissimilarity - median))
+        gain = dissimilarity - (median + threshold * spread)
+        max_cuts = max_chapters - 1
+    else:
+        gain = dissimilarity
+        max_cuts = min(n_chapters, max_chapters) - 1
+
+    origin = starts[0]
+    positions = np.arange(1, n)
+    usable = (
+        is_peak
+        & (gain > 0)
+        & (starts[positions] - origin >= min_duration)
+        & (end_time - starts[positions] >= min_duration / 2)
+    )
+    candidates = positions[usable]
+    if len(candidates) == 0 or max_cuts < 1:
+        return [0]
+
+    times = starts[candidates]
+    weights = gain[candidates - 1]
+    # previous[j]: number of candidates far enough before j to precede it
+    previous = np.searchsorted(times, times - min_duration, side="right")
+
+    # best[c][j]: best total weight of c cuts ending with candidate j
+    m = len(candidates)
+    best = np.full((max_cuts + 1, m), -np.inf)
+    choice = np.full((max_cuts + 1, m), -1, dtype=np.int64)
+    best[1] = weights
+    for c in range(2, max_cuts + 1):
+        # Running max (and where it was reached) of best[c - 1] over time
+        prefix_best = np.maximum.accumulate(best[c - 1])
+        prefix_arg = np.maximum.accumulate(
+            np.where(best[c - 1] == prefix_best, np.arange(m), 0)
+        )
+        valid = previous > 0
+        idx = previous[valid] - 1
+        best[c, valid] = prefix_best[idx] + weights[valid]
+        choice[c, valid] = prefix_arg[idx]
+
+    if n_chapters is None:
+        cuts, last = np.unravel_index(np.argmax(best), best.shape)
+    else:
+        # Largest achievable count up to the requested one
+        cuts = max(c for c in range(1, max_cuts + 1) if np.isfinite(best[c]).any())
+        last = int(np.argmax(best[cuts]))
+
+    chosen = []
+    while cuts >= 1 and last >= 0:
+        chosen.append(int(candidates[last]))
+        last = choice[cuts, last]
+        cuts -= 1
+    return [0] + sorted(chosen)
+
@@ -0,0 +1,510 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+import numpy as np
+from config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: processes must not share a cache directory
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+EncodeFn = Callable[[List[str]], np.ndarray]
+
+INDEX_FILENAME = "index.json"
+KEYS_FILENAME = "keys.bin"
+VECTORS_FILENAME = "vectors.f16"
+LOCK_FILENAME = "cache.lock"
+KEY_BYTES = 20
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def text_key(text: str) -> str:
+    """Hash of the text after Unicode (NFC) and whitespace normalization."""
+    normalized = _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache of sentence embeddings for one encoder model.
+
+    The memory tier is an LRU of float32 vectors. The disk tier is a
+    fixed-capacity float16 memory-mapped array under ``cache_dir`` with a
+    parallel memory-mapped array of key digests, so storing a vector writes
+    one row of each; when full, rows are reused in ring order and the
+    oldest stored text is evicted first. Only texts missing from both tiers
+    reach the encoder.
+
+    Several processes may share ``cache_dir``: the disk tier is guarded by
+    a file lock, each process catches up with rows the others wrote before
+    using it, and a row is only returned while its slot still holds the
+    requested key.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: Optional[str] = None,
+        memory_entries: int = 20000,
+        disk_entries: int = 200000
+    ):
+        self.model_name = model_name
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._dir = None
+        self._rows: Dict[str, int] = {}
+        self._slot_keys: Dict[int, str] = {}
+        self._next_slot = 0
+        self._written = 0
+        self._keys: Optional[np.memmap] = None
+        self._vectors: Optional[np.memmap] = None
+        if cache_dir is not None and disk_entries > 0:
+            safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", model_name)
+            self._dir = Path(cache_dir) / safe_name
+            with self._file_lock(exclusive=False):
+                self._sync()
+            if self._rows:
+                logger.info(f"Loaded embedding cache with {len(self._rows)} entries from {self._dir}")
+
+    def encode(self, texts: Sequence[str], encode_fn: EncodeFn) -> np.ndarray:
+        """
+        Embeddings for ``texts``, calling ``encode_fn`` only for unseen ones.
+
+        Repeated texts within one call are encoded once.
+        """
+        keys = [text_key(text) for text in texts]
+        found = self._lookup(keys)
+
+        missing: Dict[str, str] = {}
+        for key, text, vector in zip(keys, texts, found):
+            if vector is None and key not in missing:
+                missing[key] = text
+
+        if missing:
+            encoded = np.asarray(encode_fn(list(missing.values())), dtype=np.float32)
+            new_vectors = dict(zip(missing, encoded))
+            self._store(new_vectors)
+            found = [
+                vector if vector is not None else new_vectors[key]
+                for key, vector in zip(keys, found)
+            ]
+
+        if not found:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(found)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "model": self.model_name,
+                "memory_entries": len(self._memory),
+                "max_memory_entries": self.memory_entries,
+                "disk_entries": len(self._rows),
+                "max_disk_entries": self.disk_entries if self._dir else 0,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        """Drop both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._dir is None:
+                return
+            with self._file_lock(exclusive=True):
+                self._sync()
+                self._rows.clear()
+                self._slot_keys.clear()
+                self._next_slot = 0
+                if self._keys is not None:
+                    self._keys[:] = 0
+                    self._keys.flush()
+                    # Past a full ring, so other processes rescan instead of catching up
+                    self._written += len(self._keys)
+                    self._write_index()
+
+    def _lookup(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        found: List[Optional[np.ndarray]] = [None] * len(keys)
+        on_disk = []
+        promoted = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    found[i] = vector
+                else:
+                    on_disk.append(i)
+
+            if on_disk and self._dir is not None:
+                with self._file_lock(exclusive=False):
+                    self._sync()
+                    for i in on_disk:
+                        key = keys[i]
+                        if key in promoted:
+                            found[i] = promoted[key]
+                            self.memory_hits += 1
+                            continue
+                        vector = self._read_row(key)
+                        if vector is not None:
+                            promoted[key] = found[i] = vector
+                            self.disk_hits += 1
+                self._remember(promoted)
+            self.misses += sum(vector is None for vector in found)
+        return found
+
+    def _read_row(self, key: str) -> Optional[np.ndarray]:
+        """Vector stored under ``key``, if its slot still holds that key."""
+        slot = self._rows.get(key)
+        if slot is None:
+            return None
+        if self._keys[slot].tobytes().hex() != key:
+            # Overwritten since it was indexed
+            del self._rows[key]
+            return None
+        return np.asarray(self._vectors[slot], dtype=np.float32)
+
+    def _store(self, vectors: Dict[str, np.ndarray]):
+        with self._lock:
+            self._remember(vectors)
+            if self._dir is None:
+                return
+            with self._file_lock(exclusive=True):
+                self._sync()
+                if self._vectors is None:
+                    self._create_storage(len(next(iter(vectors.values()))))
+                for key, vector in vectors.items():
+                    if key in self._rows or len(vector) != self._vectors.shape[1]:
+                        continue
+                    slot = self._next_slot
+                    self._vectors[slot] = vector
+                    self._keys[slot] = np.frombuffer(bytes.fromhex(key), dtype=np.uint8)
+                    self._index_slot(slot)
+                    self._next_slot = (slot + 1) % len(self._keys)
+                    self._written += 1
+                # Vectors first, so a stored key never points at an unwritten row
+                self._vectors.flush()
+                self._keys.flush()
+                self._write_index()
+
+    def _remember(self, vectors: Dict[str, np.ndarray]):
+        """Add vectors to the memory tier (caller holds the lock)."""
+        for key, vector in vectors.items():
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """
+        Lock the disk tier against other processes sharing ``cache_dir``.
+
+        Batch and queue workers each open their own cache on the same
+        directory; stores take the lock exclusively, lookups shared.
+        """
+        self._dir.mkdir(parents=True, exist_ok=True)
+        with open(self._dir / LOCK_FILENAME, "a+") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _sync(self):
+        """
+        Catch up with rows other processes stored (caller holds the file lock).
+
+        The index counts rows ever written, so only the slots written since
+        the last sync are re-read; a full rescan is needed only when more
+        than a ring's worth was written in between.
+        """
+        index = self._read_index()
+        if index is None:
+            return
+        if self._keys is None:
+            if not self._open_storage(index):
+                return
+            written = None
+        else:
+            written = index["written"] - self._written
+
+        capacity = len(self._keys)
+        if written is None or not 0 <= written < capacity:
+            self._rows.clear()
+            self._slot_keys.clear()
+            for slot in np.flatnonzero(self._keys.any(axis=1)):
+                self._index_slot(int(slot))
+        else:
+            for offset in range(written):
+                self._index_slot((self._next_slot + offset) % capacity)
+        self._next_slot = index["next_slot"] % capacity
+        self._written = index["written"]
+
+    def _index_slot(self, slot: int):
+        """Point ``_rows`` at whatever key ``slot`` now holds."""
+        previous = self._slot_keys.pop(slot, None)
+        if previous is not None and self._rows.get(previous) == slot:
+            del self._rows[previous]
+        raw = self._keys[slot]
+        if raw.any():
+            key = raw.tobytes().hex()
+            self._rows[key] = slot
+            self._slot_keys[slot] = key
+
+    def _create_storage(self, dim: int):
+        # Only reached under the exclusive lock with no readable index, so no
+        # other process is using these files
+        self._next_slot = 0
+        self._keys = np.memmap(
+            self._dir / KEYS_FILENAME, dtype=np.uint8, mode="w+",
+            shape=(self.disk_entries, KEY_BYTES)
+        )
+        self._vectors = np.memmap(
+            self._dir / VECTORS_FILENAME, dtype=np.float16, mode="w+",
+            shape=(self.disk_entries, dim)
+        )
+
+    def _read_index(self) -> Optional[Dict]:
+        paths = [self._dir / name for name in (INDEX_FILENAME, KEYS_FILENAME, VECTORS_FILENAME)]
+        if not all(path.exists() for path in paths):
+            return None
+        try:
+            index = json.loads(paths[0].read_text())
+            if index["model"] != self.model_name:
+                raise ValueError(f"index belongs to {index['model']}")
+            index.setdefault("written", index["next_slot"])
+            return index
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable embedding cache in {self._dir}: {e}")
+            return None
+
+    def _open_storage(self, index: Dict) -> bool:
+        capacity = index["capacity"]
+        try:
+            self._keys = np.memmap(
+                self._dir / KEYS_FILENAME, dtype=np.uint8, mode="r+",
+                shape=(capacity, KEY_BYTES)
+            )
+            self._vectors = np.memmap(
+                self._dir / VECTORS_FILENAME, dtype=np.float16, mode="r+",
+                shape=(capacity, index["dim"])
+            )
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable embedding cache in {self._dir}: {e}")
+            self._keys = self._vectors = None
+            return False
+        return True
+
+    def _write_index(self):
+        index = {
+            "model": self.model_name,
+            "dim": int(self._vectors.shape[1]),
+            "capacity": len(self._keys),
+            "next_slot": self._next_slot,
+            "written": self._written,
+        }
+        tmp_path = self._dir / f"{INDEX_FILENAME}.{os.getpid()}.tmp"
+        tmp_path.write_text(json.dumps(index))
+        os.replace(tmp_path, self._dir / INDEX_FILENAME)
+
+
+class EmbeddingBatcher:
+    """
+    Merge concurrent ``encode`` calls into larger encoder batches.
+
+    Callers block in ``encode`` while a background thread waits up to
+    ``flush_ms`` for more requests (or until ``max_batch_size`` texts are
+    pending), sorts the combined texts by token count so batches carry
+    little padding, runs one encode and hands each caller its rows.
+    """
+
+    def __init__(
+        self,
+        encode_fn: EncodeFn,
+        flush_ms: float = 5.0,
+        max_batch_size: int = 256
+    ):
+        self.encode_fn = encode_fn
+        self.flush_ms = flush_ms
+        self.max_batch_size = max_batch_size
+        self._pending: List[Tuple[List[str], Future]] = []
+        self._pending_texts = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.requests = 0
+        self.batches = 0
+        self.texts = 0
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Embeddings for ``texts``, possibly encoded alongside other callers'."""
+        future: Future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Embedding batcher is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._worker, name="embedding-batcher", daemon=True
+                )
+                self._thread.start()
+            self._pending.append((list(texts), future))
+            self._pending_texts += len(texts)
+            self._condition.notify()
+        return future.result()
+
+    def stats(self) -> Dict:
+        with self._condition:
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "texts": self.texts,
+                "mean_batch_size": self.texts / self.batches if self.batches else 0.0,
+                "flush_ms": self.flush_ms,
+                "max_batch_size": self.max_batch_size,
+            }
+
+    def close(self):
+        """Stop the worker after it finishes the requests already queued."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                # Give other callers one flush window to join the batch
+                deadline = time.monotonic() + self.flush_ms / 1000
+                while self._pending_texts < self.max_batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                requests = self._take_batch()
+            self._run_batch(requests)
+
+    def _take_batch(self) -> List[Tuple[List[str], Future]]:
+        """Pop whole requests up to ``max_batch_size`` texts (at least one)."""
+        taken = []
+        count = 0
+        while self._pending:
+            size = len(self._pending[0][0])
+            if taken and count + size > self.max_batch_size:
+                break
+            taken.append(self._pending.pop(0))
+            count += size
+        self._pending_texts -= count
+        self.requests += len(taken)
+        self.batches += 1
+        self.texts += count
+        return taken
+
+    def _run_batch(self, requests: List[Tuple[List[str], Future]]):
+        texts = [text for request_texts, _ in requests for text in request_texts]
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i].split()))
+        try:
+            encoded = np.asarray(self.encode_fn([texts[i] for i in order]))
+        except Exception as e:
+            for _, future in requests:
+                future.set_exception(e)
+            return
+
+        vectors = np.empty_like(encoded)
+        vectors[order] = encoded
+        offset = 0
+        for request_texts, future in requests:
+            future.set_result(vectors[offset:offset + len(request_texts)])
+            offset += len(request_texts)
+
+
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(model_name: str) -> EmbeddingCache:
+    """Process-wide cache for ``model_name``, configured from settings."""
+    with _caches_lock:
+        cache = _caches.get(model_name)
+        if cache is None:
+            cache = EmbeddingCache(
+                model_name,
+                cache_dir=settings.EMBEDDING_CACHE_DIR,
+                memory_entries=settings.EMBEDDING_CACHE_MEMORY_ENTRIES,
+                disk_entries=settings.EMBEDDING_CACHE_DISK_ENTRIES
+            )
+            _caches[model_name] = cache
+        return cache
+
+
+def embedding_cache_stats() -> List[Dict]:
+    """Stats of every embedding cache created in this process."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    return [cache.stats() for cache in caches]
+
+
+# (model, device, id of the encoder) -> batcher; the batcher keeps its encoder alive
+_batchers: Dict[Tuple[str, str, int], EmbeddingBatcher] = {}
+
+
+def get_embedding_batcher(model_name: str, device: str, encoder) -> EmbeddingBatcher:
+    """
+    Process-wide batcher for ``encoder``.
+
+    Keyed on the encoder object itself, so only callers holding the same
+    loaded model share batches; ``model_name`` and ``device`` label its stats.
+    """
+    key = (model_name, device, id(encoder))
+    with _caches_lock:
+        batcher = _batchers.get(key)
+        if batcher is None:
+            batcher = EmbeddingBatcher(
+                functools.partial(encoder.encode, show_progress_bar=False),
+                flush_ms=settings.EMBEDDING_BATCH_WINDOW_MS,
+                max_batch_size=settings.EMBEDDING_MAX_BATCH_SIZE
+            )
+            _batchers[key] = batcher
+        return batcher
+
+
+def embedding_batcher_stats() -> List[Dict]:
+    """Effective batch sizes of every embedding batcher in this process."""
+    with _caches_lock:
+        batchers = dict(_batchers)
+    return [
+        {"model": model, "device": device, **batcher.stats()}
+        for (model, device, _), batcher in batchers.items()
+    ]
@@ -0,0 +1,95 @@
+from pathlib import Path
+from typing import List
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ENCODER_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+ONNX_MODEL_FILENAMES = {"onnx": "model.onnx", "onnx-int8": "model_int8.onnx"}
+TOKENIZER_FILENAME = "tokenizer.json"
+
+
+def onnx_model_dirname(model_name: str) -> str:
+    """Directory under ``MODELS_DIR`` holding the exported ONNX encoder."""
+    return f"{model_name}-onnx"
+
+
+def mean_pool(hidden_states: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+    """
+    Average token embeddings over real tokens and L2-normalize the result.
+
+    Matches the Pooling (mean) + Normalize modules of sentence-transformers
+    models such as all-MiniLM-L6-v2.
+    """
+    mask = attention_mask[..., None].astype(hidden_states.dtype)
+    summed = (hidden_states * mask).sum(axis=1)
+    pooled = summed / np.maximum(mask.sum(axis=1), 1e-9)
+    return pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+
+
+class OnnxSentenceEncoder:
+    """
+    Sentence encoder running an exported transformer with ONNX Runtime.
+
+    Loads ``model.onnx`` (or the dynamically quantized ``model_int8.onnx``)
+    and ``tokenizer.json`` from a local directory written by
+    ``scripts/export_onnx_encoder.py``. Needs only onnxruntime and
+    tokenizers, so torch is never imported. ``encode`` mirrors the
+    ``SentenceTransformer.encode`` arguments the segmenter uses.
+    """
+
+    def __init__(
+        self,
+        model_dir: str,
+        quantized: bool = True,
+        max_length: int = 256,
+        num_threads: int = 0
+    ):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        model_dir = Path(model_dir)
+        filename = ONNX_MODEL_FILENAMES["onnx-int8" if quantized else "onnx"]
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        self.session = onnxruntime.InferenceSession(
+            str(model_dir / filename), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {node.name for node in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / TOKENIZER_FILENAME))
+        self.tokenizer.enable_truncation(max_length)
+        self.tokenizer.enable_padding()
+
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        show_progress_bar: bool = False
+    ) -> np.ndarray:
+        """Normalized sentence embeddings, one row per text."""
+        # Length-sorted batches keep padding small; rows are restored after
+        order = np.argsort([len(text) for text in texts], kind="stable")
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            batch = [texts[i] for i in order[start:start + batch_size]]
+            batches.append(self._encode_batch(batch))
+        if not batches:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        embeddings = np.empty_like(np.vstack(batches))
+        embeddings[order] = np.vstack(batches)
+        return embeddings
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        inputs = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        inputs = {name: value for name, value in inputs.items() if name in self.input_names}
+        hidden_states = self.session.run(None, inputs)[0]
+        return mean_pool(hidden_states, inputs["attention_mask"]).astype(np.float32)
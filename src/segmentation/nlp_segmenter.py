@@ -1,15 +1,44 @@
-from sentence_transformers import SentenceTransformer
-from sklearn.cluster import KMeans, DBSCAN
-from sklearn.metrics import silhouette_score
-from sklearn.decomposition import NMF
-from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
 import numpy as np
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import logging
-from src.transcription.whisper_asr import TranscriptSegment
+from src.model_registry import model_registry
+from config import settings
+from src.segmentation.clustering import changepoint_boundaries, window_similarity
+from src.segmentation.embeddings import get_embedding_batcher, get_embedding_cache
+from src.transcription.models import TranscriptSegment, segment_texts, segment_times
 
 logger = logging.getLogger(__name__)
 
+SEGMENTATION_METHODS = ("kmeans", "dbscan", "changepoint")
+
+
+def _silhouette_from_distances(distances: np.ndarray, labels: np.ndarray) -> float:
+    """
+    Mean silhouette coefficient from a precomputed distance matrix.
+
+    Equivalent to ``silhouette_score(distances, labels, metric="precomputed")``
+    but sums distances per cluster with a single matrix product.
+    """
+    _, labels = np.unique(labels, return_inverse=True)
+    n = len(labels)
+    rows = np.arange(n)
+    onehot = np.zeros((n, labels.max() + 1), dtype=distances.dtype)
+    onehot[rows, labels] = 1.0
+    counts = onehot.sum(axis=0)
+
+    cluster_sums = distances @ onehot
+    own_counts = counts[labels]
+    intra = cluster_sums[rows, labels] / np.maximum(own_counts - 1, 1)
+    mean_other = cluster_sums / counts
+    mean_other[rows, labels] = np.inf
+    nearest = mean_other.min(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = (nearest - intra) / np.maximum(intra, nearest)
+    scores[own_counts == 1] = 0.0  # singleton clusters score 0, as in sklearn
+    return float(np.mean(np.nan_to_num(scores)))
+
+
 class NLPSegmenter:
     """
     Segment transcript into chapters using NLP embeddings and clustering.
@@ -19,43 +48,100 @@ class NLPSegmenter:
         self,
         embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
         min_chapter_duration: int = 60,
-        max_chapters: int = 20
+        max_chapters: int = 20,
+        device: str = "cpu",
+        cluster_selection: str = "fast",
+        silhouette_sample_size: int = 2000,
+        use_embedding_cache: bool = True,
+        encoder_backend: Optional[str] = None
     ):
-        logger.info(f"Loading embedding model: {embedding_model}")
-        self.encoder = SentenceTransformer(embedding_model)
+        self.embedding_model = embedding_model
+        self.device = device
         self.min_chapter_duration = min_chapter_duration
         self.max_chapters = max_chapters
+        self.cluster_selection = cluster_selection
+        self.silhouette_sample_size = silhouette_sample_size
+        self.use_embedding_cache = use_embedding_cache
+        self._encoder_backend = encoder_backend
+
+    @property
+    def encoder_backend(self) -> str:
+        return self._encoder_backend or settings.EMBEDDING_BACKEND
+
+    @property
+    def encoder(self):
+        """
+        Shared sentence encoder, loaded on first use.
+
+        ``torch`` runs the sentence-transformers model; ``onnx`` and
+        ``onnx-int8`` run its ONNX export through ONNX Runtime on CPU.
+        """
+        return model_registry.get_encoder(self.embedding_model, self.encoder_backend, self.device)
 
     def generate_embeddings(
         self,
         segments: List[TranscriptSegment]
     ) -> np.ndarray:
-        """Generate sentence embeddings for all segments."""
-        texts = [seg.text for seg in segments]
-        embeddings = self.encoder.encode(texts, show_progress_bar=False)
+        """
+        Generate sentence embeddings for all segments.
+
+        With the embedding cache enabled, only texts this model has not
+        embedded before are sent to the encoder.
+        """
+        texts = segment_texts(segments)
+        if self.use_embedding_cache and settings.EMBEDDING_CACHE_ENABLED:
+            # Backends differ slightly, so each keeps its own vectors
+            cache = get_embedding_cache(f"{self.embedding_model}@{self.encoder_backend}")
+            embeddings = cache.encode(texts, self._encode)
+        else:
+            embeddings = self._encode(texts)
         logger.info(f"Generated embeddings: {embeddings.shape}")
         return embeddings
 
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts, batched with other jobs' texts when enabled."""
+        if settings.EMBEDDING_BATCH_WINDOW_MS > 0:
+            batcher = get_embedding_batcher(
+                f"{self.embedding_model}@{self.encoder_backend}", self.device, self.encoder
+            )
+            return batcher.encode(texts)
+        return self._encode_now(texts)
+
+    def _encode_now(self, texts: List[str]) -> np.ndarray:
+        return self.encoder.encode(texts, show_progress_bar=False)
+
     def cluster_segments(
         self,
         embeddings: np.ndarray,
         method: str = "kmeans",
-        n_clusters: int = None
+        n_clusters: int = None,
+        segments: List[TranscriptSegment] = None,
+        n_init: int = 10,
+        min_duration: Optional[float] = None
     ) -> np.ndarray:
         """
         Cluster embeddings to identify topic boundaries.
         Args:
             embeddings: Segment embeddings
-            method: 'kmeans' or 'dbscan'
+            method: 'kmeans', 'dbscan' or 'changepoint'
             n_clusters: Number of clusters (auto if None)
+            segments: Transcript segments (required for 'changepoint')
+            n_init: KMeans restarts for the final fit and the first k tried
+            min_duration: Shortest changepoint chapter (default: min_chapter_duration)
         Returns:
             Cluster labels for each segment
         """
-        if n_clusters is None:
-            n_clusters = self._determine_optimal_clusters(embeddings)
+        if method == "changepoint":
+            if segments is None:
+                raise ValueError("The changepoint method needs the transcript segments")
+            return self._changepoint_labels(embeddings, segments, n_clusters, min_duration)
+
+        from sklearn.cluster import KMeans, DBSCAN
 
         if method == "kmeans":
-            clusterer = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+            if n_clusters is None:
+                n_clusters = self._determine_optimal_clusters(embeddings, n_init)
+            clusterer = KMeans(n_clusters=n_clusters, random_state=42, n_init=n_init)
             labels = clusterer.fit_predict(embeddings)
         elif method == "dbscan":
             clusterer = DBSCAN(eps=0.5, min_samples=3, metric='cosine')
@@ -66,17 +152,104 @@ class NLPSegmenter:
         logger.info(f"Clustering: {len(set(labels))} clusters found")
         return labels
 
+    def _changepoint_labels(
+        self,
+        embeddings: np.ndarray,
+        segments: List[TranscriptSegment],
+        n_chapters: int = None,
+        min_duration: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Contiguous labels from ``changepoint_boundaries``.
+
+        Segments keep time order, so each label is one chapter and
+        ``identify_chapter_boundaries`` reproduces the chosen cuts.
+        """
+        starts, _ = segment_times(segments)
+        boundaries = changepoint_boundaries(
+            embeddings,
+            starts,
+            end_time=segments[-1].end if segments else 0.0,
+            min_duration=self.min_chapter_duration if min_duration is None else min_duration,
+            max_chapters=self.max_chapters,
+            n_chapters=n_chapters
+        )
+        labels = np.zeros(len(embeddings), dtype=np.int64)
+        labels[boundaries[1:]] = 1
+        labels = np.cumsum(labels)
+        logger.info(f"Changepoint segmentation: {len(boundaries)} chapters found")
+        return labels
+
     def _determine_optimal_clusters(
         self,
-        embeddings: np.ndarray
+        embeddings: np.ndarray,
+        n_init: int = 10
     ) -> int:
-        """Use silhouette analysis to find optimal cluster count."""
+        """
+        Use silhouette analysis to find optimal cluster count.
+
+        The fast engine computes pairwise distances once and reuses them
+        for every k (scoring is one matrix product per k), scores long
+        transcripts on a fixed random sample of
+        ``silhouette_sample_size`` segments, and warm-starts each KMeans
+        from the previous k's centres plus the farthest point, so only the
+        first k pays for ``n_init`` restarts.
+        """
+        if self.cluster_selection == "exhaustive":
+            return self._determine_optimal_clusters_exhaustive(embeddings, n_init)
+        if self.cluster_selection != "fast":
+            raise ValueError(f"Unknown cluster selection: {self.cluster_selection}")
+
+        from sklearn.cluster import KMeans
+        from sklearn.metrics import pairwise_distances
+
+        max_k = min(self.max_chapters, len(embeddings) // 3)
+        points = np.asarray(embeddings)
+        if len(points) > self.silhouette_sample_size:
+            rng = np.random.default_rng(42)
+            sample = np.sort(rng.choice(len(points), self.silhouette_sample_size, replace=False))
+            points = points[sample]
+        distances = pairwise_distances(points)
+
+        best_k = 3
+        best_score = -1
+        centers = None
+        for k in range(3, max_k + 1):
+            if centers is None:
+                kmeans = KMeans(n_clusters=k, random_state=42, n_init=n_init)
+            else:
+                # Seed the new centre at the point worst served by the old ones
+                nearest = pairwise_distances(points, centers).min(axis=1)
+                init = np.vstack([centers, points[np.argmax(nearest)]])
+                kmeans = KMeans(n_clusters=k, init=init, n_init=1, random_state=42)
+            labels = kmeans.fit_predict(points)
+            centers = kmeans.cluster_centers_
+            if len(set(labels)) < 2:
+                continue
+            score = _silhouette_from_distances(distances, labels)
+
+            if score > best_score:
+                best_score = score
+                best_k = k
+
+        logger.info(f"Optimal clusters: {best_k} (score: {best_score:.3f})")
+        return best_k
+
+    def _determine_optimal_clusters_exhaustive(
+        self,
+        embeddings: np.ndarray,
+        n_init: int = 10
+    ) -> int:
+        """Fit and score every k from scratch (reference implementation)."""
+        from sklearn.cluster import KMeans
+        from sklearn.metrics import silhouette_score
+
         max_k = min(self.max_chapters, len(embeddings) // 3)
         best_k = 3
         best_score = -1
 
         for k in range(3, max_k + 1):
-            kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
+            kmeans = KMeans(n_clusters=k, random_state=42, n_init=n_init)
             labels = kmeans.fit_predict(embeddings)
             score = silhouette_score(embeddings, labels)
 
@@ -90,58 +263,112 @@ class NLPSegmenter:
     def identify_chapter_boundaries(
         self,
         segments: List[TranscriptSegment],
-        labels: np.ndarray
+        labels: np.ndarray,
+        min_duration: Optional[float] = None
     ) -> List[int]:
         """
         Identify segment indices where topic changes occur.
+        Args:
+            min_duration: Shortest chapter (default: min_chapter_duration)
         Returns:
             List of boundary indices
         """
+        if min_duration is None:
+            min_duration = self.min_chapter_duration
         boundaries = [0]  # Always start at 0
+        starts, ends = segment_times(segments)
+        starts = starts.tolist()
+        labels = np.asarray(labels)
 
-        for i in range(1, len(labels)):
-            # Topic change detected
-            if labels[i] != labels[i - 1]:
-                # Check minimum duration constraint
-                if segments[i].start - segments[boundaries[-1]].start >= self.min_chapter_duration:
-                    boundaries.append(i)
+        # Only positions where the topic changes are candidates
+        for i in np.flatnonzero(labels[1:] != labels[:-1]) + 1:
+            # Check minimum duration constraint
+            if starts[i] - starts[boundaries[-1]] >= min_duration:
+                boundaries.append(int(i))
 
         # Merge very short final segment
         if len(boundaries) > 1:
-            last_duration = segments[-1].end - segments[boundaries[-1]].start
-            if last_duration < self.min_chapter_duration / 2:
+            last_duration = ends[-1] - starts[boundaries[-1]]
+            if last_duration < min_duration / 2:
                 boundaries.pop()
 
         logger.info(f"Identified {len(boundaries)} chapter boundaries")
         return boundaries
 
+    def provisional_boundaries(
+        self,
+        segments: List[TranscriptSegment],
+        embeddings: np.ndarray,
+        window: int = 3
+    ) -> List[int]:
+        """
+        Cheap boundaries for a partial transcript, used for live previews.
+
+        Compares the mean embedding of the ``window`` segments before and
+        after each position and cuts at local similarity minima more than one
+        standard deviation below the mean. Linear in the number of segments.
+        """
+        n = len(embeddings)
+        if n < 2 * window + 1:
+            return [0]
+
+        # Position p splits segments [p - window, p) from [p, p + window)
+        positions = np.arange(window, n - window + 1)
+        similarity = window_similarity(np.asarray(embeddings), window)[positions - 1]
+        padded = np.concatenate([[np.inf], similarity, [np.inf]])
+        is_dip = (
+            (similarity <= padded[:-2])
+            & (similarity <= padded[2:])
+            & (similarity < similarity.mean() - similarity.std())
+        )
+
+        boundaries = [0]
+        for pos in positions[is_dip]:
+            if segments[pos].start - segments[boundaries[-1]].start >= self.min_chapter_duration:
+                boundaries.append(int(pos))
+        return boundaries
+
+    def topic_features(self, segments: List[TranscriptSegment]) -> Tuple:
+        """
+        TF-IDF matrix and vocabulary of the segment texts for NMF.
+
+        Depends only on the transcript, so callers extracting topics
+        repeatedly (re-chaptering) can compute it once.
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        tfidf = TfidfVectorizer(
+            max_features=1000,
+            stop_words='english',
+            ngram_range=(1, 2)
+        )
+        tfidf_matrix = tfidf.fit_transform(segment_texts(segments))
+        return tfidf_matrix, tfidf.get_feature_names_out()
+
     def extract_topics_nmf(
         self,
         segments: List[TranscriptSegment],
         n_topics: int = 10,
-        n_words: int = 3
+        n_words: int = 3,
+        features: Optional[Tuple] = None
     ) -> List[str]:
         """
         Extract topics using NMF for chapter naming.
+        Args:
+            features: Precomputed ``topic_features(segments)``
         Returns:
             List of topic keywords for each topic
         """
-        texts = [seg.text for seg in segments]
+        from sklearn.decomposition import NMF
 
         # TF-IDF vectorization
-        tfidf = TfidfVectorizer(
-            max_features=1000,
-            stop_words='english',
-            ngram_range=(1, 2)
-        )
-        tfidf_matrix = tfidf.fit_transform(texts)
+        tfidf_matrix, feature_names = features or self.topic_features(segments)
 
         # NMF topic modeling
         nmf = NMF(n_components=n_topics, random_state=42)
         nmf.fit(tfidf_matrix)
 
         # Extract top words for each topic
-        feature_names = tfidf.get_feature_names_out()
         topics = []
         for topic_idx, topic in enumerate(nmf.components_):
             top_indices = topic.argsort()[-n_words:][::-1]
@@ -0,0 +1,191 @@
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+
+@dataclass
+class TranscriptSegment:
+    """Represents a transcript segment with timestamps."""
+    id: int
+    start: float
+    end: float
+    text: str
+    confidence: float = None
+
+
+class SegmentView:
+    """
+    One segment of a ``TranscriptStore``, read on access.
+
+    Has the same attributes as ``TranscriptSegment``, so exporters and
+    other code that reads ``seg.start`` or ``seg.text`` accept either.
+    """
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: "TranscriptStore", index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def id(self) -> int:
+        return int(self._store.ids[self._index])
+
+    @property
+    def start(self) -> float:
+        return float(self._store.start[self._index])
+
+    @property
+    def end(self) -> float:
+        return float(self._store.end[self._index])
+
+    @property
+    def text(self) -> str:
+        return self._store.text(self._index)
+
+    @property
+    def confidence(self) -> Optional[float]:
+        value = float(self._store.confidence[self._index])
+        return None if np.isnan(value) else value
+
+    def to_segment(self) -> TranscriptSegment:
+        return TranscriptSegment(self.id, self.start, self.end, self.text, self.confidence)
+
+    def __repr__(self) -> str:
+        return f"SegmentView(id={self.id}, start={self.start}, end={self.end}, text={self.text!r})"
+
+
+class TranscriptStore:
+    """
+    Columnar transcript: contiguous NumPy arrays instead of segment objects.
+
+    ``start``, ``end`` and ``confidence`` (NaN when unknown) are float64
+    arrays; all texts live in one UTF-8 buffer addressed by
+    ``text_offsets``, where segment ``i`` is
+    ``text_data[text_offsets[i]:text_offsets[i + 1]]``.
+
+    Slicing by index (``store[a:b]``) or by time (``time_slice``) returns a
+    store that shares the parent's arrays and text buffer, so it costs
+    O(1) regardless of length. Indexing or iterating yields ``SegmentView``
+    objects that behave like ``TranscriptSegment``.
+    """
+    __slots__ = ("ids", "start", "end", "confidence", "text_offsets", "text_data")
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        start: np.ndarray,
+        end: np.ndarray,
+        confidence: np.ndarray,
+        text_offsets: np.ndarray,
+        text_data: np.ndarray
+    ):
+        self.ids = ids
+        self.start = start
+        self.end = end
+        self.confidence = confidence
+        self.text_offsets = text_offsets
+        self.text_data = text_data
+
+    @classmethod
+    def from_segments(cls, segments: Sequence) -> "TranscriptStore":
+        """Build a store from ``TranscriptSegment``-like objects."""
+        if isinstance(segments, TranscriptStore):
+            return segments
+        encoded = [seg.text.encode("utf-8") for seg in segments]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        confidence = [getattr(seg, "confidence", None) for seg in segments]
+        return cls(
+            ids=np.array([getattr(seg, "id", i) for i, seg in enumerate(segments)], dtype=np.int64),
+            start=np.array([seg.start for seg in segments], dtype=np.float64),
+            end=np.array([seg.end for seg in segments], dtype=np.float64),
+            confidence=np.array([np.nan if c is None else c for c in confidence], dtype=np.float64),
+            text_offsets=offsets,
+            text_data=np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        )
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[SegmentView, "TranscriptStore"]:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                raise ValueError("TranscriptStore slices must be contiguous")
+            stop = max(start, stop)
+            return TranscriptStore(
+                self.ids[start:stop],
+                self.start[start:stop],
+                self.end[start:stop],
+                self.confidence[start:stop],
+                self.text_offsets[start:stop + 1],
+                self.text_data,
+            )
+        index = int(key)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TranscriptStore index out of range")
+        return SegmentView(self, index)
+
+    def __iter__(self) -> Iterator[SegmentView]:
+        return (SegmentView(self, i) for i in range(len(self)))
+
+    def text(self, index: int) -> str:
+        begin, end = self.text_offsets[index], self.text_offsets[index + 1]
+        return self.text_data[begin:end].tobytes().decode("utf-8")
+
+    def texts(self) -> List[str]:
+        """
+        Every segment's text, from a single decode of the covered buffer.
+
+        Byte offsets are mapped to character offsets by counting UTF-8
+        lead bytes, so each text is a plain ``str`` slice.
+        """
+        data = self.text_data[self.text_offsets[0]:self.text_offsets[-1]]
+        offsets = self.text_offsets - self.text_offsets[0]
+        if data.size and data.max() >= 0x80:
+            # Continuation bytes look like 0b10xxxxxx
+            lead = np.concatenate([[0], np.cumsum((data & 0xC0) != 0x80)])
+            offsets = lead[offsets]
+        offsets = offsets.tolist()
+        decoded = data.tobytes().decode("utf-8")
+        return [decoded[offsets[i]:offsets[i + 1]] for i in range(len(self))]
+
+    def time_slice(self, start_time: float, end_time: float) -> "TranscriptStore":
+        """
+        Segments overlapping ``[start_time, end_time)``, without copying.
+
+        Assumes segments are in time order and do not overlap each other.
+        """
+        first = int(np.searchsorted(self.end, start_time, side="right"))
+        last = int(np.searchsorted(self.start, end_time, side="left"))
+        return self[first:last]
+
+    def to_segments(self) -> List[TranscriptSegment]:
+        return [view.to_segment() for view in self]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by this store's arrays (a slice counts the shared buffer)."""
+        return sum(
+            array.nbytes for array in
+            (self.ids, self.start, self.end, self.confidence, self.text_offsets, self.text_data)
+        )
+
+
+def segment_texts(segments: Sequence) -> List[str]:
+    """Texts of a ``TranscriptStore`` or a list of segments."""
+    if isinstance(segments, TranscriptStore):
+        return segments.texts()
+    return [seg.text for seg in segments]
+
+
+def segment_times(segments: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+    """(start, end) arrays; a store's own arrays are returned without copying."""
+    if isinstance(segments, TranscriptStore):
+        return segments.start, segments.end
+    return (
+        np.array([seg.start for seg in segments], dtype=np.float64),
+        np.array([seg.end for seg in segments], dtype=np.float64),
+    )
@@ -1,18 +1,26 @@
-from faster_whisper import WhisperModel
-from typing import List, Dict, Tuple
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import List, Dict, Iterator, Optional, Tuple, Union
 import logging
+import multiprocessing
+import os
+import threading
+import time
+import numpy as np
+from src.audio_extraction.utils import find_split_points
+from src.model_registry import model_registry
+from src.transcription.models import TranscriptSegment
 
 logger = logging.getLogger(__name__)
 
-@dataclass
-class TranscriptSegment:
-    """Represents a transcript segment with timestamps."""
-    id: int
-    start: float
-    end: float
-    text: str
-    confidence: float = None
+SAMPLE_RATE = 16000
+VAD_PARAMETERS = {
+    "threshold": 0.5,
+    "min_speech_duration_ms": 250,
+}
+
+# Row produced by a chunk worker: (start, end, text, avg_logprob)
+ChunkRow = Tuple[float, float, str, Optional[float]]
 
 class WhisperTranscriber:
     """
@@ -22,55 +30,252 @@ class WhisperTranscriber:
         self,
         model_size: str = "base",
         device: str = "cpu",
-        compute_type: str = "int8"
+        compute_type: str = "int8",
+        num_workers: int = 1,
+        max_chunk_seconds: float = 600.0
     ):
-        logger.info(f"Loading Whisper {model_size} model...")
-        self.model = WhisperModel(
-            model_size,
-            device=device,
-            compute_type=compute_type
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.num_workers = num_workers
+        self.max_chunk_seconds = max_chunk_seconds
+        # One chunk pool at a time, for the model size it was started with
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_model: Optional[str] = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def model(self):
+        """Shared Whisper model, loaded on first use."""
+        return self.get_model()
+
+    def get_model(self, model_size: Optional[str] = None):
+        """Shared Whisper model of ``model_size`` (default: the configured size)."""
+        return model_registry.get_whisper(
+            model_size or self.model_size, self.device, self.compute_type
         )
 
     def transcribe(
         self,
-        audio_path: str,
+        audio: Union[str, np.ndarray],
         language: str = "en",
         beam_size: int = 5,
-        word_timestamps: bool = True
+        word_timestamps: bool = True,
+        model_size: Optional[str] = None
     ) -> Tuple[List[TranscriptSegment], Dict]:
         """
         Transcribe audio with word-level timestamps.
 
+        ``audio`` is a file path or 16 kHz mono float32 samples. Uses
+        ``transcribe_parallel`` when the transcriber was created with more
+        than one worker. ``model_size`` overrides the configured Whisper
+        model for this call.
+
         Returns:
             Tuple of (segments, metadata)
         """
-        segments, info = self.model.transcribe(
-            audio_path,
+        if self.num_workers > 1:
+            return self.transcribe_parallel(
+                audio,
+                language=language,
+                beam_size=beam_size,
+                word_timestamps=word_timestamps,
+                model_size=model_size
+            )
+
+        segments, metadata = self.transcribe_stream(
+            audio,
+            language=language,
+            beam_size=beam_size,
+            word_timestamps=word_timestamps,
+            model_size=model_size
+        )
+        transcript_segments = list(segments)
+        metadata["total_segments"] = len(transcript_segments)
+        logger.info(f"Transcribed: {len(transcript_segments)} segments")
+        return transcript_segments, metadata
+
+    def transcribe_stream(
+        self,
+        audio: Union[str, np.ndarray],
+        language: str = "en",
+        beam_size: int = 5,
+        word_timestamps: bool = True,
+        model_size: Optional[str] = None
+    ) -> Tuple[Iterator[TranscriptSegment], Dict]:
+        """
+        Transcribe audio lazily, yielding segments as they are decoded.
+
+        Decoding only advances while the iterator is consumed. Metadata is
+        known up front, except ``total_segments``, which the caller fills in.
+
+        Returns:
+            Tuple of (segment iterator, metadata)
+        """
+        segments, info = self.get_model(model_size).transcribe(
+            audio,
             language=language,
             beam_size=beam_size,
             word_timestamps=word_timestamps,
             vad_filter=True,  # Voice Activity Detection
-            vad_parameters={
-                "threshold": 0.5,
-                "min_speech_duration_ms": 250,
-            }
+            vad_parameters=VAD_PARAMETERS
         )
 
-        transcript_segments = []
+        metadata = {
+            "language": info.language,
+            "language_probability": info.language_probability,
+            "duration": info.duration,
+        }
+        return self._to_transcript_segments(segments), metadata
+
+    def transcribe_parallel(
+        self,
+        audio: Union[str, np.ndarray],
+        language: str = "en",
+        beam_size: int = 5,
+        word_timestamps: bool = True,
+        model_size: Optional[str] = None
+    ) -> Tuple[List[TranscriptSegment], Dict]:
+        """
+        Transcribe long audio as silence-aligned chunks across CPU cores.
+
+        The audio is cut at low-energy points into chunks of at most
+        ``max_chunk_seconds``. Chunks are decoded in a process pool with one
+        int8 model per worker, then timestamps are offset and segment ids
+        renumbered into a single ordered transcript.
+
+        Returns:
+            Tuple of (segments, metadata); metadata includes wall time and
+            real-time factor for comparison with ``transcribe``
+        """
+        started = time.perf_counter()
+        if isinstance(audio, str):
+            from faster_whisper import decode_audio
+            audio = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+        duration = len(audio) / SAMPLE_RATE
+
+        cuts = [0] + find_split_points(audio, SAMPLE_RATE, self.max_chunk_seconds) + [len(audio)]
+        chunks = list(zip(cuts[:-1], cuts[1:]))
+        logger.info(f"Transcribing {duration:.0f}s of audio as {len(chunks)} chunks "
+                    f"on {self.num_workers} workers")
+
+        # Submit under the lock, so another job switching models cannot shut
+        # the pool down between our submits
+        with self._pool_lock:
+            pool = self._get_pool(model_size or self.model_size)
+            futures = [
+                pool.submit(
+                    _transcribe_chunk,
+                    audio[start:end],
+                    start / SAMPLE_RATE,
+                    language,
+                    beam_size,
+                    word_timestamps
+                )
+                for start, end in chunks
+            ]
+        results = [future.result() for future in futures]
+
+        transcript_segments = self._merge_chunk_rows([rows for rows, _ in results])
+        wall_time = time.perf_counter() - started
+        detected_language, language_probability = results[0][1] if results else (language, None)
+
+        metadata = {
+            "language": detected_language,
+            "language_probability": language_probability,
+            "duration": duration,
+            "total_segments": len(transcript_segments),
+            "chunks": len(chunks),
+            "workers": self.num_workers,
+            "wall_time": wall_time,
+            "realtime_factor": duration / wall_time if wall_time > 0 else None,
+        }
+        logger.info(f"Transcribed: {len(transcript_segments)} segments in {wall_time:.1f}s "
+                    f"({metadata['realtime_factor']:.1f}x real time)")
+        return transcript_segments, metadata
+
+    def close(self):
+        """Shut down the chunk worker pool, if one was started."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+            self._pool = self._pool_model = None
+
+    def _get_pool(self, model_size: str) -> ProcessPoolExecutor:
+        """
+        The chunk worker pool for ``model_size`` (caller holds ``_pool_lock``).
+
+        Workers keep their model loaded, so at most ``num_workers`` Whisper
+        models are resident: asking for another model size replaces the
+        pool. Chunks already submitted to the old pool still finish.
+        """
+        if self._pool is not None and self._pool_model != model_size:
+            logger.info(f"Replacing the {self._pool_model} chunk pool with {model_size}")
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        if self._pool is None:
+            cpu_threads = max(1, (os.cpu_count() or 1) // self.num_workers)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_chunk_worker,
+                initargs=(model_size, self.device, self.compute_type, cpu_threads)
+            )
+            self._pool_model = model_size
+        return self._pool
+
+    @staticmethod
+    def _merge_chunk_rows(chunk_rows: List[List[ChunkRow]]) -> List[TranscriptSegment]:
+        """Stitch per-chunk rows, already offset to absolute time, into one list."""
+        return [
+            TranscriptSegment(id=i, start=start, end=end, text=text, confidence=confidence)
+            for i, (start, end, text, confidence) in enumerate(chain.from_iterable(chunk_rows))
+        ]
+
+    @staticmethod
+    def _to_transcript_segments(segments) -> Iterator[TranscriptSegment]:
         for i, segment in enumerate(segments):
-            transcript_segments.append(TranscriptSegment(
+            yield TranscriptSegment(
                 id=i,
                 start=segment.start,
                 end=segment.end,
                 text=segment.text.strip(),
                 confidence=getattr(segment, 'avg_logprob', None)
-            ))
+            )
 
-        metadata = {
-            "language": info.language,
-            "language_probability": info.language_probability,
-            "duration": info.duration,
-            "total_segments": len(transcript_segments)
-        }
-        logger.info(f"Transcribed: {len(transcript_segments)} segments")
-        return transcript_segments, metadata
\ No newline at end of file
+
+# Chunk worker process state: one model per worker, loaded by the initializer
+_worker_model = None
+
+
+def _init_chunk_worker(model_size: str, device: str, compute_type: str, cpu_threads: int):
+    global _worker_model
+    _worker_model = model_registry.get_whisper(model_size, device, compute_type, cpu_threads)
+
+
+def _transcribe_chunk(
+    audio: np.ndarray,
+    offset: float,
+    language: str,
+    beam_size: int,
+    word_timestamps: bool
+) -> Tuple[List[ChunkRow], Tuple[str, float]]:
+    """Transcribe one chunk; timestamps are shifted by the chunk's offset."""
+    segments, info = _worker_model.transcribe(
+        audio,
+        language=language,
+        beam_size=beam_size,
+        word_timestamps=word_timestamps,
+        vad_filter=True,
+        vad_parameters=VAD_PARAMETERS
+    )
+    rows = [
+        (
+            segment.start + offset,
+            segment.end + offset,
+            segment.text.strip(),
+            getattr(segment, 'avg_logprob', None)
+        )
+        for segment in segments
+    ]
+    return rows, (info.language, info.language_probability)
@@ -0,0 +1,175 @@
+"""
+In-memory stand-in for the subset of redis-py the job queue uses.
+
+Strings, lists and sorted sets with expiry, and pipelines with
+WATCH/MULTI/EXEC: a transaction fails with ``WatchError`` if a watched key
+was written after it was watched. Values are ``str``, as with
+``decode_responses=True``.
+"""
+import threading
+import time
+from src.api.redis_queue import WatchError
+
+
+class FakeRedis:
+    def __init__(self):
+        self._data = {}
+        self._expires = {}
+        self._versions = {}
+        self._lock = threading.RLock()
+
+    # Internals
+
+    def _live(self, name):
+        expires = self._expires.get(name)
+        if expires is not None and expires <= time.time():
+            self._data.pop(name, None)
+            self._expires.pop(name, None)
+        return self._data.get(name)
+
+    def _touch(self, name):
+        self._versions[name] = self._versions.get(name, 0) + 1
+
+    # Keys
+
+    def delete(self, *names):
+        with self._lock:
+            removed = 0
+            for name in names:
+                if self._live(name) is not None:
+                    removed += 1
+                self._data.pop(name, None)
+                self._expires.pop(name, None)
+                self._touch(name)
+            return removed
+
+    def expire(self, name, seconds):
+        with self._lock:
+            if self._live(name) is None:
+                return False
+            self._expires[name] = time.time() + seconds
+            return True
+
+    # Strings
+
+    def get(self, name):
+        with self._lock:
+            return self._live(name)
+
+    def set(self, name, value, ex=None):
+        with self._lock:
+            self._data[name] = str(value)
+            self._expires.pop(name, None)
+            if ex is not None:
+                self._expires[name] = time.time() + ex
+            self._touch(name)
+            return True
+
+    # Lists
+
+    def rpush(self, name, *values):
+        with self._lock:
+            items = self._live(name)
+            if items is None:
+                items = self._data[name] = []
+            items.extend(str(v) for v in values)
+            self._touch(name)
+            return len(items)
+
+    def lrange(self, name, start, end):
+        with self._lock:
+            items = self._live(name) or []
+            end = len(items) if end == -1 else end + 1
+            return list(items[start:end])
+
+    # Sorted sets
+
+    def zadd(self, name, mapping, xx=False):
+        with self._lock:
+            scores = self._live(name)
+            if scores is None:
+                scores = self._data[name] = {}
+            added = 0
+            for member, score in mapping.items():
+                if xx and member not in scores:
+                    continue
+                added += member not in scores
+                scores[member] = float(score)
+            self._touch(name)
+            return added
+
+    def zrem(self, name, *members):
+        with self._lock:
+            scores = self._live(name) or {}
+            removed = sum(scores.pop(m, None) is not None for m in members)
+            self._touch(name)
+            return removed
+
+    def zscore(self, name, member):
+        with self._lock:
+            return (self._live(name) or {}).get(member)
+
+    def zrangebyscore(self, name, min, max, start=None, num=None):
+        with self._lock:
+            low, high = float(min), float(max)
+            members = sorted(
+                ((score, member) for member, score in (self._live(name) or {}).items()
+                 if low <= score <= high)
+            )
+            members = [member for _, member in members]
+            if start is not None:
+                members = members[start:start + num]
+            return members
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Commands run at once until ``multi()``, then queue until ``execute()``."""
+
+    def __init__(self, client: FakeRedis):
+        self._client = client
+        self._watched = {}
+        self._queued = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.reset()
+
+    def watch(self, *names):
+        with self._client._lock:
+            for name in names:
+                self._watched[name] = self._client._versions.get(name, 0)
+
+    def multi(self):
+        self._queued = []
+
+    def reset(self):
+        self._watched = {}
+        self._queued = None
+
+    def execute(self):
+        with self._client._lock:
+            changed = any(
+                self._client._versions.get(name, 0) != version
+                for name, version in self._watched.items()
+            )
+            queued, self._queued = self._queued or [], None
+            self._watched = {}
+            if changed:
+                raise WatchError("Watched variable changed.")
+            return [getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in queued]
+
+    def __getattr__(self, name):
+        command = getattr(self._client, name)
+
+        def call(*args, **kwargs):
+            if self._queued is None:
+                return command(*args, **kwargs)
+            self._queued.append((name, args, kwargs))
+            return self
+
+        return call
@@ -0,0 +1,211 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from config import settings
+from src.api import main
+from src.api.cache import ResultCache
+from src.api.main import app
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "INPUT_DIR", tmp_path / "input")
+    monkeypatch.setattr(settings, "OUTPUT_DIR", tmp_path / "output")
+    monkeypatch.setattr(settings, "THROUGHPUT_FILE", tmp_path / "throughput.json")
+    monkeypatch.setattr(main, "result_cache", ResultCache(max_entries=4))
+    return TestClient(app)
+
+
+def wait_for_job(client, job_id, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = client.get(f"/jobs/{job_id}").json()
+        if status["status"] in ("done", "failed"):
+            return status
+        time.sleep(0.05)
+    raise TimeoutError(f"Job {job_id} did not finish")
+
+
+def test_generate_chapters_returns_job_id(client):
+    response = client.post(
+        "/generate-chapters",
+        files={"video": ("clip.mp4", b"fake video bytes", "video/mp4")}
+    )
+    assert response.status_code == 202
+    body = response.json()
+    assert body["status"] in ("queued", "running", "done")
+
+    status = wait_for_job(client, body["job_id"])
+    assert status["status"] == "done"
+    assert status["result"]["chapters_count"] == 2
+    assert set(status["result"]["outputs"]) == {"youtube", "json", "srt"}
+
+
+def test_generate_chapters_writes_every_engine_format(client):
+    response = client.post(
+        "/generate-chapters",
+        files={"video": ("formats.mp4", b"all formats video", "video/mp4")},
+        data={"export_formats": ["youtube", "json", "edl", "srt", "vtt"]}
+    )
+    status = wait_for_job(client, response.json()["job_id"])
+    assert set(status["result"]["outputs"]) == {"youtube", "json", "edl", "srt", "vtt"}
+    assert status["result"]["timings"]["export_vtt"]["items"] == 3
+
+
+def test_unknown_job_returns_404(client):
+    assert client.get("/jobs/does-not-exist").status_code == 404
+
+
+def test_generate_chapters_from_path(client, tmp_path, monkeypatch):
+    video_root = tmp_path / "shared"
+    video_root.mkdir()
+    (video_root / "lecture.mp4").write_bytes(b"fake video bytes")
+    monkeypatch.setattr(settings, "VIDEO_INPUT_ROOTS", [video_root])
+
+    response = client.post("/generate-chapters/from-path", json={"video_path": "lecture.mp4"})
+    assert response.status_code == 202
+
+    status = wait_for_job(client, response.json()["job_id"])
+    assert status["status"] == "done"
+    # Processed in place: nothing copied into the upload directory
+    assert not settings.INPUT_DIR.exists()
+
+
+def test_generate_chapters_from_path_rejects_outside_root(client, tmp_path, monkeypatch):
+    video_root = tmp_path / "shared"
+    video_root.mkdir()
+    (tmp_path / "secret.mp4").write_bytes(b"fake video bytes")
+    monkeypatch.setattr(settings, "VIDEO_INPUT_ROOTS", [video_root])
+
+    response = client.post("/generate-chapters/from-path", json={"video_path": "../secret.mp4"})
+    assert response.status_code == 403
+
+    response = client.post("/generate-chapters/from-path", json={"video_path": "missing.mp4"})
+    assert response.status_code == 404
+
+
+def test_resubmission_is_served_from_cache(client):
+    upload = {"video": ("clip.mp4", b"same video bytes", "video/mp4")}
+    first = client.post("/generate-chapters", files=upload).json()
+    assert wait_for_job(client, first["job_id"])["status"] == "done"
+
+    response = client.post("/generate-chapters", files=upload)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["cached"] is True
+    assert body["job_id"] == first["job_id"]
+
+    # Different parameters miss the cache
+    response = client.post("/generate-chapters", files=upload, data={"language": "de"})
+    assert response.status_code == 202
+    wait_for_job(client, response.json()["job_id"])
+
+    stats = client.get("/cache/stats").json()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_result_cache_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.put(key, {"job_id": key, "outputs": {}})
+    assert cache.get("a") is not None
+    cache.put("c", {"job_id": "c", "outputs": {}})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_job_events_stream_until_done(client):
+    response = client.post(
+        "/generate-chapters",
+        files={"video": ("clip.mp4", b"streamed video bytes", "video/mp4")}
+    )
+    job_id = response.json()["job_id"]
+
+    with client.stream("GET", f"/jobs/{job_id}/events") as stream:
+        assert stream.headers["content-type"].startswith("text/event-stream")
+        body = "".join(stream.iter_text())
+
+    event_types = [
+        line.split(": ", 1)[1] for line in body.splitlines() if line.startswith("event: ")
+    ]
+    assert "stage" in event_types
+    assert event_types[-1] == "done"
+
+
+def test_metrics_endpoint_reports_stage_histograms(client):
+    response = client.post(
+        "/generate-chapters",
+        files={"video": ("metrics.mp4", b"metrics video", "video/mp4")}
+    )
+    wait_for_job(client, response.json()["job_id"])
+
+    metrics = client.get("/metrics")
+    assert metrics.status_code == 200
+    assert "text/plain" in metrics.headers["content-type"]
+    assert 'chapter_stage_wall_seconds_count{stage="transcription"}' in metrics.text
+
+
+def test_rechapter_reuses_transcript_and_replaces_result(client):
+    upload = {"video": ("rechapter.mp4", b"rechapter video", "video/mp4")}
+    first = client.post("/generate-chapters", files=upload).json()
+    assert wait_for_job(client, first["job_id"])["status"] == "done"
+
+    response = client.post(
+        f"/jobs/{first['job_id']}/rechapter",
+        json={"min_chapter_duration": 30, "n_chapters": 3, "segmentation_method": "changepoint"}
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["chapters_count"] == 2
+    assert set(result["outputs"]) == {"youtube", "json", "srt"}
+    assert "transcription" not in result["timings"]
+    assert "rechapter" in result["timings"]
+    assert client.get(f"/jobs/{first['job_id']}").json()["result"]["timings"] == result["timings"]
+    # The job's files changed, so its cached result is dropped
+    again = client.post("/generate-chapters", files=upload)
+    assert again.status_code == 202
+    # Let it finish while the fixture's data directories are still in place
+    wait_for_job(client, again.json()["job_id"])
+
+    response = client.post(f"/jobs/{first['job_id']}/rechapter", json={"segmentation_method": "lda"})
+    assert response.status_code == 400
+    assert client.post("/jobs/missing/rechapter", json={}).status_code == 404
+
+
+def test_rechapter_needs_a_transcript(client):
+    upload = {"video": ("outline.mp4", b"outline video", "video/mp4")}
+    job = client.post("/generate-chapters", files=upload, data={"mode": "fast"}).json()
+    assert wait_for_job(client, job["job_id"])["status"] == "done"
+
+    response = client.post(f"/jobs/{job['job_id']}/rechapter", json={})
+    assert response.status_code == 409
+
+
+def test_rechapter_lock_is_per_job():
+    with main.rechapter_lock("job-a"):
+        # Another job is not blocked; the same job is
+        with main.rechapter_lock("job-b"):
+            pass
+        assert main._rechapter_locks["job-a"][0].locked()
+        assert "job-b" not in main._rechapter_locks
+    assert main._rechapter_locks == {}
+
+
+def test_rechapter_stores_its_result_while_holding_the_job_lock(client, monkeypatch):
+    upload = {"video": ("locked.mp4", b"locked video", "video/mp4")}
+    job = client.post("/generate-chapters", files=upload).json()
+    assert wait_for_job(client, job["job_id"])["status"] == "done"
+
+    held = []
+    update_result = main.job_manager.update_result
+
+    def checked_update(job_id, result):
+        held.append(main._rechapter_locks[job_id][0].locked())
+        return update_result(job_id, result)
+
+    monkeypatch.setattr(main.job_manager, "update_result", checked_update)
+    assert client.post(f"/jobs/{job['job_id']}/rechapter", json={}).status_code == 200
+    assert held == [True]
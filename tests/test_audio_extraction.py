@@ -0,0 +1,82 @@
+import subprocess
+import sys
+import numpy as np
+import pytest
+from src.audio_extraction.extractor import AudioExtractor
+from src.audio_extraction.utils import find_pauses, find_split_points, frame_rms, select_cut_points
+
+
+def make_speech_with_pauses(sample_rate, speech_seconds, pause_seconds, repeats):
+    rng = np.random.default_rng(0)
+    speech = int(speech_seconds * sample_rate)
+    pause = int(pause_seconds * sample_rate)
+    pieces = []
+    for _ in range(repeats):
+        pieces.append(rng.uniform(-0.5, 0.5, speech).astype(np.float32))
+        pieces.append(np.zeros(pause, dtype=np.float32))
+    return np.concatenate(pieces)
+
+
+def test_frame_rms_matches_loop():
+    audio = np.random.default_rng(1).normal(size=1000).astype(np.float32)
+    rms = frame_rms(audio, frame_length=100, hop_length=50)
+    expected = [np.sqrt(np.mean(audio[i:i + 100] ** 2)) for i in range(0, 901, 50)]
+    np.testing.assert_allclose(rms, expected, rtol=1e-5)
+
+
+def test_split_points_fall_in_pauses_and_bound_chunk_length():
+    sample_rate = 1000
+    # 9s of speech followed by 1s of silence, ten times
+    audio = make_speech_with_pauses(sample_rate, 9.0, 1.0, 10)
+
+    splits = find_split_points(audio, sample_rate, max_chunk_seconds=25.0, search_seconds=8.0)
+
+    bounds = [0] + splits + [len(audio)]
+    assert all(b - a <= 25 * sample_rate for a, b in zip(bounds[:-1], bounds[1:]))
+    for cut in splits:
+        assert audio[cut] == 0.0
+
+
+def test_read_pipe_collects_all_samples_past_the_expected_size():
+    expected = np.arange(300000, dtype=np.float32)
+    script = (
+        "import sys, numpy; "
+        "sys.stdout.buffer.write(numpy.arange(300000, dtype=numpy.float32).tobytes())"
+    )
+    samples = AudioExtractor._read_pipe([sys.executable, "-c", script], np.float32, 1000)
+    np.testing.assert_array_equal(samples, expected)
+
+
+def test_read_pipe_drains_stderr_while_reading_stdout():
+    # More than a pipe buffer of errors before any samples, as on a corrupt input
+    script = (
+        "import sys, numpy; "
+        "sys.stderr.write('corrupt frame\\n' * 100000); sys.stderr.flush(); "
+        "sys.stdout.buffer.write(numpy.ones(10, dtype=numpy.float32).tobytes())"
+    )
+    samples = AudioExtractor._read_pipe([sys.executable, "-c", script], np.float32, 10)
+    np.testing.assert_array_equal(samples, np.ones(10, dtype=np.float32))
+
+
+def test_read_pipe_raises_on_failure():
+    with pytest.raises(subprocess.CalledProcessError):
+        AudioExtractor._read_pipe([sys.executable, "-c", "raise SystemExit(3)"], np.float32, 10)
+
+
+def test_find_pauses_reports_long_quiet_runs_only():
+    sample_rate = 1000
+    audio = make_speech_with_pauses(sample_rate, 9.0, 1.5, 3)
+    audio[4000:4300] = 0.0  # 0.3s gap, too short to count
+
+    pauses = find_pauses(audio, sample_rate, min_pause_seconds=1.0)
+
+    assert len(pauses) == 3
+    for (start, end), expected_start in zip(pauses, (9.0, 19.5, 30.0)):
+        assert abs(start - expected_start) < 0.05
+        assert abs(end - start - 1.5) < 0.05
+
+
+def test_select_cut_points_prefers_long_pauses_with_spacing():
+    candidates = [(100.0, 1.0), (110.0, 3.0), (300.0, 2.0), (590.0, 5.0)]
+    assert select_cut_points(candidates, duration=600.0, min_gap=60.0, max_cuts=5) == [110.0, 300.0]
+    assert select_cut_points(candidates, duration=600.0, min_gap=60.0, max_cuts=1) == [110.0]
@@ -0,0 +1,114 @@
+import json
+import os
+import pytest
+from config import settings
+from src.pipeline.batch import (
+    BatchJournal, build_pipeline, discover_videos, job_id_for, run_batch
+)
+
+
+class StubPipeline:
+    """Chapters every video in no time; videos named ``broken*`` fail."""
+
+    def run(self, job_id, video_path, filename, **options):
+        if filename.startswith("broken"):
+            raise RuntimeError("corrupt video")
+        return {
+            "duration": 1800.0,
+            "chapters_count": 4,
+            "outputs": {"youtube": f"{job_id}/chapters_youtube.txt"},
+        }
+
+
+def make_stub_pipeline():
+    return StubPipeline()
+
+
+def make_videos(root, names):
+    paths = []
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"\0" * 16)
+        paths.append(path)
+    return paths
+
+
+def test_discover_videos_from_directories_globs_and_lists(tmp_path):
+    a, b, c = make_videos(tmp_path, ["lectures/a.mp4", "lectures/nested/b.MKV", "other/c.mov"])
+    (tmp_path / "lectures" / "notes.txt").write_text("not a video")
+    (tmp_path / "list.txt").write_text("# backfill\nother/c.mov\n\nlectures/a.mp4\n")
+    (tmp_path / "list.jsonl").write_text(json.dumps({"path": str(b)}) + "\n")
+
+    assert discover_videos([str(tmp_path / "lectures")]) == [a.resolve(), b.resolve()]
+    assert discover_videos([str(tmp_path / "**" / "*.mov")]) == [c.resolve()]
+    # Lists resolve relative paths against their own directory; duplicates are dropped
+    videos = discover_videos([str(tmp_path / "list.txt"), str(tmp_path / "list.jsonl"), str(a)])
+    assert videos == [c.resolve(), a.resolve(), b.resolve()]
+    with pytest.raises(FileNotFoundError):
+        discover_videos([str(tmp_path / "missing.mp4")])
+
+
+def test_run_batch_records_jobs_and_resumes(tmp_path):
+    videos = make_videos(tmp_path, ["a.mp4", "b.mp4", "broken.mp4"])
+    journal = BatchJournal(tmp_path / "journal.jsonl")
+
+    report = run_batch(videos, journal, workers=0, pipeline_factory=make_stub_pipeline, preload=False)
+
+    assert (report.done, report.failed, report.skipped) == (2, 1, 0)
+    assert report.audio_seconds == 3600.0
+    assert report.audio_hours_per_hour == pytest.approx(3600.0 / report.wall_seconds)
+    records = journal.load()
+    assert records[str(videos[0].resolve())]["job_id"] == job_id_for(videos[0])
+    assert records[str(videos[2].resolve())]["error"] == "corrupt video"
+
+    # A crash mid-write leaves a partial line, which is ignored
+    with open(journal.path, "a") as f:
+        f.write('{"video": "trunc')
+    report = run_batch(videos, journal, workers=0, pipeline_factory=make_stub_pipeline, preload=False)
+
+    assert (report.done, report.failed, report.skipped) == (0, 1, 2)
+
+
+def test_run_batch_uses_one_pipeline_per_worker_process(tmp_path):
+    videos = make_videos(tmp_path, [f"v{i}.mp4" for i in range(6)])
+    records = []
+
+    report = run_batch(
+        videos, BatchJournal(tmp_path / "journal.jsonl"), workers=2,
+        pipeline_factory=make_stub_pipeline, preload=False, on_record=records.append
+    )
+
+    assert report.done == 6
+    assert report.videos_per_hour > 0
+    assert {record["video"] for record in records} == {str(v.resolve()) for v in videos}
+    workers = {record["worker_pid"] for record in records}
+    assert len(workers) <= 2 and os.getpid() not in workers
+
+
+def test_build_pipeline_scene_detection_overrides_settings(monkeypatch):
+    monkeypatch.setattr(settings, "ENABLE_SCENE_DETECTION", False)
+    assert build_pipeline().scene_detector is None
+    assert build_pipeline(scene_detection=True).scene_detector is not None
+
+    monkeypatch.setattr(settings, "ENABLE_SCENE_DETECTION", True)
+    assert build_pipeline(scene_detection=False).scene_detector is None
+
+
+def test_build_pipeline_configures_parallel_transcription(monkeypatch):
+    monkeypatch.setattr(settings, "TRANSCRIPTION_WORKERS", 3)
+    monkeypatch.setattr(settings, "TRANSCRIPTION_CHUNK_SECONDS", 300.0)
+    pipeline = build_pipeline()
+    assert pipeline.transcriber.num_workers == 3
+    assert pipeline.transcriber.max_chunk_seconds == 300.0
+    assert not pipeline.streaming
+
+
+def test_build_pipeline_configures_the_scene_detection_engine(monkeypatch):
+    monkeypatch.setattr(settings, "SCENE_DETECTION_ENGINE", "ffmpeg")
+    monkeypatch.setattr(settings, "SCENE_DETECTION_WORKERS", 4)
+    monkeypatch.setattr(settings, "SCENE_DETECTION_KEYFRAMES_ONLY", True)
+    detector = build_pipeline(scene_detection=True).scene_detector
+    assert detector.engine == "ffmpeg"
+    assert detector.num_workers == 4
+    assert detector.keyframes_only
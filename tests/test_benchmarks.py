@@ -0,0 +1,27 @@
+from benchmarks.bench_stages import bench_transcript, compare_to_baseline
+
+
+def test_stage_benchmark_covers_every_transcript_stage(tmp_path):
+    results = bench_transcript(
+        100, 3, "changepoint", seconds_per_segment=5.0, repeat=1, output_dir=tmp_path
+    )
+    assert [row["stage"] for row in results] == [
+        "embedding", "clustering", "boundaries", "topics", "chapters", "optimize_chapters",
+        "export_youtube", "export_json", "export_edl", "export_srt", "export_vtt",
+    ]
+    assert all(row["size"] == 100 and row["seconds"] >= 0 for row in results)
+
+
+def test_baseline_comparison_flags_only_real_regressions():
+    baseline = [
+        {"stage": "clustering", "size": 1000, "seconds": 1.0},
+        {"stage": "topics", "size": 1000, "seconds": 0.001},
+    ]
+    results = [
+        {"stage": "clustering", "size": 1000, "seconds": 1.5},
+        {"stage": "topics", "size": 1000, "seconds": 0.004},  # below the noise floor
+        {"stage": "embedding", "size": 1000, "seconds": 9.0},  # no baseline entry
+    ]
+    failures = compare_to_baseline(results, baseline, max_regression=0.25)
+    assert len(failures) == 1 and failures[0].startswith("clustering @ 1000")
+    assert compare_to_baseline(results, baseline, max_regression=0.6) == []
@@ -1,4 +1,15 @@
+import shutil
+from pathlib import Path
+import pytest
+from benchmarks.bench_stages import StubEncoderSegmenter
+from benchmarks.synthetic import make_topic_transcript, make_video
+from config import settings
+from src.audio_extraction.extractor import AudioExtractor
 from src.chapter_generation.generator import ChapterGenerator, Chapter
+from src.export.json_exporter import JSONExporter
+from src.export.subtitle_generator import SubtitleGenerator
+from src.export.youtube_format import YouTubeExporter
+from src.pipeline.runner import ChapterPipeline
 from src.transcription.whisper_asr import TranscriptSegment
 
 def test_chapter_generation():
@@ -19,6 +30,40 @@ def test_chapter_generation():
     assert chapters[0].start_time == 0.0
     assert chapters[0].title == "Introduction"
 
-def test_full_pipeline():
+class SyntheticTranscriber:
+    """Stands in for Whisper: a planted-topic transcript covering the audio."""
+
+    def transcribe_stream(self, audio, language="en", **options):
+        duration = len(audio) / 16000
+        segments, _ = make_topic_transcript(int(duration // 5), 3, seconds_per_segment=5.0)
+        return iter(segments), {"language": language, "duration": duration}
+
+
+@pytest.fixture
+def test_video(tmp_path):
+    if shutil.which("ffmpeg") is None:
+        pytest.skip("ffmpeg not installed")
+    return make_video(tmp_path / "test_video.mp4", seconds=300)
+
+
+def test_full_pipeline(test_video, tmp_path, monkeypatch):
     """Test complete pipeline from video to chapters."""
-    video_path = "tests/fixtures/test_video.mp4"
\ No newline at end of file
+    monkeypatch.setattr(settings, "EMBEDDING_BATCH_WINDOW_MS", 0)
+    pipeline = ChapterPipeline(
+        audio_extractor=AudioExtractor(temp_dir=str(tmp_path / "temp")),
+        transcriber=SyntheticTranscriber(),
+        segmenter=StubEncoderSegmenter(min_chapter_duration=60),
+        chapter_generator=ChapterGenerator(),
+        youtube_exporter=YouTubeExporter(),
+        json_exporter=JSONExporter(),
+        subtitle_generator=SubtitleGenerator(),
+        output_root=str(tmp_path / "output"),
+        segmentation_method="changepoint",
+        audio_mode="pcm"
+    )
+    result = pipeline.run("full", str(test_video), "test_video.mp4")
+
+    assert abs(result["duration"] - 300) < 1
+    assert [round(ch["start"]) for ch in result["chapters"]] == [0, 100, 200]
+    for path in result["outputs"].values():
+        assert Path(path).stat().st_size > 0
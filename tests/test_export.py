@@ -0,0 +1,101 @@
+import numpy as np
+import pysrt
+import pytest
+from src.chapter_generation.generator import Chapter
+from src.chapter_generation.timestamp_formatter import TimestampFormatter
+from src.export.edl_exporter import EDLExporter
+from src.export.engine import (
+    EXPORT_FILENAMES, ExportEngine, format_srt_times, format_timecodes,
+    format_vtt_times, format_youtube_times
+)
+from src.export.json_exporter import JSONExporter
+from src.export.subtitle_generator import SubtitleGenerator
+from src.export.youtube_format import YouTubeExporter
+from src.transcription.models import TranscriptSegment, TranscriptStore
+
+# Rounding edges of timedelta, pysrt's float milliseconds and frame counts
+TRICKY_SECONDS = [
+    0.0, 0.0005, 0.0015, 0.29, 1.001, 59.9999995, 60.0, 3290.9999995,
+    3599.9999996, 3600.0, 7325.5, 36000.123, 14007.9999995,
+]
+
+
+def make_segments():
+    texts = ["Grüße aus München", "", "two\nlines", "plain", "trailing\n", "ß" * 40]
+    segments = []
+    for i, start in enumerate(TRICKY_SECONDS):
+        segments.append(TranscriptSegment(i, start, start + 1.0005, texts[i % len(texts)]))
+    return segments
+
+
+def make_chapters():
+    bounds = TRICKY_SECONDS + [40000.0]
+    return [
+        Chapter(i + 1, f"Kapitel {i + 1}: Übersicht", start, end, end - start, f"Teil {i}")
+        for i, (start, end) in enumerate(zip(bounds, bounds[1:]))
+    ]
+
+
+def export_reference(chapters, segments, metadata, output_dir):
+    output_dir.mkdir()
+    (output_dir / "chapters_youtube.txt").write_text(YouTubeExporter().export(chapters))
+    JSONExporter().export(chapters, metadata, str(output_dir / "chapters.json"))
+    EDLExporter().export(chapters, str(output_dir / "chapters.edl"))
+    SubtitleGenerator().generate_srt(segments, str(output_dir / "subtitles.srt"))
+    SubtitleGenerator().generate_vtt(segments, str(output_dir / "subtitles.vtt"))
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_engine_output_is_byte_identical(tmp_path, columnar):
+    chapters = make_chapters()
+    segments = make_segments()
+    metadata = {"filename": "vidéo.mp4", "duration": 40000.0}
+    export_reference(chapters, segments, metadata, tmp_path / "reference")
+
+    output_dir = tmp_path / "engine"
+    output_dir.mkdir()
+    transcript = TranscriptStore.from_segments(segments) if columnar else segments
+    # A small batch size makes the walk cross several batches
+    outputs = ExportEngine(batch_size=4).export(
+        chapters, transcript, output_dir, list(EXPORT_FILENAMES), metadata
+    )
+
+    assert set(outputs) == set(EXPORT_FILENAMES)
+    for name, filename in EXPORT_FILENAMES.items():
+        expected = (tmp_path / "reference" / filename).read_bytes()
+        assert (output_dir / filename).read_bytes() == expected, name
+
+
+def test_engine_handles_empty_input(tmp_path):
+    export_reference([], [], {}, tmp_path / "reference")
+    output_dir = tmp_path / "engine"
+    output_dir.mkdir()
+    ExportEngine().export([], [], output_dir, list(EXPORT_FILENAMES), {})
+
+    for filename in EXPORT_FILENAMES.values():
+        expected = (tmp_path / "reference" / filename).read_bytes()
+        assert (output_dir / filename).read_bytes() == expected, filename
+
+
+def test_engine_writes_only_requested_formats(tmp_path):
+    outputs = ExportEngine().export(make_chapters(), [], tmp_path, ["youtube", "edl"], {})
+
+    assert set(outputs) == {"youtube", "edl"}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["chapters.edl", "chapters_youtube.txt"]
+    with pytest.raises(ValueError):
+        ExportEngine().export([], [], tmp_path, ["mp4"], {})
+
+
+def test_batch_formatters_match_scalar_formatters():
+    rng = np.random.default_rng(0)
+    seconds = np.concatenate([
+        TRICKY_SECONDS,
+        rng.uniform(0, 20000, 5000),
+        rng.integers(0, 2000000, 5000) / 100 + rng.choice([-5e-7, 0, 5e-7], 5000),
+    ])
+    values = seconds.tolist()
+
+    assert format_youtube_times(seconds) == [TimestampFormatter.seconds_to_youtube(s) for s in values]
+    assert format_vtt_times(seconds) == [TimestampFormatter.seconds_to_vtt(s) for s in values]
+    assert format_timecodes(seconds) == [TimestampFormatter.seconds_to_timecode(s) for s in values]
+    assert format_srt_times(seconds) == [str(pysrt.SubRipTime(seconds=s)) for s in values]
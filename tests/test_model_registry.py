@@ -0,0 +1,65 @@
+import threading
+import time
+from src.model_registry import ModelRegistry
+
+
+def test_models_are_loaded_once_per_key():
+    registry = ModelRegistry()
+    loads = []
+
+    def loader():
+        time.sleep(0.05)
+        loads.append(1)
+        return object()
+
+    key = ("whisper", "base", "cpu", "int8/0")
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry._get(key, loader)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert all(model is results[0] for model in results)
+    assert registry._get(("whisper", "base", "cpu", "float32/0"), object) is not results[0]
+
+
+def test_local_path_prefers_models_dir(tmp_path):
+    registry = ModelRegistry(models_dir=str(tmp_path))
+    assert registry.local_path("faster-whisper-base") is None
+
+    (tmp_path / "faster-whisper-base").mkdir()
+    assert registry.local_path("faster-whisper-base") == str(tmp_path / "faster-whisper-base")
+
+
+def test_local_safetensors_encoder_is_memory_mapped(tmp_path):
+    registry = ModelRegistry(models_dir=str(tmp_path))
+    assert registry._sentence_encoder_options(None) == {}
+
+    model_dir = tmp_path / "all-MiniLM-L6-v2"
+    model_dir.mkdir()
+    assert registry._sentence_encoder_options(str(model_dir)) == {}
+    (model_dir / "model.safetensors").write_bytes(b"")
+    assert registry._sentence_encoder_options(str(model_dir)) == {
+        "model_kwargs": {"use_safetensors": True}
+    }
+
+
+def test_preload_loads_the_encoder_of_the_configured_backend():
+    class RecordingRegistry(ModelRegistry):
+        def get_sentence_encoder(self, model_name, device="cpu"):
+            self.loaded_encoder = ("torch", model_name)
+
+        def get_onnx_encoder(self, model_name, quantized=True):
+            self.loaded_encoder = ("onnx", model_name, quantized)
+
+    registry = RecordingRegistry()
+    registry.preload(embedding_model="all-MiniLM-L6-v2", embedding_backend="onnx-int8")
+    assert registry.loaded_encoder == ("onnx", "all-MiniLM-L6-v2", True)
+
+    registry.preload(embedding_model="all-MiniLM-L6-v2", embedding_backend="torch")
+    assert registry.loaded_encoder == ("torch", "all-MiniLM-L6-v2")
@@ -0,0 +1,355 @@
+import threading
+import numpy as np
+import pytest
+from src.api.main import (
+    MockAudioExtractor, MockTranscriber, MockSegmenter, MockChapterGenerator,
+    YouTubeExporter, JSONExporter, SubtitleGenerator
+)
+from config import settings
+from src.chapter_generation.generator import ChapterGenerator
+from src.export.engine import ExportEngine
+from src.pipeline.artifacts import StageArtifacts
+from src.pipeline.metrics import PipelineMetrics, measure_stage
+from src.pipeline.profiles import PROFILES, ThroughputTracker, choose_profile
+from src.pipeline.runner import ChapterPipeline, JobCancelled
+from src.transcription.whisper_asr import TranscriptSegment
+
+
+class CountingTranscriber(MockTranscriber):
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe_stream(self, path, language="en"):
+        self.calls += 1
+        return super().transcribe_stream(path, language)
+
+
+class FlakySegmenter(MockSegmenter):
+    """Fails once after embeddings so the job has to be resumed."""
+
+    def __init__(self):
+        self.failed = False
+        self.embedding_calls = 0
+
+    def generate_embeddings(self, segments):
+        self.embedding_calls += 1
+        return np.ones((len(segments), 4), dtype=np.float32)
+
+    def cluster_segments(self, embeddings, **kwargs):
+        if not self.failed:
+            self.failed = True
+            raise RuntimeError("clustering crashed")
+        return super().cluster_segments(embeddings, **kwargs)
+
+
+@pytest.fixture
+def pipeline_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "TEMP_DIR", tmp_path / "temp")
+    monkeypatch.setattr(settings, "OUTPUT_DIR", tmp_path / "output")
+    monkeypatch.setattr(settings, "THROUGHPUT_FILE", tmp_path / "throughput.json")
+    return tmp_path
+
+
+def make_pipeline(transcriber, segmenter):
+    return ChapterPipeline(
+        audio_extractor=MockAudioExtractor(),
+        transcriber=transcriber,
+        segmenter=segmenter,
+        chapter_generator=MockChapterGenerator(),
+        youtube_exporter=YouTubeExporter(),
+        json_exporter=JSONExporter(),
+        subtitle_generator=SubtitleGenerator()
+    )
+
+
+def test_transcript_artifact_roundtrip(tmp_path):
+    artifacts = StageArtifacts(tmp_path)
+    segments = [
+        TranscriptSegment(0, 0.0, 1.5, "Grüße aus München", confidence=-0.25),
+        TranscriptSegment(1, 1.5, 3.0, "", confidence=None),
+        TranscriptSegment(2, 3.0, 4.0, "日本語のテキスト", confidence=-0.5),
+    ]
+    artifacts.save_transcript(segments, {"language": "de"}, duration=4.0)
+
+    loaded, metadata, duration = artifacts.load_transcript()
+    assert loaded.to_segments() == segments
+    assert metadata == {"language": "de"}
+    assert duration == 4.0
+
+
+def test_rerun_resumes_from_checkpoints(pipeline_dirs):
+    transcriber = CountingTranscriber()
+    segmenter = FlakySegmenter()
+    pipeline = make_pipeline(transcriber, segmenter)
+
+    with pytest.raises(RuntimeError):
+        pipeline.run("job-1", "video.mp4", "video.mp4")
+
+    stages = []
+    result = pipeline.run("job-1", "video.mp4", "video.mp4", on_stage=stages.append)
+
+    assert result["chapters_count"] == 2
+    assert transcriber.calls == 1
+    assert segmenter.embedding_calls == 1
+    assert "extraction" not in stages
+    assert "transcription" not in stages
+
+
+def test_new_transcript_invalidates_embeddings(tmp_path):
+    artifacts = StageArtifacts(tmp_path)
+    segments = [TranscriptSegment(0, 0.0, 1.0, "hello")]
+    artifacts.save_transcript(segments, {}, duration=1.0)
+    artifacts.save_embeddings(np.zeros((1, 4)))
+    assert artifacts.load_embeddings(expected_rows=1) is not None
+
+    artifacts.save_transcript(segments, {}, duration=1.0)
+    assert artifacts.load_embeddings(expected_rows=1) is None
+
+
+def test_streaming_emits_progress_and_provisional_chapters(pipeline_dirs):
+    class LongTranscriber(MockTranscriber):
+        def transcribe_stream(self, path, language="en"):
+            segments = [
+                TranscriptSegment(i, i * 10.0, (i + 1) * 10.0, f"Sentence {i}.")
+                for i in range(40)
+            ]
+            return iter(segments), {"duration": 400.0}
+
+    pipeline = make_pipeline(LongTranscriber(), MockSegmenter())
+    pipeline.embedding_batch_size = 4
+    pipeline.provisional_every = 2
+    events = []
+    pipeline.run("job-2", "video.mp4", "video.mp4", on_event=events.append)
+
+    progress = [e for e in events if e["type"] == "progress"]
+    assert [e["segments"] for e in progress] == list(range(4, 41, 4))
+    assert any(e["type"] == "chapters" and e["provisional"] for e in events)
+
+
+def test_pcm_mode_transcribes_samples_without_temp_files(pipeline_dirs):
+    received = []
+
+    class ArrayTranscriber(MockTranscriber):
+        def transcribe_stream(self, audio, language="en"):
+            received.append(audio)
+            return super().transcribe_stream(audio, language)
+
+    pipeline = make_pipeline(ArrayTranscriber(), MockSegmenter())
+    pipeline.audio_mode = "pcm"
+    pipeline.run("job-3", "video.mp4", "video.mp4")
+
+    assert isinstance(received[0], np.ndarray)
+    assert not (pipeline_dirs / "temp").exists()
+
+    artifacts = StageArtifacts(pipeline_dirs / "output" / "job-3" / "artifacts")
+    samples, duration = artifacts.load_audio()
+    assert samples.dtype == np.float32 and len(samples) == len(received[0])
+    assert duration == 120.0
+
+
+def test_scene_detection_runs_alongside_transcription(pipeline_dirs):
+    # Each side waits for the other, so the job only completes if they overlap
+    both_running = threading.Barrier(2, timeout=5)
+
+    class WaitingTranscriber(MockTranscriber):
+        def transcribe_stream(self, audio, language="en"):
+            both_running.wait()
+            return super().transcribe_stream(audio, language)
+
+    class WaitingSceneDetector:
+        def detect_scenes(self, path):
+            both_running.wait()
+            return [(0.0, 10.0), (10.0, 120.0)]
+
+    pipeline = make_pipeline(WaitingTranscriber(), MockSegmenter())
+    pipeline.scene_detector = WaitingSceneDetector()
+    stages = []
+    result = pipeline.run(
+        "job-4", "video.mp4", "video.mp4",
+        enable_scene_detection=True, min_chapter_duration=5, on_stage=stages.append
+    )
+
+    assert not both_running.broken
+    assert result["chapters_count"] > 0
+    assert "fusion" in stages
+
+
+def test_fast_mode_outlines_from_pauses_without_asr(pipeline_dirs):
+    class SpeechExtractor(MockAudioExtractor):
+        def extract_audio_pcm(self, path):
+            # 100s of noise with a 2s pause at 50s
+            audio = np.random.default_rng(0).uniform(-0.5, 0.5, 16000 * 100).astype(np.float32)
+            audio[16000 * 50:16000 * 52] = 0.0
+            return audio, 100.0
+
+    transcriber = CountingTranscriber()
+    pipeline = make_pipeline(transcriber, MockSegmenter())
+    pipeline.audio_extractor = SpeechExtractor()
+    pipeline.chapter_generator = ChapterGenerator()
+    pipeline.audio_mode = "pcm"
+    pipeline.export_engine = ExportEngine()
+    events = []
+    result = pipeline.run(
+        "job-5", "video.mp4", "video.mp4",
+        min_chapter_duration=30, mode="fast", on_event=events.append,
+        export_formats=["youtube", "srt", "vtt", "edl"]
+    )
+
+    assert transcriber.calls == 0
+    assert [round(c["start"]) for c in result["chapters"]] == [0, 52]
+    assert set(result["outputs"]) == {"youtube", "edl"}
+    assert result["timings"]["export_edl"]["items"] == 2
+    assert "export_youtube" in result["timings"]
+    assert events[0]["source"] == "audio"
+
+
+def test_choose_profile_uses_measured_throughput(tmp_path):
+    tracker = ThroughputTracker(tmp_path / "throughput.json")
+    # Priors: accurate needs 0.5s per video second
+    assert choose_profile(600, 400, tracker).name == "accurate"
+    assert choose_profile(600, 100, tracker).name == "balanced"
+    assert choose_profile(600, 1, tracker).name == "fast"
+    assert choose_profile(600, 400, tracker, ["fast", "balanced"]).name == "balanced"
+
+    tracker.record("accurate", 100.0, {"transcription": 90.0, "segmentation": 10.0})
+    reloaded = ThroughputTracker(tmp_path / "throughput.json")
+    assert reloaded.realtime_factor(PROFILES["accurate"]) == pytest.approx(1.0)
+    assert choose_profile(600, 400, reloaded).name == "balanced"
+
+
+def test_throughput_trackers_sharing_a_file_keep_each_others_updates(tmp_path):
+    path = tmp_path / "throughput.json"
+    # Two trackers on one file stand in for two worker processes
+    first, second = ThroughputTracker(path), ThroughputTracker(path)
+    assert second.stats() == {}
+
+    first.record("fast", 100.0, {"transcription": 10.0})
+    second.record("accurate", 100.0, {"transcription": 50.0})
+
+    assert set(ThroughputTracker(path).stats()) == {"fast", "accurate"}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["throughput.json", "throughput.json.lock"]
+
+
+def test_deadline_selects_profile_and_passes_its_settings(pipeline_dirs):
+    class OptionsTranscriber(MockTranscriber):
+        def transcribe_stream(self, path, language="en", **options):
+            self.options = options
+            return super().transcribe_stream(path, language)
+
+    class OptionsSegmenter(MockSegmenter):
+        def cluster_segments(self, embeddings, **kwargs):
+            self.kwargs = kwargs
+            return []
+
+    transcriber = OptionsTranscriber()
+    segmenter = OptionsSegmenter()
+    pipeline = make_pipeline(transcriber, segmenter)
+    # 120s video: accurate needs ~60s, balanced ~14s
+    result = pipeline.run("job-6", "video.mp4", "video.mp4", deadline_seconds=30)
+
+    assert result["profile"] == "balanced"
+    assert transcriber.options == {"model_size": "base", "beam_size": 1, "word_timestamps": False}
+    assert segmenter.kwargs["method"] == "changepoint"
+    assert "balanced" in pipeline.throughput.stats()
+
+
+def test_stage_timings_in_result_and_metrics(pipeline_dirs):
+    pipeline = make_pipeline(MockTranscriber(), FlakySegmenter())
+    pipeline.segmenter.failed = True
+    result = pipeline.run("job-7", "video.mp4", "video.mp4")
+
+    timings = result["timings"]
+    for stage in ("extraction", "transcription", "segmentation", "clustering",
+                  "topics", "chapters", "export", "export_json", "export_srt"):
+        assert timings[stage]["wall_seconds"] >= 0
+    assert timings["transcription"]["items"] == 3
+    assert timings["extraction"]["audio_seconds"] == 120.0
+    assert timings["transcription"]["realtime_factor"] > 0
+
+
+def test_rechapter_reuses_transcript_and_embeddings(pipeline_dirs):
+    class RecordingSegmenter(MockSegmenter):
+        def generate_embeddings(self, segments):
+            self.embedded = True
+            return np.ones((len(segments), 4), dtype=np.float32)
+
+        def cluster_segments(self, embeddings, **kwargs):
+            self.cluster_options = kwargs
+            return super().cluster_segments(embeddings, **kwargs)
+
+    transcriber = CountingTranscriber()
+    segmenter = RecordingSegmenter()
+    pipeline = make_pipeline(transcriber, segmenter)
+    pipeline.run("job-8", "video.mp4", "video.mp4")
+    segmenter.embedded = False
+
+    result = pipeline.rechapter(
+        "job-8", "video.mp4", min_chapter_duration=30, n_chapters=4,
+        segmentation_method="changepoint", export_formats=["json"]
+    )
+
+    assert transcriber.calls == 1
+    assert segmenter.embedded is False
+    assert segmenter.cluster_options["n_clusters"] == 4
+    assert segmenter.cluster_options["min_duration"] == 30
+    assert segmenter.cluster_options["method"] == "changepoint"
+    assert set(result["outputs"]) == {"json"}
+    with pytest.raises(FileNotFoundError):
+        pipeline.rechapter("never-ran")
+
+
+def test_rechapter_reapplies_stored_scene_cuts(pipeline_dirs):
+    class SceneDetector:
+        def detect_scenes(self, path):
+            return [(0.0, 10.0), (10.0, 120.0)]
+
+    class RecordingChapterGenerator(MockChapterGenerator):
+        def generate_chapters(self, segments, boundaries, topics):
+            self.boundaries = list(boundaries)
+            return super().generate_chapters(segments, boundaries, topics)
+
+    pipeline = make_pipeline(MockTranscriber(), MockSegmenter())
+    pipeline.scene_detector = SceneDetector()
+    pipeline.chapter_generator = RecordingChapterGenerator()
+    pipeline.run("job-9", "video.mp4", "video.mp4", enable_scene_detection=True, min_chapter_duration=5)
+    assert pipeline.chapter_generator.boundaries == [0, 1, 2]
+
+    result = pipeline.rechapter("job-9", "video.mp4", min_chapter_duration=5)
+    # The visual cut at 10s survives, though topic boundaries are only at 0s and 60s
+    assert pipeline.chapter_generator.boundaries == [0, 1, 2]
+    assert "fusion" in result["timings"]
+
+    pipeline.run("job-9", "video.mp4", "video.mp4", min_chapter_duration=5)
+    pipeline.rechapter("job-9", "video.mp4", min_chapter_duration=5)
+    assert pipeline.chapter_generator.boundaries == [0, 2]
+
+
+def test_cancelled_job_stops_before_the_next_stage(pipeline_dirs):
+    cancelled = threading.Event()
+    stages = []
+
+    def on_stage(name):
+        stages.append(name)
+        if name == "transcription":
+            cancelled.set()
+
+    pipeline = make_pipeline(MockTranscriber(), MockSegmenter())
+    with pytest.raises(JobCancelled):
+        pipeline.run("job-10", "video.mp4", "video.mp4", on_stage=on_stage, cancelled=cancelled)
+    assert stages[-1] == "transcription"
+
+
+def test_metrics_render_prometheus_histograms():
+    metrics = PipelineMetrics()
+    with measure_stage("transcription", audio_seconds=60.0, metrics=metrics) as sample:
+        sample.items = 5
+    with pytest.raises(RuntimeError):
+        with measure_stage("clustering", metrics=metrics):
+            raise RuntimeError("boom")
+
+    text = metrics.render()
+    assert 'chapter_stage_wall_seconds_bucket{stage="transcription",le="+Inf"} 1' in text
+    assert 'chapter_stage_wall_seconds_count{stage="transcription"} 1' in text
+    assert 'chapter_stage_items_total{stage="transcription"} 5' in text
+    assert 'chapter_stage_realtime_factor_count{stage="transcription"} 1' in text
+    assert 'chapter_stage_failures_total{stage="clustering"} 1' in text
@@ -0,0 +1,165 @@
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from config import settings
+from src.api import main
+from src.api.cache import ResultCache
+from src.api.redis_queue import QueueWorker, RedisJobQueue
+from tests.fake_redis import FakeRedis
+
+
+def fake_runner(job_id, on_stage=None, on_event=None, cancelled=None, **params):
+    on_stage("transcription")
+    on_event({"type": "progress", "stage": "transcription", "fraction": 1.0})
+    return {"job_id": job_id, "chapters_count": 3, "params": params}
+
+
+@pytest.fixture
+def queue():
+    return RedisJobQueue(FakeRedis(), lease_seconds=0.2, max_attempts=2)
+
+
+def test_worker_runs_queued_job(queue):
+    queue.submit("job-1", video_path="clip.mp4")
+    assert queue.get("job-1").status == "queued"
+
+    worker = QueueWorker(queue, fake_runner)
+    assert worker.run_once()
+    assert not worker.run_once()
+
+    job = queue.get("job-1")
+    assert job.status == "done"
+    assert job.attempts == 1
+    assert job.result["params"] == {"video_path": "clip.mp4"}
+    events = queue.events_since("job-1", 0)
+    assert [e["type"] for e in events] == ["stage", "progress", "done"]
+    assert queue.events_since("unknown", 0) is None
+
+
+def test_expired_lease_is_reclaimed_and_stale_result_discarded(queue):
+    queue.submit("job-1")
+    stalled = queue.claim("stalled-worker")
+    assert stalled == "job-1"
+    # Leased jobs are not claimable until the lease runs out
+    assert queue.claim("other") is None
+
+    time.sleep(0.25)
+    worker = QueueWorker(queue, fake_runner)
+    assert worker.run_once()
+    assert queue.get("job-1").status == "done"
+
+    stale = queue.get("job-1")
+    stale.status = "failed"
+    assert not queue.finish(stale, "stalled-worker")
+    assert queue.get("job-1").status == "done"
+
+
+def test_heartbeat_keeps_lease_on_long_job(queue):
+    def slow_runner(job_id, **kwargs):
+        time.sleep(0.5)
+        return {"job_id": job_id}
+
+    queue.submit("job-1")
+    worker = QueueWorker(queue, slow_runner, heartbeat_seconds=0.05)
+    thread = threading.Thread(target=worker.run_once)
+    thread.start()
+    time.sleep(0.3)
+    assert queue.claim("other") is None
+    thread.join()
+    assert queue.get("job-1").status == "done"
+
+
+def test_lost_lease_cancels_the_running_job(queue):
+    seen = {}
+
+    def waiting_runner(job_id, cancelled=None, **kwargs):
+        seen["cancelled"] = cancelled.wait(5.0)
+        return {"job_id": job_id}
+
+    queue.submit("job-1")
+    worker = QueueWorker(queue, waiting_runner, heartbeat_seconds=0.05)
+    thread = threading.Thread(target=worker.run_once)
+    thread.start()
+    time.sleep(0.1)
+    # Another worker took the job over
+    queue.client.set(queue.lease_key("job-1"), "other")
+    thread.join()
+
+    assert seen["cancelled"]
+    assert queue.get("job-1").status == "running"
+
+
+def test_job_fails_after_max_attempts(queue):
+    queue.submit("job-1")
+    for attempt in range(queue.max_attempts):
+        token = f"crashed-{attempt}"
+        assert queue.claim(token) == "job-1"
+        job = queue.get("job-1")
+        job.attempts += 1
+        queue.save(job)
+        time.sleep(0.25)
+
+    assert not QueueWorker(queue, fake_runner).run_once()
+    job = queue.get("job-1")
+    assert job.status == "failed"
+    assert "Lease expired" in job.error
+
+
+def test_failed_job_can_be_retried(queue):
+    def failing_runner(job_id, **kwargs):
+        raise RuntimeError("decoder crashed")
+
+    queue.submit("job-1")
+    QueueWorker(queue, failing_runner).run_once()
+    assert queue.get("job-1").error == "decoder crashed"
+
+    job = queue.retry("job-1")
+    assert job.status == "queued"
+    assert queue.events_since("job-1", 0) == []
+    QueueWorker(queue, fake_runner).run_once()
+    assert queue.get("job-1").status == "done"
+
+
+def test_api_enqueues_to_redis_for_workers(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "INPUT_DIR", tmp_path / "input")
+    monkeypatch.setattr(settings, "OUTPUT_DIR", tmp_path / "output")
+    monkeypatch.setattr(settings, "THROUGHPUT_FILE", tmp_path / "throughput.json")
+    monkeypatch.setattr(main, "result_cache", ResultCache(max_entries=4))
+    queue = RedisJobQueue(FakeRedis())
+    monkeypatch.setattr(main, "job_manager", queue)
+    client = TestClient(main.app)
+
+    response = client.post(
+        "/generate-chapters",
+        files={"video": ("clip.mp4", b"queued video bytes", "video/mp4")}
+    )
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert client.get(f"/jobs/{job_id}").json()["status"] == "queued"
+
+    # A worker in another process would share only Redis and the data directories
+    assert QueueWorker(queue, main.run_job).run_once()
+    status = client.get(f"/jobs/{job_id}").json()
+    assert status["status"] == "done"
+    assert status["result"]["chapters_count"] == 2
+
+    # Results come from the workers, so this process's cache is not used
+    again = client.post(
+        "/generate-chapters",
+        files={"video": ("clip.mp4", b"queued video bytes", "video/mp4")}
+    )
+    assert again.status_code == 202
+    assert queue.get(again.json()["job_id"]).params["cache_key"] is None
+
+
+def test_event_stream_ends_after_events_expire(monkeypatch):
+    queue = RedisJobQueue(FakeRedis())
+    monkeypatch.setattr(main, "job_manager", queue)
+    queue.submit("job-1")
+    QueueWorker(queue, fake_runner).run_once()
+    queue.client.delete(queue.events_key("job-1"))
+
+    response = TestClient(main.app).get("/jobs/job-1/events")
+    assert response.status_code == 200
+    assert response.text.startswith("event: done\n")
@@ -0,0 +1,86 @@
+import numpy as np
+from src.scene_detection.transition_analyzer import (
+    BoundaryCandidate, fuse_boundaries, snap_to_pauses, snap_to_segments
+)
+from src.scene_detection.visual_detector import (
+    DEFAULT_THRESHOLDS, VisualSceneDetector, _cuts_from_scores, _merge_range_scans, _split_ranges
+)
+
+
+def flat_frame(value):
+    return np.full(16, value, dtype=np.int16)
+
+
+def test_merge_range_scans_scores_cuts_on_the_seam():
+    first_range = (np.array([0.0, 1.0]), np.array([0.0, 0.0]), flat_frame(10), flat_frame(10))
+    second_range = (np.array([2.0, 3.0]), np.array([0.0, 0.0]), flat_frame(200), flat_frame(200))
+
+    times, scores = _merge_range_scans([first_range, second_range])
+
+    assert times.tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert scores.tolist() == [0.0, 0.0, 190.0, 0.0]
+
+
+def test_cuts_respect_threshold_and_min_gap():
+    times = np.arange(10, dtype=float)
+    scores = np.array([0, 50, 60, 0, 0, 0, 40, 0, 0, 10], dtype=float)
+    assert _cuts_from_scores(times, scores, threshold=30.0, min_gap=2.0) == [2.0, 6.0]
+
+
+def test_split_ranges_cover_the_video():
+    ranges = _split_ranges(100.0, 4)
+    assert ranges == [(0.0, 25.0), (25.0, 25.0), (50.0, 25.0), (75.0, None)]
+    assert _split_ranges(100.0, 1) == [(0.0, None)]
+
+
+def test_fuse_boundaries_scores_agreement_and_keeps_visual_only_cuts():
+    fused = fuse_boundaries([0.0, 100.0, 300.0], [3.0, 102.0, 200.0, 298.0], tolerance=5.0)
+
+    assert [c.time for c in fused] == [0.0, 100.0, 200.0, 300.0]
+    assert [sorted(c.sources) for c in fused] == [
+        ["nlp", "visual"], ["nlp", "visual"], ["visual"], ["nlp", "visual"]
+    ]
+    assert fused[1].score > fused[2].score
+
+
+def test_fuse_boundaries_matches_the_nearest_of_several_nlp_boundaries():
+    fused = fuse_boundaries([0.0, 2.0, 4.0, 6.0], [5.5], tolerance=10.0)
+    assert [sorted(c.sources) for c in fused] == [["nlp"], ["nlp"], ["nlp"], ["nlp", "visual"]]
+
+
+def test_merge_with_nlp_boundaries_matches_quadratic_scan():
+    rng = np.random.default_rng(0)
+    nlp = sorted(rng.uniform(0, 1000, 40).round(1).tolist())
+    starts = sorted(rng.uniform(0, 1000, 200).round(1).tolist())
+    scenes = list(zip(starts, starts[1:] + [1000.0]))
+
+    expected = set(nlp)
+    for start, _ in scenes:
+        if not any(abs(start - t) < 5.0 for t in nlp):
+            expected.add(start)
+
+    merged = VisualSceneDetector().merge_with_nlp_boundaries(nlp, scenes)
+    assert merged == sorted(expected)
+
+
+def test_snap_to_segments_prefers_stronger_candidate_within_min_gap():
+    starts = [0.0, 10.0, 20.0, 30.0, 40.0, 50.0]
+    candidates = [
+        BoundaryCandidate(11.0, 0.5, {"visual": 0.5}),
+        BoundaryCandidate(19.0, 1.5, {"nlp": 1.0, "visual": 0.5}),
+        BoundaryCandidate(41.0, 1.0, {"nlp": 1.0}),
+    ]
+    assert snap_to_segments(candidates, starts, min_gap=15.0) == [0, 2, 4]
+
+
+def test_snap_to_pauses_moves_boundary_to_speech_after_longest_pause():
+    starts = [0.0, 10.0, 20.0, 24.0, 30.0, 40.0]
+    pauses = [(18.0, 19.0), (21.5, 23.8), (45.0, 46.0)]
+    assert snap_to_pauses([0, 2, 5], starts, pauses, tolerance=3.0) == [0, 3, 5]
+
+
+def test_each_engine_defaults_to_its_own_threshold():
+    assert VisualSceneDetector().engine == "scenedetect"
+    assert VisualSceneDetector().threshold == DEFAULT_THRESHOLDS["scenedetect"]
+    assert VisualSceneDetector(engine="ffmpeg").threshold == DEFAULT_THRESHOLDS["ffmpeg"]
+    assert VisualSceneDetector(engine="ffmpeg", threshold=12.0).threshold == 12.0
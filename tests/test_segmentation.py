@@ -0,0 +1,170 @@
+import numpy as np
+import pytest
+from sklearn.metrics import pairwise_distances, silhouette_score
+from benchmarks.synthetic import make_segments, make_topic_embeddings
+from src.segmentation.embeddings import EmbeddingBatcher, EmbeddingCache, get_embedding_batcher
+from src.segmentation.encoders import mean_pool
+from src.segmentation.nlp_segmenter import NLPSegmenter, _silhouette_from_distances
+
+
+def test_silhouette_from_distances_matches_sklearn():
+    rng = np.random.default_rng(3)
+    points = rng.normal(size=(120, 8))
+    labels = rng.integers(0, 5, size=120)
+    labels[0] = 7  # singleton cluster
+
+    distances = pairwise_distances(points)
+    expected = silhouette_score(distances, labels, metric="precomputed")
+    assert np.isclose(_silhouette_from_distances(distances, labels), expected)
+
+
+def test_fast_cluster_selection_matches_exhaustive():
+    embeddings, boundaries = make_topic_embeddings(240, 6, dim=64)
+
+    fast = NLPSegmenter(cluster_selection="fast")._determine_optimal_clusters(embeddings)
+    exhaustive = NLPSegmenter(cluster_selection="exhaustive")._determine_optimal_clusters(embeddings)
+
+    assert fast == exhaustive == len(boundaries)
+
+
+def test_fast_cluster_selection_samples_long_transcripts():
+    embeddings, boundaries = make_topic_embeddings(3000, 5, dim=32)
+    segmenter = NLPSegmenter(silhouette_sample_size=500)
+    assert segmenter._determine_optimal_clusters(embeddings) == len(boundaries)
+
+
+def test_changepoint_recovers_planted_boundaries():
+    embeddings, boundaries = make_topic_embeddings(600, 6, dim=64, noise=1.5)
+    segments = make_segments(600, seconds_per_segment=5.0)
+    segmenter = NLPSegmenter(min_chapter_duration=60)
+
+    labels = segmenter.cluster_segments(embeddings, method="changepoint", segments=segments)
+    found = segmenter.identify_chapter_boundaries(segments, labels)
+
+    assert len(found) == len(boundaries)
+    assert all(abs(f - b) <= 2 for f, b in zip(found, boundaries))
+
+
+def test_changepoint_enforces_duration_and_chapter_limits():
+    embeddings, _ = make_topic_embeddings(600, 12, dim=64)
+    segments = make_segments(600, seconds_per_segment=5.0)
+    segmenter = NLPSegmenter(min_chapter_duration=400, max_chapters=5)
+
+    labels = segmenter.cluster_segments(embeddings, method="changepoint", segments=segments)
+    found = segmenter.identify_chapter_boundaries(segments, labels)
+
+    assert list(np.unique(labels)) == list(range(len(found)))
+    assert len(found) <= 5
+    starts = [segments[b].start for b in found] + [segments[-1].end]
+    assert all(b - a >= 400 for a, b in zip(starts[:-2], starts[1:-1]))
+    assert starts[-1] - starts[-2] >= 200
+
+
+class CountingEncoder:
+    def __init__(self, dim=8):
+        self.dim = dim
+        self.texts = []
+
+    def __call__(self, texts):
+        self.texts.extend(texts)
+        return np.array([[len(t)] + [i] * (self.dim - 1) for i, t in enumerate(texts)], dtype=np.float32)
+
+
+def test_embedding_cache_encodes_each_text_once(tmp_path):
+    encoder = CountingEncoder()
+    cache = EmbeddingCache("model", cache_dir=tmp_path)
+
+    first = cache.encode(["Thanks for watching", "intro", "Thanks  for watching "], encoder)
+    second = cache.encode(["intro", "Thanks for watching"], encoder)
+
+    assert encoder.texts == ["Thanks for watching", "intro"]
+    assert np.array_equal(first[0], first[2])
+    assert np.array_equal(second, first[[1, 0]])
+    assert cache.stats()["memory_hits"] == 2
+
+
+def test_embedding_cache_disk_tier_survives_restart_and_evicts_oldest(tmp_path):
+    encoder = CountingEncoder()
+    cache = EmbeddingCache("model", cache_dir=tmp_path, disk_entries=2)
+    expected = cache.encode(["a", "bb", "ccc"], encoder)
+
+    reopened = EmbeddingCache("model", cache_dir=tmp_path, disk_entries=2)
+    vectors = reopened.encode(["bb", "ccc"], encoder)
+
+    assert np.allclose(vectors, expected[1:])
+    assert reopened.stats()["disk_hits"] == 2
+    reopened.encode(["a"], encoder)
+    assert encoder.texts == ["a", "bb", "ccc", "a"]
+
+
+def test_embedding_cache_shared_directory_never_returns_another_texts_vector(tmp_path):
+    encoder = CountingEncoder()
+    # Two caches on one directory stand in for two worker processes
+    first = EmbeddingCache("model", cache_dir=tmp_path, memory_entries=0, disk_entries=2)
+    second = EmbeddingCache("model", cache_dir=tmp_path, memory_entries=0, disk_entries=2)
+    first.encode(["a", "bb"], encoder)
+
+    # Overwrites the slot holding "a"
+    stored = second.encode(["ccc"], encoder)
+
+    assert np.array_equal(first.encode(["ccc"], encoder), stored)
+    assert first.encode(["a"], encoder)[0, 0] == 1
+    assert encoder.texts == ["a", "bb", "ccc", "a"]
+    assert first.stats()["disk_hits"] == 1
+
+
+def test_embedding_batcher_merges_concurrent_callers():
+    from concurrent.futures import ThreadPoolExecutor
+
+    def features(texts):
+        return np.array([[len(t.split()), len(t)] for t in texts], dtype=np.float32)
+
+    batches = []
+
+    def encode(texts):
+        batches.append(list(texts))
+        return features(texts)
+
+    batcher = EmbeddingBatcher(encode, flush_ms=200, max_batch_size=64)
+    requests = [[f"{'word ' * (j % 4)}text {i}-{j}" for j in range(5)] for i in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(batcher.encode, requests))
+    batcher.close()
+
+    for texts, vectors in zip(requests, results):
+        assert np.array_equal(vectors, features(texts))
+    assert len(batches) < len(requests)
+    for batch in batches:
+        lengths = [len(t.split()) for t in batch]
+        assert lengths == sorted(lengths)
+    assert batcher.stats()["mean_batch_size"] > 5
+
+
+def test_embedding_batcher_is_shared_only_by_the_same_encoder():
+    class Encoder:
+        def __init__(self, value):
+            self.value = value
+
+        def encode(self, texts, show_progress_bar=True):
+            return np.full((len(texts), 1), self.value, dtype=np.float32)
+
+    stub, real = Encoder(0.0), Encoder(1.0)
+    # Same model name and device, different encoder objects
+    first = get_embedding_batcher("model@torch", "cpu", stub)
+    second = get_embedding_batcher("model@torch", "cpu", real)
+
+    assert first is not second
+    assert get_embedding_batcher("model@torch", "cpu", stub) is first
+    assert second.encode(["text"])[0, 0] == 1.0
+    assert first.encode(["text"])[0, 0] == 0.0
+
+
+def test_mean_pool_ignores_padding_and_normalizes():
+    hidden = np.array([[[1.0, 0.0], [3.0, 0.0], [100.0, 100.0]]])
+    mask = np.array([[1, 1, 0]])
+    assert np.allclose(mean_pool(hidden, mask), [[1.0, 0.0]])
+
+
+def test_unknown_encoder_backend_is_rejected():
+    with pytest.raises(ValueError):
+        NLPSegmenter(encoder_backend="tensorflow").encoder
@@ -0,0 +1,6 @@
+from benchmarks.bench_startup import measure_imports, summarize
+
+
+def test_api_import_defers_heavy_dependencies():
+    summary = summarize(measure_imports(), top=10)
+    assert summary["deferred_modules_loaded"] == []
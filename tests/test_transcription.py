@@ -0,0 +1,65 @@
+import numpy as np
+from src.transcription.models import TranscriptSegment, TranscriptStore
+from src.transcription.whisper_asr import WhisperTranscriber
+
+
+def test_merge_chunk_rows_renumbers_in_order():
+    chunk_rows = [
+        [(0.0, 4.0, "first", -0.1), (4.0, 9.5, "second", -0.2)],
+        [],
+        [(600.2, 603.0, "third", None)],
+    ]
+
+    segments = WhisperTranscriber._merge_chunk_rows(chunk_rows)
+
+    assert [seg.id for seg in segments] == [0, 1, 2]
+    assert [seg.text for seg in segments] == ["first", "second", "third"]
+    assert segments[2].start == 600.2
+    assert segments[2].confidence is None
+
+
+def make_store():
+    return TranscriptStore.from_segments([
+        TranscriptSegment(0, 0.0, 2.0, "Grüße", confidence=-0.1),
+        TranscriptSegment(1, 2.0, 5.0, "", confidence=None),
+        TranscriptSegment(2, 5.0, 9.0, "日本語", confidence=-0.3),
+        TranscriptSegment(3, 9.0, 12.0, "end", confidence=-0.2),
+    ])
+
+
+def test_transcript_store_views_match_segments():
+    store = make_store()
+
+    assert len(store) == 4
+    assert store[-1].text == "end"
+    assert store[1].confidence is None
+    assert [seg.text for seg in store] == store.texts() == ["Grüße", "", "日本語", "end"]
+    assert store.to_segments()[2] == TranscriptSegment(2, 5.0, 9.0, "日本語", confidence=-0.3)
+
+
+def test_transcript_store_slices_share_buffers():
+    store = make_store()
+
+    middle = store[1:3]
+    assert np.shares_memory(middle.start, store.start)
+    assert middle.text_data is store.text_data
+    assert middle.texts() == ["", "日本語"]
+    assert middle[0].id == 1
+
+    by_time = store.time_slice(4.0, 9.0)
+    assert [seg.id for seg in by_time] == [1, 2]
+    assert len(store.time_slice(20.0, 30.0)) == 0
+
+
+def test_chunk_pool_is_replaced_when_the_model_changes():
+    transcriber = WhisperTranscriber(num_workers=2)
+    try:
+        with transcriber._pool_lock:
+            base = transcriber._get_pool("base")
+            assert transcriber._get_pool("base") is base
+            small = transcriber._get_pool("small")
+        assert small is not base
+        assert base._shutdown_thread
+    finally:
+        transcriber.close()
+    assert transcriber._pool is None